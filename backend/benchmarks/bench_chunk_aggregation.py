@@ -0,0 +1,80 @@
+"""
+chunk → 공고 점수 집계 마이크로벤치마크
+기존 defaultdict/정렬 기반 집계와 NumPy 집계(aggregate_chunk_scores + select_top_k) 속도 비교
+(두 방식의 결과 일치 여부는 tests/test_chunk_aggregation.py에서 확인)
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.bench_chunk_aggregation
+"""
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.retriever import aggregate_chunk_scores, select_top_k  # noqa: E402
+
+CHUNK_COUNTS = [10_000, 30_000, 100_000]
+NUM_JOBS = 2_000
+CHUNKS_PER_JOB = 3
+TOP_K = 10
+REPEAT = 5
+
+
+def python_aggregate(job_ids, distances, top_n, top_k):
+    """기존 retrieve_similar_jobs의 집계 방식 (비교 기준)"""
+    job_chunks = defaultdict(list)
+    for job_id, distance in zip(job_ids, distances):
+        job_chunks[job_id].append(distance)
+
+    job_scores = {}
+    for job_id, chunk_distances in job_chunks.items():
+        chunk_scores = [{"score": max(0.0, 1.0 - (d / 2.0))} for d in chunk_distances]
+        chunk_scores.sort(key=lambda x: x["score"], reverse=True)
+        top_chunks = chunk_scores[:top_n]
+        job_scores[job_id] = sum(c["score"] for c in top_chunks) / len(top_chunks)
+
+    sorted_jobs = sorted(job_scores.items(), key=lambda x: x[1], reverse=True)
+    return [job_id for job_id, _ in sorted_jobs[:top_k]], job_scores
+
+
+def numpy_aggregate(job_ids, distances, top_n, top_k):
+    unique_ids, avg_scores, _, _, _ = aggregate_chunk_scores(job_ids, distances, top_n=top_n)
+    top_positions = select_top_k(avg_scores, top_k)
+    return unique_ids[top_positions].tolist(), dict(zip(unique_ids.tolist(), avg_scores.tolist()))
+
+
+def best_of(func, *args):
+    best = float("inf")
+    result = None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"공고 수: {NUM_JOBS}, 공고당 chunk: {CHUNKS_PER_JOB}, top_k: {TOP_K} (best of {REPEAT})")
+    print(f"{'chunks':>10} {'python(ms)':>12} {'numpy(ms)':>12} {'speedup':>9}")
+
+    for n_chunks in CHUNK_COUNTS:
+        job_ids = rng.integers(0, NUM_JOBS, size=n_chunks)
+        distances = rng.uniform(0.2, 1.4, size=n_chunks)
+        # 벡터 스토어가 반환하는 형태 (거리 오름차순 파이썬 리스트)
+        order = np.argsort(distances)
+        job_id_list = job_ids[order].tolist()
+        distance_list = distances[order].tolist()
+
+        py_time, _ = best_of(python_aggregate, job_id_list, distance_list, CHUNKS_PER_JOB, TOP_K)
+        np_time, _ = best_of(numpy_aggregate, job_id_list, distance_list, CHUNKS_PER_JOB, TOP_K)
+
+        print(f"{n_chunks:>10} {py_time * 1000:>12.2f} {np_time * 1000:>12.2f} {py_time / np_time:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
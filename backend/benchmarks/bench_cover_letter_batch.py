@@ -0,0 +1,149 @@
+"""
+자기소개서 생성 방식 비교 벤치마크
+섹션별 방식(섹션마다 Gemini 초안 + GPT-4o 첨삭)과 일괄 방식(generate_cover_letter_batch)의
+전송 프롬프트 크기(호출 수, 글자 수, 토큰 수)와 실제 소요 시간 비교
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.bench_cover_letter_batch          # 프롬프트 크기만 비교 (API 호출 없음)
+    python -m benchmarks.bench_cover_letter_batch --live   # 실제 API 호출 소요 시간까지 측정
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.cover_letter_generator import (  # noqa: E402
+    DEFAULT_SECTIONS,
+    SECTION_MAX_CHARS,
+    _build_batch_draft_prompt,
+    _build_batch_refine_messages,
+    _build_draft_prompt,
+    _build_refine_messages,
+    _section_limits,
+    generate_cover_letter,
+)
+from src.job_parser import load_job_catalog  # noqa: E402
+
+SECTION_COUNTS = [1, 2, 4]
+LIVE_REPEAT = 3
+
+# 첨삭 단계 입력으로 쓰는 초안 (실제 초안과 비슷한 길이)
+SAMPLE_DRAFT = ("저는 사용자 경험을 개선하는 서비스를 만드는 데 관심이 많습니다. " * 40)[:SECTION_MAX_CHARS]
+
+SAMPLE_RESUME = {
+    "name": "홍길동",
+    "education": [{"school": "한국대학교", "major": "컴퓨터공학", "degree": "학사"}],
+    "experience": [
+        {"company": "가나소프트", "position": "백엔드 개발자", "period": "2021.03 - 2024.02",
+         "description": "결제 API 설계 및 운영, 배치 처리 성능 개선"}
+    ],
+    "skills": ["Python", "FastAPI", "PostgreSQL", "Redis", "Docker", "AWS"],
+}
+
+
+def _sample_job_info() -> dict:
+    """카탈로그의 첫 공고로 채용공고 정보 구성 (없으면 예시 값)"""
+    jobs = load_job_catalog("jobs.txt")
+    if not jobs:
+        return {"title": "백엔드 개발자", "company": "예시회사", "work": "API 개발", "requirements": "Python 경력 3년"}
+    job = jobs[0]
+    full_content = job.get("full_content", {}) or {}
+    return {
+        "title": job.get("title", ""),
+        "company": job.get("company", ""),
+        "work": full_content.get("work", "") or job.get("description", ""),
+        "requirements": full_content.get("requirements", ""),
+    }
+
+
+def _token_counter():
+    """tiktoken이 있으면 토큰 수, 없으면 글자 수를 그대로 사용"""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    encoding = tiktoken.get_encoding("o200k_base")
+    return lambda text: len(encoding.encode(text))
+
+
+def _messages_text(messages) -> str:
+    return "\n".join(m["content"] for m in messages)
+
+
+def section_mode_prompts(sections, resume, job_info):
+    """섹션별 방식에서 보내는 프롬프트 (섹션마다 초안 1회 + 첨삭 1회)"""
+    prompts = []
+    for section in sections:
+        prompts.append(_build_draft_prompt(section, resume, job_info))
+        prompts.append(_messages_text(_build_refine_messages(SAMPLE_DRAFT, section, resume, job_info)))
+    return prompts
+
+
+def batch_mode_prompts(sections, resume, job_info):
+    """일괄 방식에서 보내는 프롬프트 (초안 1회 + 첨삭 1회)"""
+    limits = _section_limits(sections, None)
+    drafts = {section: SAMPLE_DRAFT for section in sections}
+    return [
+        _build_batch_draft_prompt(resume, job_info, limits),
+        _messages_text(_build_batch_refine_messages(drafts, resume, job_info, limits)),
+    ]
+
+
+def compare_prompt_sizes(resume, job_info):
+    count_tokens = _token_counter()
+    unit = "tokens" if count_tokens else "tokens(≈chars)"
+    count_tokens = count_tokens or len
+
+    print(f"입력 토큰 비교 (첨삭 입력 초안 {len(SAMPLE_DRAFT)}자 가정, 단위: {unit})")
+    print(f"{'sections':>9} {'section calls':>14} {'section chars':>14} {'section tok':>12} "
+          f"{'batch calls':>12} {'batch chars':>12} {'batch tok':>10} {'saved':>7}")
+
+    for n_sections in SECTION_COUNTS:
+        sections = DEFAULT_SECTIONS[:n_sections]
+        section_prompts = section_mode_prompts(sections, resume, job_info)
+        batch_prompts = batch_mode_prompts(sections, resume, job_info)
+
+        section_chars = sum(len(p) for p in section_prompts)
+        batch_chars = sum(len(p) for p in batch_prompts)
+        section_tokens = sum(count_tokens(p) for p in section_prompts)
+        batch_tokens = sum(count_tokens(p) for p in batch_prompts)
+
+        print(f"{n_sections:>9} {len(section_prompts):>14} {section_chars:>14} {section_tokens:>12} "
+              f"{len(batch_prompts):>12} {batch_chars:>12} {batch_tokens:>10} "
+              f"{1 - batch_tokens / section_tokens:>6.0%}")
+
+
+async def compare_wall_time(resume, job_info):
+    """실제 API로 두 방식의 전체 생성 시간 비교"""
+    sections = DEFAULT_SECTIONS
+    print(f"\n실제 생성 시간 비교 ({len(sections)}개 섹션, {LIVE_REPEAT}회 평균)")
+    print(f"{'mode':>8} {'avg(s)':>8} {'min(s)':>8} {'max chars':>10}")
+
+    for mode in ("section", "batch"):
+        elapsed = []
+        longest = 0
+        for _ in range(LIVE_REPEAT):
+            start = time.perf_counter()
+            cover_letter = await generate_cover_letter(resume, job_info, sections=sections, mode=mode)
+            elapsed.append(time.perf_counter() - start)
+            longest = max(longest, *(len(text) for text in cover_letter.values()))
+        print(f"{mode:>8} {sum(elapsed) / len(elapsed):>8.2f} {min(elapsed):>8.2f} {longest:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="자기소개서 생성 방식 비교")
+    parser.add_argument("--live", action="store_true", help="실제 API를 호출하여 소요 시간 측정")
+    args = parser.parse_args()
+
+    job_info = _sample_job_info()
+    compare_prompt_sizes(SAMPLE_RESUME, job_info)
+
+    if args.live:
+        asyncio.run(compare_wall_time(SAMPLE_RESUME, job_info))
+
+
+if __name__ == "__main__":
+    main()
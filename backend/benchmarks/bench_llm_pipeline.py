@@ -0,0 +1,110 @@
+"""
+LLM 파이프라인 동시 부하 벤치마크 (가짜 LLM 서버 사용)
+세션 여러 개를 동시에 실행하여 (자기소개서 생성 → 면접 질문 생성 → 답변 평가 → 전체 평가)
+세션 소요 시간, 호출 위치별 지연/재시도/오류 통계, 스케줄러 대기 시간 측정
+(스케줄러 예산(LLM_RATE_LIMITS)에 걸리면 대기 시간이 호출 지연에 포함됨, --no-scheduler로 제외)
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.fake_llm_server --port 8100 &
+    python -m benchmarks.bench_llm_pipeline --sessions 50 --base-url http://127.0.0.1:8100
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+SAMPLE_RESUME = {
+    "name": "홍길동",
+    "experience_years": 3,
+    "skills": ["Python", "FastAPI", "PostgreSQL", "Redis", "Docker", "AWS"],
+    "summary": "결제 API 설계 및 운영, 배치 처리 성능 개선 경험이 있는 백엔드 개발자",
+}
+SAMPLE_JOB = {
+    "title": "백엔드 개발자",
+    "company": "예시회사",
+    "work": "대규모 트래픽 API 개발\n데이터 파이프라인 운영",
+    "requirements": "Python 경력 3년 이상\n우대: 클라우드 운영 경험",
+}
+SAMPLE_ANSWER = "이전 회사에서 결제 API 응답 시간을 줄이기 위해 캐시와 비동기 처리를 도입했습니다."
+
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))] if ordered else 0.0
+
+
+async def run_session(mode: str, num_questions: int) -> float:
+    from src.cover_letter_generator import generate_cover_letter
+    from src.interview_generator import evaluate_answer, generate_interview_questions, generate_overall_evaluation
+
+    started = time.perf_counter()
+    cover_letter = await generate_cover_letter(SAMPLE_RESUME, SAMPLE_JOB, mode=mode)
+    questions = await generate_interview_questions(SAMPLE_RESUME, SAMPLE_JOB, cover_letter, num_questions)
+    evaluations = []
+    for question in questions:
+        evaluations.append(await evaluate_answer(question, SAMPLE_ANSWER, SAMPLE_RESUME, SAMPLE_JOB, cover_letter))
+    await generate_overall_evaluation(
+        questions, [SAMPLE_ANSWER] * len(questions), evaluations, SAMPLE_RESUME, SAMPLE_JOB
+    )
+    return time.perf_counter() - started
+
+
+async def run(args):
+    from src.llm_gateway import close_llm_gateway
+    from src.llm_scheduler import get_scheduler_stats
+    from src.llm_telemetry import get_llm_metrics
+
+    started = time.perf_counter()
+    durations = await asyncio.gather(*[run_session(args.mode, args.questions) for _ in range(args.sessions)])
+    wall = time.perf_counter() - started
+    await close_llm_gateway()
+
+    print(f"\n세션 {args.sessions}개 동시 실행 (자기소개서 {args.mode} 모드, 면접 질문 {args.questions}개)")
+    print(f"전체 {wall:.2f}s | 세션 p50 {_percentile(durations, 0.5):.2f}s "
+          f"p95 {_percentile(durations, 0.95):.2f}s max {max(durations):.2f}s")
+
+    metrics = get_llm_metrics()
+    print(f"\n{'call site':<26} {'model':<18} {'calls':>6} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'retries':>8} {'errors':>7} {'cached':>7}")
+    for site, models in metrics["call_sites"].items():
+        for model, stats in models.items():
+            tokens = stats["tokens"]
+            cached = tokens["cached"] / tokens["prompt"] if tokens["prompt"] else 0.0
+            print(f"{site:<26} {model:<18} {stats['calls']:>6} {stats['latency_ms']['p50']:>8.0f} "
+                  f"{stats['latency_ms']['p95']:>8.0f} {stats['retries']:>8} "
+                  f"{sum(stats['errors'].values()):>7} {cached:>6.0%}")
+
+    scheduler = get_scheduler_stats()
+    if scheduler["enabled"]:
+        print(f"\n{'scheduler model':<26} {'dispatched':>10} {'wait avg ms':>12} {'wait p95 ms':>12}")
+        for model, stats in scheduler["models"].items():
+            print(f"{model:<26} {stats['dispatched']:>10} {stats['wait_ms']['avg']:>12.0f} {stats['wait_ms']['p95']:>12.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가짜 LLM 서버로 파이프라인 동시 부하 측정")
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--questions", type=int, default=5)
+    parser.add_argument("--mode", choices=["section", "batch"], default="section")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8100", help="가짜 LLM 서버 주소")
+    parser.add_argument("--no-scheduler", action="store_true", help="호출 예산 스케줄러 끄기 (가짜 서버 지연만 측정)")
+    args = parser.parse_args()
+
+    # src 모듈이 설정을 읽기 전에 API 주소를 가짜 서버로 지정 (.env 값보다 우선)
+    base_url = args.base_url.rstrip("/")
+    os.environ["OPENAI_BASE_URL"] = f"{base_url}/v1"
+    os.environ["GEMINI_BASE_URL"] = base_url
+    os.environ.setdefault("GEMINI_API_KEY", "fake")
+    os.environ["LLM_CACHE_ENABLED"] = "false"  # 같은 입력이 반복되므로 응답 캐시는 끔
+    if args.no_scheduler:
+        os.environ["LLM_SCHEDULER_ENABLED"] = "false"
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
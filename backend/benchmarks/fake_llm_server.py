@@ -0,0 +1,433 @@
+"""
+로컬 가짜 LLM 서버 (부하/지연 테스트용)
+OpenAI Chat Completions(스트리밍 포함)와 Gemini generateContent 형식을 흉내 내어,
+실제 API 비용과 속도 제한 없이 백엔드 전체 흐름을 동시 부하로 측정할 수 있게 함
+
+- 응답 지연: fixed / uniform / lognormal 분포 (중앙값, p95 지정), 모델별 배율
+- 응답 내용: 프롬프트 종류(슬롯 추출, 면접 질문, 답변 평가, 전체 평가, 매칭 점수, 이력서 추출,
+  자기소개서 초안/첨삭 등)를 알아보고 각 호출부가 파싱하는 JSON/텍스트 형식으로 반환
+- 결정적 동작: 같은 seed와 같은 요청 순서면 같은 지연, 같은 응답, 같은 오류 주입 결과
+- 프롬프트 접두사 캐시 흉내: 이전 요청과 겹치는 앞부분(약 1024토큰 이상)을 cached_tokens로 보고
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.fake_llm_server --port 8100 --latency lognormal --latency-median-ms 800 --latency-p95-ms 2500
+
+백엔드 연결 (.env 또는 환경 변수):
+    OPENAI_BASE_URL=http://127.0.0.1:8100/v1
+    GEMINI_BASE_URL=http://127.0.0.1:8100
+    GEMINI_API_KEY=fake   # Gemini 경로까지 사용하려면 아무 값이나 지정
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import time
+from collections import Counter, OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+# 프롬프트 토큰 추정 (한글 위주 프롬프트 기준 약 2자당 1토큰, llm_scheduler.estimate_tokens와 같은 기준)
+CHARS_PER_TOKEN = 2
+# 프롬프트 접두사 캐시: 약 1024토큰 이상부터 128토큰 단위로 적중 (OpenAI 자동 캐시와 같은 규칙)
+PREFIX_CACHE_MIN_CHARS = 1024 * CHARS_PER_TOKEN
+PREFIX_CACHE_STEP_CHARS = 128 * CHARS_PER_TOKEN
+PREFIX_CACHE_MAX_ENTRIES = 20000
+# 스트리밍 조각 하나의 글자 수
+STREAM_CHUNK_CHARS = 8
+
+SAMPLE_SENTENCES = [
+    "저는 사용자 문제를 데이터로 정의하고 빠르게 검증하는 방식으로 일해 왔습니다.",
+    "이전 프로젝트에서 응답 시간을 40% 줄이며 서비스 안정성을 높였습니다.",
+    "팀원들과 코드 리뷰 문화를 만들어 배포 후 장애를 크게 줄였습니다.",
+    "새로운 기술을 도입할 때는 작은 범위에서 검증한 뒤 점진적으로 확대했습니다.",
+    "고객의 목소리를 직접 듣기 위해 운영팀과 주간 회의를 정례화했습니다.",
+    "입사 후에는 핵심 서비스의 품질 지표를 개선하는 데 기여하고 싶습니다.",
+    "협업 과정에서 의견이 다를 때는 근거 자료를 함께 검토하며 합의를 이끌었습니다.",
+    "꾸준한 학습과 기록으로 팀의 지식을 공유하는 역할을 맡아 왔습니다.",
+]
+
+
+class FakeLLMConfig:
+    def __init__(
+        self,
+        seed: int = 0,
+        latency: str = "lognormal",
+        latency_median_ms: float = 800.0,
+        latency_p95_ms: float = 2500.0,
+        model_latency: Optional[Dict[str, float]] = None,
+        stream_chunk_ms: float = 15.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0
+    ):
+        self.seed = seed
+        self.latency = latency
+        self.latency_median_ms = latency_median_ms
+        self.latency_p95_ms = max(latency_p95_ms, latency_median_ms)
+        self.model_latency = model_latency or {}
+        self.stream_chunk_ms = stream_chunk_ms
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+
+    def sample_latency(self, rng: random.Random, model: str) -> float:
+        """응답(스트리밍이면 첫 조각) 지연 시간(초)"""
+        median = self.latency_median_ms
+        if self.latency == "fixed":
+            ms = median
+        elif self.latency == "uniform":
+            ms = rng.uniform(0, 2 * median)
+        else:
+            # 중앙값과 p95로 정한 로그정규 분포 (p95 = median * e^(1.645σ))
+            sigma = math.log(self.latency_p95_ms / median) / 1.645 if median > 0 else 0.0
+            ms = median * math.exp(rng.gauss(0, 1) * sigma)
+        return ms * self.model_latency.get(model, 1.0) / 1000
+
+
+class FakeLLM:
+    """요청 종류별 가짜 응답 생성과 지연/오류/접두사 캐시 흉내"""
+
+    def __init__(self, config: FakeLLMConfig):
+        self.config = config
+        self.prefix_cache: "OrderedDict[str, None]" = OrderedDict()
+        self.occurrences: Counter = Counter()
+        self.stats = {"requests": Counter(), "kinds": Counter(), "errors": Counter(), "cached_tokens": 0}
+
+    # ---------- 결정적 난수 ----------
+
+    def rng_for(self, model: str, prompt: str) -> random.Random:
+        """seed + 모델 + 프롬프트 + 같은 요청의 반복 횟수로 정한 난수 (hedging 중복 요청도 서로 다른 지연)"""
+        digest = hashlib.sha256(f"{model}\n{prompt}".encode("utf-8")).hexdigest()
+        self.occurrences[digest] += 1
+        return random.Random(f"{self.config.seed}:{digest}:{self.occurrences[digest]}")
+
+    # ---------- 접두사 캐시 ----------
+
+    def cached_tokens(self, prompt: str) -> int:
+        """이전 요청과 겹치는 프롬프트 앞부분 토큰 수 (겹친 부분을 캐시에 기록)"""
+        cached_chars = 0
+        for end in range(PREFIX_CACHE_MIN_CHARS, len(prompt) + 1, PREFIX_CACHE_STEP_CHARS):
+            key = hashlib.sha1(prompt[:end].encode("utf-8")).hexdigest()
+            if key in self.prefix_cache:
+                self.prefix_cache.move_to_end(key)
+                cached_chars = end
+            else:
+                self.prefix_cache[key] = None
+        while len(self.prefix_cache) > PREFIX_CACHE_MAX_ENTRIES:
+            self.prefix_cache.popitem(last=False)
+        return cached_chars // CHARS_PER_TOKEN
+
+    def usage(self, prompt: str, completion: str) -> Dict[str, int]:
+        prompt_tokens = max(1, len(prompt) // CHARS_PER_TOKEN)
+        completion_tokens = max(1, len(completion) // CHARS_PER_TOKEN)
+        cached = min(self.cached_tokens(prompt), prompt_tokens)
+        self.stats["cached_tokens"] += cached
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "cached_tokens": cached,
+        }
+
+    # ---------- 오류 주입 ----------
+
+    def injected_error(self, rng: random.Random) -> Optional[Tuple[int, str]]:
+        """설정한 비율로 429(속도 제한) 또는 503(서버 오류) 반환"""
+        roll = rng.random()
+        if roll < self.config.rate_limit_rate:
+            return 429, "Rate limit reached (fake)"
+        if roll < self.config.rate_limit_rate + self.config.error_rate:
+            return 503, "Service unavailable (fake)"
+        return None
+
+    # ---------- 응답 내용 ----------
+
+    def text(self, rng: random.Random, chars: int) -> str:
+        sentences = []
+        while sum(len(s) + 1 for s in sentences) < chars:
+            sentences.append(rng.choice(SAMPLE_SENTENCES))
+        return " ".join(sentences)[:chars]
+
+    def respond(self, prompt: str, rng: random.Random) -> Tuple[str, str]:
+        """프롬프트 종류 판별 후 (종류, 응답 텍스트) 반환"""
+        if "【작업】면접 질문 생성" in prompt:
+            match = re.search(r"생성할 질문 수: (\d+)개", prompt)
+            count = int(match.group(1)) if match else 5
+            topics = ["지원 동기", "직무 역량", "협업 경험", "문제 해결 경험", "입사 후 포부"]
+            questions = [f"{topics[i % len(topics)]}에 대해 구체적인 사례를 들어 말씀해주세요. ({i + 1})" for i in range(count)]
+            return "interview.questions", json.dumps({"questions": questions}, ensure_ascii=False)
+
+        if "【작업】면접 답변 평가" in prompt:
+            return "interview.evaluate", json.dumps({
+                "score": rng.randint(55, 95),
+                "feedback": self.text(rng, 120),
+                "strengths": ["구체적인 사례 제시", "직무와의 연관성"],
+                "improvements": ["정량적 성과 보완", "결론을 먼저 제시"],
+            }, ensure_ascii=False)
+
+        if "【작업】전체 면접 평가" in prompt:
+            match = re.search(r"【계산된 평균 점수】([\d.]+)", prompt)
+            return "interview.overall", json.dumps({
+                "total_score": float(match.group(1)) if match else 70.0,
+                "summary": self.text(rng, 250),
+                "recommendations": ["경험을 수치로 설명하기", "지원 직무와 연결하기", "답변 구조화하기"],
+                "strengths": ["성실한 태도", "구체적인 경험"],
+                "improvements": ["답변 길이 조절", "핵심 먼저 말하기"],
+            }, ensure_ascii=False)
+
+        match = re.search(r'\{"jobs": \{"<공고 ID>": (\{.*?\})\}\}', prompt)
+        if match:
+            categories = list(json.loads(match.group(1)))
+            listing = re.search(r"채용공고 목록 \(키: 공고 ID\):\n(.*)\n", prompt)
+            job_ids = list(json.loads(listing.group(1))) if listing else []
+            jobs = {job_id: {c: round(rng.uniform(0.2, 0.95), 2) for c in categories} for job_id in job_ids}
+            return "scoring.batch", json.dumps({"jobs": jobs}, ensure_ascii=False)
+
+        if '"value": "추출된 값 또는 null"' in prompt:
+            match = re.search(r'사용자의 마지막 응답: "(.*)"', prompt)
+            value = match.group(1).strip() if match else None
+            return "chat.extract_slot", json.dumps({
+                "value": value or None,
+                "confidence": "high" if value else "low",
+                "response": f"'{value}'(으)로 기록했습니다." if value else "조금 더 자세히 말씀해주시겠어요?",
+            }, ensure_ascii=False)
+
+        if '"experience_years": 숫자' in prompt:
+            email = re.search(r"[\w.+-]+@[\w-]+\.[\w.-]+", prompt)
+            return "resume.extract", json.dumps({
+                "name": "홍길동",
+                "email": email.group(0) if email else "",
+                "phone": "010-0000-0000",
+                "skills": ["Python", "FastAPI", "SQL", "Docker"],
+                "experience_years": rng.randint(1, 10),
+                "summary": self.text(rng, 200),
+            }, ensure_ascii=False)
+
+        drafts = re.findall(r"【(.+?) 초안】 \(\d+자 이내\)", prompt)
+        if drafts:
+            return "cover_letter.batch_refine", json.dumps(
+                {section: self.text(rng, 900) for section in drafts}, ensure_ascii=False
+            )
+
+        match = re.search(r"응답 형식:\n(\{.*\})", prompt)
+        if match and "【작성할 섹션】" in prompt:
+            sections = list(json.loads(match.group(1)))
+            return "cover_letter.batch_draft", json.dumps(
+                {section: self.text(rng, 900) for section in sections}, ensure_ascii=False
+            )
+
+        if "【첨삭 대상 자기소개서】" in prompt:
+            improved = self.text(rng, 900)
+            return "cover_letter.review", (
+                f"1. **검수 의견**\n{self.text(rng, 200)}\n\n"
+                "2. **강점**\n- 구체적인 경험 제시\n- 직무와의 연관성\n- 진정성 있는 표현\n\n"
+                "3. **개선점**\n- 성과를 수치로 제시\n- 문장 길이 조절\n- 회사 정보와 연결\n\n"
+                f"4. **개선된 자기소개서**\n{improved}"
+            )
+
+        if "【초안】" in prompt:
+            return "cover_letter.refine", self.text(rng, 950)
+
+        if "【작성할 섹션】" in prompt:
+            return "cover_letter.draft", self.text(rng, 950)
+
+        # 대화 응답 등 그 밖의 텍스트 요청
+        return "chat.reply", self.text(rng, 120)
+
+
+def _openai_error(status: int, message: str) -> JSONResponse:
+    error_type = "rate_limit_exceeded" if status == 429 else "server_error"
+    return JSONResponse(status_code=status, content={"error": {"message": message, "type": error_type, "code": error_type}})
+
+
+def _gemini_error(status: int, message: str) -> JSONResponse:
+    return JSONResponse(status_code=status, content={
+        "error": {"code": status, "message": message, "status": "RESOURCE_EXHAUSTED" if status == 429 else "UNAVAILABLE"}
+    })
+
+
+def _chunks(text: str) -> List[str]:
+    return [text[i:i + STREAM_CHUNK_CHARS] for i in range(0, len(text), STREAM_CHUNK_CHARS)] or [""]
+
+
+def create_app(config: FakeLLMConfig) -> FastAPI:
+    app = FastAPI(title="Fake LLM Server")
+    fake = FakeLLM(config)
+    app.state.fake = fake
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        model = body.get("model", "gpt-4o-mini")
+        prompt = "\n".join(str(m.get("content", "")) for m in body.get("messages", []))
+        rng = fake.rng_for(model, prompt)
+        fake.stats["requests"][model] += 1
+
+        delay = config.sample_latency(rng, model)
+        error = fake.injected_error(rng)
+        if error:
+            await asyncio.sleep(delay / 4)
+            fake.stats["errors"][error[0]] += 1
+            return _openai_error(*error)
+
+        kind, content = fake.respond(prompt, rng)
+        fake.stats["kinds"][kind] += 1
+        usage = fake.usage(prompt, content)
+        openai_usage = {
+            "prompt_tokens": usage["prompt_tokens"],
+            "completion_tokens": usage["completion_tokens"],
+            "total_tokens": usage["total_tokens"],
+            "prompt_tokens_details": {"cached_tokens": usage["cached_tokens"]},
+        }
+        completion_id = f"chatcmpl-fake-{hashlib.sha1(prompt.encode('utf-8')).hexdigest()[:12]}"
+        created = int(time.time())
+
+        if not body.get("stream"):
+            await asyncio.sleep(delay)
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }],
+                "usage": openai_usage,
+            }
+
+        include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+
+        async def event_stream():
+            await asyncio.sleep(delay)
+            base = {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model}
+            for i, piece in enumerate(_chunks(content)):
+                if i:
+                    await asyncio.sleep(config.stream_chunk_ms / 1000)
+                delta = {"role": "assistant", "content": piece} if i == 0 else {"content": piece}
+                chunk = {**base, "choices": [{"index": 0, "delta": delta, "finish_reason": None}]}
+                yield f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+            yield f"data: {json.dumps({**base, 'choices': [{'index': 0, 'delta': {}, 'finish_reason': 'stop'}]})}\n\n"
+            if include_usage:
+                yield f"data: {json.dumps({**base, 'choices': [], 'usage': openai_usage})}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+    async def _gemini(model: str, request: Request, stream: bool):
+        body = await request.json()
+        prompt = "\n".join(
+            str(part.get("text", ""))
+            for content in body.get("contents", [])
+            for part in content.get("parts", [])
+        )
+        rng = fake.rng_for(model, prompt)
+        fake.stats["requests"][model] += 1
+
+        delay = config.sample_latency(rng, model)
+        error = fake.injected_error(rng)
+        if error:
+            await asyncio.sleep(delay / 4)
+            fake.stats["errors"][error[0]] += 1
+            return _gemini_error(*error)
+
+        kind, content = fake.respond(prompt, rng)
+        fake.stats["kinds"][kind] += 1
+        usage = fake.usage(prompt, content)
+        usage_metadata = {
+            "promptTokenCount": usage["prompt_tokens"],
+            "candidatesTokenCount": usage["completion_tokens"],
+            "totalTokenCount": usage["total_tokens"],
+            "cachedContentTokenCount": usage["cached_tokens"],
+        }
+
+        def payload(text: str, finish: Optional[str]) -> Dict:
+            candidate = {"content": {"role": "model", "parts": [{"text": text}]}, "index": 0}
+            if finish:
+                candidate["finishReason"] = finish
+            return {"candidates": [candidate], "usageMetadata": usage_metadata, "modelVersion": model}
+
+        if not stream:
+            await asyncio.sleep(delay)
+            return payload(content, "STOP")
+
+        async def event_stream():
+            await asyncio.sleep(delay)
+            pieces = _chunks(content)
+            for i, piece in enumerate(pieces):
+                if i:
+                    await asyncio.sleep(config.stream_chunk_ms / 1000)
+                finish = "STOP" if i == len(pieces) - 1 else None
+                yield f"data: {json.dumps(payload(piece, finish), ensure_ascii=False)}\n\n"
+
+        return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+    @app.post("/v1beta/models/{model}:generateContent")
+    async def gemini_generate_content(model: str, request: Request):
+        return await _gemini(model, request, stream=False)
+
+    @app.post("/v1beta/models/{model}:streamGenerateContent")
+    async def gemini_stream_generate_content(model: str, request: Request):
+        return await _gemini(model, request, stream=True)
+
+    @app.get("/stats")
+    async def get_stats():
+        """모델별 요청 수, 응답 종류별 수, 주입한 오류 수, 보고한 캐시 적중 토큰 수"""
+        return {
+            "requests": dict(fake.stats["requests"]),
+            "kinds": dict(fake.stats["kinds"]),
+            "errors": {str(k): v for k, v in fake.stats["errors"].items()},
+            "cached_tokens": fake.stats["cached_tokens"],
+        }
+
+    return app
+
+
+def _parse_model_latency(values: List[str]) -> Dict[str, float]:
+    """--model-latency gpt-4o=2.0 형식을 {모델: 지연 배율}로 변환"""
+    result = {}
+    for value in values:
+        model, _, factor = value.partition("=")
+        result[model] = float(factor)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 가짜 LLM 서버 (OpenAI/Gemini 호환)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--seed", type=int, default=0, help="지연/응답/오류 주입 난수 seed")
+    parser.add_argument("--latency", choices=["fixed", "uniform", "lognormal"], default="lognormal",
+                        help="응답 지연 분포 (uniform은 0 ~ 2×중앙값)")
+    parser.add_argument("--latency-median-ms", type=float, default=800.0)
+    parser.add_argument("--latency-p95-ms", type=float, default=2500.0, help="lognormal 분포의 p95")
+    parser.add_argument("--model-latency", action="append", default=["gpt-4o=2.0"],
+                        help="모델별 지연 배율 (예: gpt-4o=2.0, 여러 번 지정 가능)")
+    parser.add_argument("--stream-chunk-ms", type=float, default=15.0, help="스트리밍 조각 사이 간격")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="503 오류 주입 비율 (0~1)")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="429 오류 주입 비율 (0~1)")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    config = FakeLLMConfig(
+        seed=args.seed,
+        latency=args.latency,
+        latency_median_ms=args.latency_median_ms,
+        latency_p95_ms=args.latency_p95_ms,
+        model_latency=_parse_model_latency(args.model_latency),
+        stream_chunk_ms=args.stream_chunk_ms,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+    )
+    print(f"🧪 가짜 LLM 서버 시작: http://{args.host}:{args.port} "
+          f"(지연 {args.latency}, 중앙값 {args.latency_median_ms:.0f}ms, p95 {args.latency_p95_ms:.0f}ms)")
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
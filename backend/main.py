@@ -2,27 +2,66 @@
 FastAPI 메인 애플리케이션
 리팩토링된 버전 - 모듈화 및 try-except 개선
 """
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from contextlib import asynccontextmanager
+from collections import OrderedDict
 import uuid
 import asyncio
+import time
+from typing import Optional
 
 # 모듈 import (src 패키지에서)
 from src.resume_parser import extract_text_from_pdf_bytes, openai_extract_resume, heuristic_extract_resume
-from src.job_parser import load_jobs_from_txt
+from src.resume_digest import build_resume_digest
+from src.job_parser import load_jobs_from_txt, load_job_catalog
 from src.vector_store import (
     initialize_vector_store_components, 
     initialize_vector_store as init_vector_store,
-    add_resume_to_vector_store
+    add_resume_to_vector_store,
+    get_index_version,
+    get_resume_embedding
 )
-from src.retriever import retrieve_similar_jobs
+from src.fulltext_index import ensure_fulltext_index, search_jobs_fulltext
+from src.retriever import retrieve_similar_jobs, build_weighted_query
 from src.reranker import rerank_jobs
+from src.cross_encoder import cross_encoder_rerank
+from src.diversifier import mmr_diversify
+from src.scoring import calculate_match_scores, llm_match_scores, precompute_job_field_embeddings
+from src.search_cache import (
+    make_search_fingerprint,
+    get_cached_search,
+    store_search_result,
+    encode_search_cursor,
+    decode_search_cursor
+)
 from src.chat_handler import natural_conversation_collect_info
 from src.llm_clients import USE_OPENAI
-from src.cover_letter_generator import generate_cover_letter, review_and_improve_cover_letter
+from src.llm_gateway import close_llm_gateway
+from src.llm_scheduler import get_scheduler_stats
+from src.llm_telemetry import get_llm_metrics, get_prompt_cache_stats
+from src.config import (
+    SEARCH_MULTI_VECTOR,
+    SEARCH_RESUME_WEIGHT,
+    SEARCH_CANDIDATE_POOL,
+    CROSS_ENCODER_ENABLED,
+    CROSS_ENCODER_TOP_N,
+    SEARCH_MMR_ENABLED,
+    SEARCH_MMR_TOP_K,
+    SEARCH_MMR_LAMBDA,
+    SEARCH_MAX_PER_COMPANY,
+    MATCH_SCORE_MODE
+)
+from src.cover_letter_generator import (
+    generate_cover_letter,
+    generate_cover_letter_stream,
+    review_and_improve_cover_letter,
+    review_and_improve_cover_letter_stream
+)
 from src.interview_generator import (
     generate_interview_questions,
+    generate_interview_questions_stream,
     evaluate_answer,
     generate_overall_evaluation
 )
@@ -31,6 +70,11 @@ import json
 # 세션 저장소
 SESSIONS = {}
 
+# 세션별 이력서 임베딩 캐시 (세션 조회 응답에 벡터가 포함되지 않도록 세션과 분리하여 보관)
+# 최근 검색한 세션만 보관하고, 밀려난 세션은 다음 검색 때 벡터 스토어에서 다시 조회
+RESUME_EMBEDDING_CACHE_SIZE = 256
+RESUME_EMBEDDINGS: "OrderedDict[str, list]" = OrderedDict()
+
 # ============================================
 # FastAPI 앱 초기화
 # ============================================
@@ -80,9 +124,22 @@ async def lifespan(app: FastAPI):
     else:
         print("⚠️  벡터 스토어 컴포넌트 초기화 실패")
     
+    # 키워드 검색용 전문 검색 인덱스 준비 (jobs.txt가 바뀐 경우에만 재구성)
+    try:
+        await asyncio.to_thread(ensure_fulltext_index, "jobs.txt")
+    except Exception as e:
+        print(f"⚠️  전문 검색 인덱스 준비 중 오류: {e}")
+    
+    # 매칭 점수용 공고 항목 임베딩 미리 계산 (임베딩 모델이 로드된 경우)
+    try:
+        await asyncio.to_thread(precompute_job_field_embeddings, load_job_catalog("jobs.txt"))
+    except Exception as e:
+        print(f"⚠️  공고 항목 임베딩 계산 중 오류: {e}")
+    
     yield
     
     print("\n🛑 앱 종료 중...")
+    await close_llm_gateway()
 
 app = FastAPI(title="Resume Chatbot API", lifespan=lifespan)
 
@@ -99,7 +156,23 @@ app.add_middleware(
 # ============================================
 # API 엔드포인트
 # ============================================
-async def _upload_resume_handler(file: UploadFile):
+async def _cancel_on_disconnect(request: Request, coro, poll_interval: float = 0.5):
+    """클라이언트 연결이 끊기면 진행 중인 LLM 호출을 취소하고, 아니면 결과를 반환"""
+    task = asyncio.ensure_future(coro)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=poll_interval)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                print(f"⚠️  클라이언트 연결 종료, 진행 중인 LLM 호출 취소 ({request.url.path})")
+                raise HTTPException(status_code=499, detail="클라이언트 연결이 종료되었습니다.")
+    finally:
+        if not task.done():
+            task.cancel()
+
+
+async def _upload_resume_handler(request: Request, file: UploadFile):
     """이력서 파일 업로드 및 파싱 공통 핸들러"""
     if not file.filename:
         raise HTTPException(status_code=400, detail="파일이 제공되지 않았습니다.")
@@ -120,10 +193,13 @@ async def _upload_resume_handler(file: UploadFile):
     
     # 이력서 정보 추출
     if USE_OPENAI:
-        resume = openai_extract_resume(text)
+        resume = await _cancel_on_disconnect(request, openai_extract_resume(text))
     else:
         resume = heuristic_extract_resume(text)
     
+    # 모든 프롬프트가 재사용할 이력서 요약 (세션당 한 번 생성)
+    resume["digest"] = build_resume_digest(resume)
+    
     # 세션 생성
     session_id = str(uuid.uuid4())
     SESSIONS[session_id] = {
@@ -150,19 +226,19 @@ async def _upload_resume_handler(file: UploadFile):
 
 
 @app.post("/api/upload")
-async def upload_endpoint(file: UploadFile = File(...)):
+async def upload_endpoint(request: Request, file: UploadFile = File(...)):
     """이력서 파일 업로드 및 파싱 (클라이언트 호환용)"""
-    return await _upload_resume_handler(file)
+    return await _upload_resume_handler(request, file)
 
 
 @app.post("/api/upload-resume")
-async def upload_resume_endpoint(file: UploadFile = File(...)):
+async def upload_resume_endpoint(request: Request, file: UploadFile = File(...)):
     """이력서 파일 업로드 및 파싱"""
-    return await _upload_resume_handler(file)
+    return await _upload_resume_handler(request, file)
 
 
 @app.post("/api/chat")
-async def chat_endpoint(session_id: str = Form(...), user_message: str = Form(...)):
+async def chat_endpoint(request: Request, session_id: str = Form(...), user_message: str = Form(...)):
     """채팅 메시지 처리"""
     session = SESSIONS.get(session_id)
     if not session:
@@ -173,11 +249,11 @@ async def chat_endpoint(session_id: str = Form(...), user_message: str = Form(..
     
     if USE_OPENAI:
         # LLM을 사용한 자연스러운 대화
-        result = natural_conversation_collect_info(
+        result = await _cancel_on_disconnect(request, natural_conversation_collect_info(
             session["resume"],
             session["chat_history"],
             session["slots"]
-        )
+        ))
         
         response_message = result.get("response", "알겠습니다.")
         slots_updated = result.get("slots_updated", {})
@@ -219,15 +295,72 @@ async def get_session(session_id: str):
     return session
 
 
+# 검색 응답에 포함할 공고 필드 (목록/상세 화면에서 사용하는 값만 전달)
+SEARCH_RESPONSE_JOB_FIELDS = (
+    "id", "title", "company", "location", "experience", "salary", "job_type",
+    "tech_stack", "company_size", "industry", "url", "full_content"
+)
+# 검색 응답에 포함할 순위 레코드 필드
+SEARCH_RESPONSE_RANK_FIELDS = (
+    "job_id", "match_score", "matched_keywords", "match_count", "total_keywords", "rank_score",
+    "score_breakdown", "cross_encoder_score"
+)
+
+
+async def _build_search_page(
+    ranked_jobs: list,
+    search_fingerprint: str,
+    offset: int,
+    page_size: int,
+    resume: dict,
+    slots: dict
+) -> dict:
+    """순위 목록에서 한 페이지를 잘라 카탈로그의 공고 필드와 항목별 매칭 점수를 채워 반환"""
+    catalog = load_job_catalog("jobs.txt")
+    page = []
+    page_jobs = []
+    for record in ranked_jobs[offset:offset + page_size]:
+        job_id = record["job_id"]
+        if 0 <= job_id < len(catalog):
+            job = catalog[job_id]
+            item = {field: job[field] for field in SEARCH_RESPONSE_JOB_FIELDS if field in job}
+            item.update({field: record[field] for field in SEARCH_RESPONSE_RANK_FIELDS if field in record})
+            page.append(item)
+            page_jobs.append(job)
+    
+    # 항목별 매칭 점수 (llm: 페이지 공고를 일괄 평가, embedding: 로컬 임베딩 - 모델이 없으면 생략)
+    if MATCH_SCORE_MODE == "llm":
+        match_details = await llm_match_scores(page_jobs, slots, resume)
+    else:
+        # 캐시에 없는 공고/프로필은 임베딩 모델을 실행하므로 이벤트 루프 밖에서 계산
+        match_details = await asyncio.to_thread(calculate_match_scores, page_jobs, slots, resume)
+    if match_details:
+        for item, details in zip(page, match_details):
+            item["match_details"] = details
+    
+    next_offset = offset + page_size
+    return {
+        "jobs": page,
+        "total": len(ranked_jobs),
+        "next_cursor": encode_search_cursor(search_fingerprint, next_offset) if next_offset < len(ranked_jobs) else None
+    }
+
+
 @app.post("/api/search-jobs")
 async def search_jobs_endpoint(
     session_id: str = Form(...),
     desired_job: str = Form(""),
     location: str = Form(""),
     job_type: str = Form(""),
-    company_size: str = Form("")
+    company_size: str = Form(""),
+    cursor: str = Form(""),
+    page_size: int = Form(10)
 ):
-    """채용공고 검색 - Retriever + Reranker 기반 검색"""
+    """채용공고 검색 - Retriever + Reranker 기반 검색
+    
+    순위 목록은 검색 조건별로 캐시되며, 응답의 next_cursor를 cursor로 보내면
+    파이프라인을 다시 실행하지 않고 다음 페이지를 반환합니다.
+    """
     session = SESSIONS.get(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
@@ -246,9 +379,48 @@ async def search_jobs_endpoint(
     if company_size:
         slots["company_size"] = company_size
     
+    # 이력서 벡터 혼합 모드: 업로드 시 저장된 임베딩을 세션별로 캐시하여 재사용
+    resume_embedding = None
+    if SEARCH_RESUME_WEIGHT > 0:
+        resume_embedding = RESUME_EMBEDDINGS.get(session_id)
+        if resume_embedding is None:
+            resume_embedding = get_resume_embedding(session_id)
+            if resume_embedding is not None:
+                RESUME_EMBEDDINGS[session_id] = resume_embedding
+                while len(RESUME_EMBEDDINGS) > RESUME_EMBEDDING_CACHE_SIZE:
+                    RESUME_EMBEDDINGS.popitem(last=False)
+        else:
+            RESUME_EMBEDDINGS.move_to_end(session_id)
+    
+    search_options = {
+        "multi_vector": SEARCH_MULTI_VECTOR,
+        "resume_weight": SEARCH_RESUME_WEIGHT if resume_embedding is not None else 0.0,
+        "resume_id": session_id if resume_embedding is not None else None,
+        "cross_encoder_top_n": CROSS_ENCODER_TOP_N if CROSS_ENCODER_ENABLED else 0,
+        "mmr": [SEARCH_MMR_TOP_K, SEARCH_MMR_LAMBDA, SEARCH_MAX_PER_COMPANY] if SEARCH_MMR_ENABLED else None
+    }
+    
+    page_size = max(1, min(page_size, 50))
+    index_version = get_index_version()
+    search_fingerprint = make_search_fingerprint(resume, slots, top_k=SEARCH_CANDIDATE_POOL, options=search_options)
+    
+    # 커서가 있으면 같은 검색 조건의 다음 페이지 요청
+    offset = 0
+    if cursor:
+        decoded = decode_search_cursor(cursor)
+        if decoded is None or decoded[0] != search_fingerprint:
+            raise HTTPException(status_code=400, detail="유효하지 않은 커서입니다. 검색을 처음부터 다시 요청하세요.")
+        offset = decoded[1]
+    
+    # 같은 조건의 재검색(새로고침, 뒤로가기, 다음 페이지 등)은 캐시된 순위 목록 사용
+    cached_ranking = get_cached_search(search_fingerprint)
+    if cached_ranking is not None:
+        print(f"⚡ 검색 캐시 적중: {len(cached_ranking)}개 공고 중 {offset}번째부터 반환")
+        return await _build_search_page(cached_ranking, search_fingerprint, offset, page_size, resume, slots)
+    
     try:
         # 채용공고 전체 데이터 로드 (먼저 로드)
-        all_jobs = load_jobs_from_txt("jobs.txt")
+        all_jobs = load_job_catalog("jobs.txt")
         if not all_jobs:
             raise HTTPException(
                 status_code=500, 
@@ -291,11 +463,21 @@ async def search_jobs_endpoint(
             traceback.print_exc()
             raise HTTPException(status_code=500, detail=error_msg)
         
-        # Step 1: Retriever - 이력서와 챗봇 정보를 기반으로 유사 공고 10개 추출
+        # Step 1: Retriever - 이력서와 챗봇 정보를 기반으로 유사 공고 후보 추출
         print("\n" + "="*80)
         print("🔍 Step 1: Retriever 실행 중...")
         print("="*80)
-        retrieved_results = retrieve_similar_jobs(resume, slots, top_k=10)
+        stage_latency_ms = {}
+        stage_start = time.perf_counter()
+        retrieved_results = retrieve_similar_jobs(
+            resume,
+            slots,
+            top_k=SEARCH_CANDIDATE_POOL,
+            multi_vector=SEARCH_MULTI_VECTOR,
+            resume_embedding=resume_embedding,
+            resume_weight=search_options["resume_weight"]
+        )
+        stage_latency_ms["retrieve"] = round((time.perf_counter() - stage_start) * 1000, 1)
         print(f"\n✅ Retriever 결과: {len(retrieved_results)}개 공고 추출")
         
         if not retrieved_results:
@@ -309,7 +491,9 @@ async def search_jobs_endpoint(
         print("\n" + "="*80)
         print("🎯 Step 2: Reranker 실행 중...")
         print("="*80)
+        stage_start = time.perf_counter()
         reranked_jobs = rerank_jobs(resume, slots, retrieved_results, all_jobs)
+        stage_latency_ms["rerank"] = round((time.perf_counter() - stage_start) * 1000, 1)
         print(f"\n✅ Reranker 결과: {len(reranked_jobs)}개 공고 재순위화 완료")
         
         if not reranked_jobs:
@@ -317,14 +501,38 @@ async def search_jobs_endpoint(
             print(f"❌ {error_msg}")
             raise HTTPException(status_code=500, detail=error_msg)
         
+        # Step 3 (선택): Cross-encoder - 상위 후보를 (쿼리, 공고 요약) 쌍 점수로 재정렬
+        if CROSS_ENCODER_ENABLED:
+            stage_start = time.perf_counter()
+            query_keywords, _ = build_weighted_query(resume, slots)
+            reranked_jobs = cross_encoder_rerank(
+                " ".join(query_keywords), reranked_jobs, all_jobs, top_n=CROSS_ENCODER_TOP_N
+            )
+            stage_latency_ms["cross_encoder"] = round((time.perf_counter() - stage_start) * 1000, 1)
+        
+        # Step 4 (선택): MMR - 같은 회사/비슷한 공고가 상위를 채우지 않도록 다양화
+        if SEARCH_MMR_ENABLED:
+            stage_start = time.perf_counter()
+            reranked_jobs = mmr_diversify(
+                reranked_jobs,
+                all_jobs,
+                top_k=SEARCH_MMR_TOP_K,
+                lambda_mult=SEARCH_MMR_LAMBDA,
+                max_per_company=SEARCH_MAX_PER_COMPANY
+            )
+            stage_latency_ms["mmr"] = round((time.perf_counter() - stage_start) * 1000, 1)
+        
+        # 순위 레코드(job_id + 매칭 정보)만 캐시 (본문은 페이지 단위로 카탈로그에서 조회)
+        store_search_result(search_fingerprint, reranked_jobs, index_version)
+        
         print("\n" + "="*80)
-        print(f"✅ 최종 검색 완료: {len(reranked_jobs)}개 공고 중 상위 10개 반환")
+        print(f"✅ 최종 검색 완료: {len(reranked_jobs)}개 공고 중 {offset}번째부터 {page_size}개 반환")
+        print(f"⏱️  단계별 소요 시간(ms): {stage_latency_ms}")
         print("="*80 + "\n")
         
-        return {
-            "jobs": reranked_jobs[:10],  # 상위 10개만 반환
-            "total": len(reranked_jobs)
-        }
+        response = await _build_search_page(reranked_jobs, search_fingerprint, offset, page_size, resume, slots)
+        response["stage_latency_ms"] = stage_latency_ms
+        return response
         
     except HTTPException:
         # HTTPException은 그대로 전달
@@ -337,57 +545,76 @@ async def search_jobs_endpoint(
         raise HTTPException(status_code=500, detail=error_msg)
 
 
-@app.post("/api/generate-cover-letter")
-async def generate_cover_letter_endpoint(
-    session_id: str = Form(...),
-    job_title: str = Form(...),
-    company_name: str = Form(...),
-    sections: str = Form("")
-):
-    """자기소개서 생성"""
-    session = SESSIONS.get(session_id)
-    if not session:
-        raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
+@app.get("/api/search-jobs-keyword")
+async def search_jobs_keyword_endpoint(q: str, page: int = 1, page_size: int = 10):
+    """채용공고 키워드 검색 - SQLite FTS5 전문 검색 (세션/임베딩 불필요)"""
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="검색어를 입력하세요.")
+    if page < 1:
+        raise HTTPException(status_code=400, detail="page는 1 이상이어야 합니다.")
+    page_size = max(1, min(page_size, 50))
     
-    # 채용공고 정보 가져오기
     try:
-        jobs = load_jobs_from_txt("jobs.txt")
-        job_info = None
-        
-        # 제목과 회사명으로 채용공고 찾기
-        for job in jobs:
+        # 인덱스는 시작 시 만들어 두지만 jobs.txt가 바뀌면 재구성되므로, 확인과 조회 모두 이벤트 루프 밖에서 실행
+        if not await asyncio.to_thread(ensure_fulltext_index, "jobs.txt"):
+            raise HTTPException(
+                status_code=500,
+                detail="전문 검색 인덱스를 준비할 수 없습니다. jobs.txt 파일을 확인하세요."
+            )
+        return await asyncio.to_thread(search_jobs_fulltext, q, page=page, page_size=page_size)
+    except HTTPException:
+        raise
+    except Exception as e:
+        error_msg = f"키워드 검색 중 오류 발생: {str(e)}"
+        print(f"❌ {error_msg}")
+        raise HTTPException(status_code=500, detail=error_msg)
+
+
+def _find_job_info(job_title: str, company_name: str) -> Optional[dict]:
+    """제목과 회사명으로 채용공고 정보 조회 (없거나 오류가 나면 None)"""
+    try:
+        for job in load_job_catalog("jobs.txt"):
             if job.get('title') == job_title and job.get('company') == company_name:
-                job_info = job
-                # load_jobs_from_txt 형식에 맞게 필드 매핑
-                if 'work' not in job_info:
-                    job_info['work'] = job_info.get('description', '')
-                if 'requirements' not in job_info:
-                    job_info['requirements'] = ' '.join(job_info.get('requirements', [])) if isinstance(job_info.get('requirements'), list) else job_info.get('requirements', '')
-                break
-        
-        # 채용공고를 찾지 못한 경우 기본 정보로 생성
-        if not job_info:
-            job_info = {
-                "title": job_title,
-                "company": company_name,
-                "work": "",
-                "requirements": "",
-                "conditions": "",
-                "benefits": ""
-            }
+                # 카탈로그 공고는 공유되므로 복사해서 사용 (프롬프트는 수집 시 만든 job["digest"] 사용)
+                job_info = dict(job)
+                full_content = job.get('full_content', {}) or {}
+                job_info['work'] = full_content.get('work', '') or job.get('description', '')
+                job_info['requirements'] = full_content.get('requirements', '')
+                job_info['conditions'] = full_content.get('conditions', '')
+                job_info['benefits'] = full_content.get('benefits', '')
+                return job_info
     except Exception as e:
         print(f"⚠️  채용공고 정보를 가져오는 중 오류: {e}")
-        # 기본 정보로 생성
+    return None
+
+
+def _default_job_info(job_title: str, company_name: str) -> dict:
+    """채용공고를 찾지 못했을 때 사용할 기본 정보"""
+    return {
+        "title": job_title,
+        "company": company_name,
+        "work": "",
+        "requirements": "",
+        "conditions": "",
+        "benefits": ""
+    }
+
+
+def _review_job_info(job_title: str, company_name: str) -> dict:
+    """첨삭용 채용공고 정보 (제목과 회사명이 모두 있을 때만 조회, 없으면 기본값)"""
+    job_info = _find_job_info(job_title, company_name) if job_title and company_name else None
+    if not job_info:
         job_info = {
-            "title": job_title,
-            "company": company_name,
+            "title": job_title or "N/A",
+            "company": company_name or "N/A",
             "work": "",
-            "requirements": "",
-            "conditions": "",
-            "benefits": ""
+            "requirements": ""
         }
-    
-    # 섹션 목록 파싱
+    return job_info
+
+
+def _parse_section_list(sections: str) -> list:
+    """자기소개서 섹션 목록 파싱 (JSON 배열 또는 줄바꿈 구분)"""
     section_list = []
     if sections:
         try:
@@ -395,18 +622,65 @@ async def generate_cover_letter_endpoint(
         except Exception:
             # JSON 파싱 실패 시 줄바꿈으로 분리
             section_list = [s.strip() for s in sections.split('\n') if s.strip()]
+    return section_list
+
+
+# 스트리밍 응답 (Server-Sent Events)
+# 각 메시지는 "event: <이벤트>\ndata: <JSON>\n\n" 형식이며, 섹션 단위 이벤트에는 "section" 필드가 포함됩니다.
+#   section_start / delta / section_end / question / error / done
+# 이벤트별 데이터는 각 *_stream() 생성 함수의 docstring을 참고하세요. 마지막 이벤트는 항상 done 또는 error입니다.
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def _sse_event(event: str, data: dict) -> str:
+    """SSE 메시지 한 개 직렬화"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _sse_stream(events, on_done=None):
+    """(이벤트, 데이터) 비동기 생성기를 SSE 메시지로 변환 (done 이벤트에서 on_done 호출)"""
+    try:
+        async for event, data in events:
+            if event == "done" and on_done is not None:
+                on_done(data)
+            yield _sse_event(event, data)
+    except Exception as e:
+        print(f"❌ 스트리밍 응답 중 오류: {e}")
+        yield _sse_event("error", {"message": str(e)})
+
+
+@app.post("/api/generate-cover-letter")
+async def generate_cover_letter_endpoint(
+    request: Request,
+    session_id: str = Form(...),
+    job_title: str = Form(...),
+    company_name: str = Form(...),
+    sections: str = Form(""),
+    mode: str = Form("")
+):
+    """자기소개서 생성 (mode: section 또는 batch, 비우면 COVER_LETTER_MODE 설정 사용)"""
+    session = SESSIONS.get(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
+    
+    # 채용공고 정보 가져오기 (찾지 못한 경우 기본 정보로 생성)
+    job_info = _find_job_info(job_title, company_name) or _default_job_info(job_title, company_name)
+    
+    # 섹션 목록 파싱
+    section_list = _parse_section_list(sections)
     
     # 자기소개서 생성
     try:
         resume = session.get("resume", {})
         chat_history = session.get("chat_history", [])
         
-        cover_letter = generate_cover_letter(
+        cover_letter = await _cancel_on_disconnect(request, generate_cover_letter(
             resume=resume,
             job_info=job_info,
             sections=section_list if section_list else None,
-            chat_history=chat_history
-        )
+            chat_history=chat_history,
+            mode=mode or None
+        ))
         
         # 세션에 자기소개서 저장
         session["cover_letter"] = cover_letter
@@ -415,6 +689,9 @@ async def generate_cover_letter_endpoint(
             "success": True,
             "cover_letter": cover_letter
         }
+    except HTTPException:
+        # 클라이언트 연결 종료(499) 등은 500으로 바꾸지 않고 그대로 전달
+        raise
     except Exception as e:
         print(f"❌ 자기소개서 생성 중 오류: {e}")
         raise HTTPException(
@@ -425,6 +702,7 @@ async def generate_cover_letter_endpoint(
 
 @app.post("/api/review-cover-letter")
 async def review_cover_letter_endpoint(
+    request: Request,
     session_id: str = Form(...),
     section_name: str = Form(...),
     cover_letter_text: str = Form(...),
@@ -436,46 +714,26 @@ async def review_cover_letter_endpoint(
     if not session:
         raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
     
-    # 채용공고 정보 가져오기
-    job_info = None
-    if job_title and company_name:
-        try:
-            jobs = load_jobs_from_txt("jobs.txt")
-            for job in jobs:
-                if job.get('title') == job_title and job.get('company') == company_name:
-                    job_info = job
-                    if 'work' not in job_info:
-                        job_info['work'] = job_info.get('description', '')
-                    if 'requirements' not in job_info:
-                        job_info['requirements'] = ' '.join(job_info.get('requirements', [])) if isinstance(job_info.get('requirements'), list) else job_info.get('requirements', '')
-                    break
-        except Exception as e:
-            print(f"⚠️  채용공고 정보를 가져오는 중 오류: {e}")
-    
-    # 채용공고 정보가 없으면 기본값 사용
-    if not job_info:
-        job_info = {
-            "title": job_title or "N/A",
-            "company": company_name or "N/A",
-            "work": "",
-            "requirements": ""
-        }
+    job_info = _review_job_info(job_title, company_name)
     
     try:
         resume = session.get("resume", {})
         
         # 자기소개서 첨삭 실행
-        review_result = review_and_improve_cover_letter(
+        review_result = await _cancel_on_disconnect(request, review_and_improve_cover_letter(
             cover_letter_text=cover_letter_text,
             section_name=section_name,
             resume=resume,
             job_info=job_info
-        )
+        ))
         
         return {
             "success": True,
             "review": review_result
         }
+    except HTTPException:
+        # 클라이언트 연결 종료(499) 등은 500으로 바꾸지 않고 그대로 전달
+        raise
     except Exception as e:
         print(f"❌ 자기소개서 첨삭 중 오류: {e}")
         raise HTTPException(
@@ -486,6 +744,7 @@ async def review_cover_letter_endpoint(
 
 @app.post("/api/start-interview")
 async def start_interview_endpoint(
+    request: Request,
     session_id: str = Form(...),
     job_title: str = Form(...),
     company_name: str = Form(...)
@@ -495,42 +754,8 @@ async def start_interview_endpoint(
     if not session:
         raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
     
-    # 채용공고 정보 가져오기
-    try:
-        jobs = load_jobs_from_txt("jobs.txt")
-        job_info = None
-        
-        # 제목과 회사명으로 채용공고 찾기
-        for job in jobs:
-            if job.get('title') == job_title and job.get('company') == company_name:
-                job_info = job
-                # load_jobs_from_txt 형식에 맞게 필드 매핑
-                if 'work' not in job_info:
-                    job_info['work'] = job_info.get('description', '')
-                if 'requirements' not in job_info:
-                    job_info['requirements'] = ' '.join(job_info.get('requirements', [])) if isinstance(job_info.get('requirements'), list) else job_info.get('requirements', '')
-                break
-        
-        # 채용공고를 찾지 못한 경우 기본 정보로 생성
-        if not job_info:
-            job_info = {
-                "title": job_title,
-                "company": company_name,
-                "work": "",
-                "requirements": "",
-                "conditions": "",
-                "benefits": ""
-            }
-    except Exception as e:
-        print(f"⚠️  채용공고 정보를 가져오는 중 오류: {e}")
-        job_info = {
-            "title": job_title,
-            "company": company_name,
-            "work": "",
-            "requirements": "",
-            "conditions": "",
-            "benefits": ""
-        }
+    # 채용공고 정보 가져오기 (찾지 못한 경우 기본 정보로 생성)
+    job_info = _find_job_info(job_title, company_name) or _default_job_info(job_title, company_name)
     
     # 자기소개서 정보 가져오기 (세션에 저장되어 있다면)
     cover_letter = session.get("cover_letter")
@@ -539,12 +764,12 @@ async def start_interview_endpoint(
         resume = session.get("resume", {})
         
         # 면접 질문 생성
-        questions = generate_interview_questions(
+        questions = await _cancel_on_disconnect(request, generate_interview_questions(
             resume=resume,
             job_info=job_info,
             cover_letter=cover_letter,
             num_questions=5
-        )
+        ))
         
         # 면접 데이터 저장
         interview_data = {
@@ -561,6 +786,9 @@ async def start_interview_endpoint(
             "success": True,
             "interview": interview_data
         }
+    except HTTPException:
+        # 클라이언트 연결 종료(499) 등은 500으로 바꾸지 않고 그대로 전달
+        raise
     except Exception as e:
         print(f"❌ 면접 시작 중 오류: {e}")
         raise HTTPException(
@@ -568,6 +796,96 @@ async def start_interview_endpoint(
             detail=f"면접 시작 중 오류가 발생했습니다: {str(e)}"
         )
 
+@app.post("/api/generate-cover-letter/stream")
+async def generate_cover_letter_stream_endpoint(
+    session_id: str = Form(...),
+    job_title: str = Form(...),
+    company_name: str = Form(...),
+    sections: str = Form(""),
+    mode: str = Form("")
+):
+    """자기소개서 생성 (SSE 스트리밍, 섹션별 GPT-4o 첨삭 토큰 전달)"""
+    session = SESSIONS.get(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
+    
+    job_info = _find_job_info(job_title, company_name) or _default_job_info(job_title, company_name)
+    section_list = _parse_section_list(sections)
+    
+    def save_cover_letter(data: dict):
+        session["cover_letter"] = data["cover_letter"]
+    
+    events = generate_cover_letter_stream(
+        resume=session.get("resume", {}),
+        job_info=job_info,
+        sections=section_list if section_list else None,
+        chat_history=session.get("chat_history", []),
+        mode=mode or None
+    )
+    return StreamingResponse(
+        _sse_stream(events, on_done=save_cover_letter),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
+
+@app.post("/api/review-cover-letter/stream")
+async def review_cover_letter_stream_endpoint(
+    session_id: str = Form(...),
+    section_name: str = Form(...),
+    cover_letter_text: str = Form(...),
+    job_title: str = Form(""),
+    company_name: str = Form("")
+):
+    """자기소개서 첨삭 (SSE 스트리밍, 첨삭 의견 토큰 전달)"""
+    session = SESSIONS.get(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
+    
+    events = review_and_improve_cover_letter_stream(
+        cover_letter_text=cover_letter_text,
+        section_name=section_name,
+        resume=session.get("resume", {}),
+        job_info=_review_job_info(job_title, company_name)
+    )
+    return StreamingResponse(_sse_stream(events), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+@app.post("/api/start-interview/stream")
+async def start_interview_stream_endpoint(
+    session_id: str = Form(...),
+    job_title: str = Form(...),
+    company_name: str = Form(...)
+):
+    """면접 시작 (SSE 스트리밍, 질문이 완성되는 대로 전달)"""
+    session = SESSIONS.get(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
+    
+    job_info = _find_job_info(job_title, company_name) or _default_job_info(job_title, company_name)
+    
+    def save_interview(data: dict):
+        session["interview"] = {
+            "job_title": job_title,
+            "company_name": company_name,
+            "questions": data["questions"],
+            "answers": [],
+            "evaluations": []
+        }
+    
+    events = generate_interview_questions_stream(
+        resume=session.get("resume", {}),
+        job_info=job_info,
+        cover_letter=session.get("cover_letter"),
+        num_questions=5
+    )
+    return StreamingResponse(
+        _sse_stream(events, on_done=save_interview),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
+
 @app.get("/api/interview-status/{session_id}")
 async def get_interview_status(session_id: str):
     """면접 상태 조회"""
@@ -589,8 +907,36 @@ async def get_interview_status(session_id: str):
         }
 
 
+@app.get("/api/llm-scheduler")
+async def get_llm_scheduler_status():
+    """LLM 호출 스케줄러 상태 조회 (모델별 대기열 깊이, 대기 시간, 남은 예산)"""
+    return {
+        "success": True,
+        "scheduler": get_scheduler_stats()
+    }
+
+
+@app.get("/api/llm-metrics")
+async def get_llm_metrics_status():
+    """LLM 호출 통계 조회 (호출 위치·모델별 지연/토큰/비용 히스토그램, 재시도, 캐시 적중, 오류)"""
+    return {
+        "success": True,
+        "metrics": get_llm_metrics()
+    }
+
+
+@app.get("/api/llm-prompt-cache")
+async def get_llm_prompt_cache_status(call_site: Optional[str] = None):
+    """호출 위치별 공급자 프롬프트 캐시 적중 통계 (프롬프트 토큰, 캐시 적중 토큰, 적중 비율)"""
+    return {
+        "success": True,
+        "prompt_cache": get_prompt_cache_stats(call_site)
+    }
+
+
 @app.post("/api/submit-answer")
 async def submit_answer_endpoint(
+    request: Request,
     session_id: str = Form(...),
     question_index: int = Form(...),
     answer: str = Form(...)
@@ -612,24 +958,19 @@ async def submit_answer_endpoint(
         resume = session.get("resume", {})
         cover_letter = session.get("cover_letter")
         
-        # 채용공고 정보 가져오기
-        job_info = {
-            "title": interview.get("job_title", ""),
-            "company": interview.get("company_name", ""),
-            "work": "",
-            "requirements": "",
-            "conditions": "",
-            "benefits": ""
-        }
+        # 채용공고 정보 가져오기 (면접 시작 때와 같은 공고 - 평가 프롬프트도 같은 요약/캐시 접두사 사용)
+        job_title = interview.get("job_title", "")
+        company_name = interview.get("company_name", "")
+        job_info = _find_job_info(job_title, company_name) or _default_job_info(job_title, company_name)
         
         # 답변 평가
-        evaluation = evaluate_answer(
+        evaluation = await _cancel_on_disconnect(request, evaluate_answer(
             question=questions[question_index],
             answer=answer,
             resume=resume,
             job_info=job_info,
             cover_letter=cover_letter
-        )
+        ))
         
         # 답변과 평가 저장
         answers = interview.get("answers", [])
@@ -661,13 +1002,13 @@ async def submit_answer_endpoint(
         overall_evaluation = None
         if all_answered and not interview.get("overall_evaluation"):
             # 전체 평가 생성
-            overall_evaluation = generate_overall_evaluation(
+            overall_evaluation = await _cancel_on_disconnect(request, generate_overall_evaluation(
                 questions=questions,
                 answers=answers,
                 evaluations=evaluations,
                 resume=resume,
                 job_info=job_info
-            )
+            ))
             interview["overall_evaluation"] = overall_evaluation
         
         return {
@@ -681,6 +1022,9 @@ async def submit_answer_endpoint(
             "completed": all_answered,
             "overall_evaluation": overall_evaluation
         }
+    except HTTPException:
+        # 클라이언트 연결 종료(499) 등은 500으로 바꾸지 않고 그대로 전달
+        raise
     except Exception as e:
         print(f"❌ 답변 제출 중 오류: {e}")
         raise HTTPException(
@@ -5,7 +5,10 @@
 import json
 from typing import Dict, List, Optional
 from .config import SLOT_ORDER, SLOT_DESCRIPTIONS, SLOT_QUESTIONS
-from .llm_clients import OPENAI_CLIENT, USE_OPENAI
+from .llm_clients import USE_OPENAI
+from .llm_gateway import openai_chat
+from .llm_scheduler import PRIORITY_INTERACTIVE
+from .resume_digest import get_resume_digest
 
 
 def next_unfilled_slot(session: Dict) -> Optional[str]:
@@ -44,7 +47,7 @@ def heuristic_extract_slot(slot_name: str, message: str):
     return message.strip()
 
 
-def openai_extract_slot_with_llm(slot_name: str, user_message: str, chat_history: List) -> Dict:
+async def openai_extract_slot_with_llm(slot_name: str, user_message: str, chat_history: List) -> Dict:
     """LLM을 사용하여 슬롯 값을 추출"""
     if not USE_OPENAI:
         return {
@@ -88,29 +91,31 @@ def openai_extract_slot_with_llm(slot_name: str, user_message: str, chat_history
 JSON만 출력하세요 (마크다운 없이).
 """
     
-    if hasattr(OPENAI_CLIENT, 'chat'):
-        resp = OPENAI_CLIENT.chat.completions.create(
+    try:
+        txt = await openai_chat(
+            [{"role":"user","content":prompt}],
             model="gpt-4o-mini",
-            messages=[{"role":"user","content":prompt}],
+            priority=PRIORITY_INTERACTIVE,
+            call_site="chat.extract_slot",
             temperature=0.6
         )
-        txt = resp.choices[0].message.content.strip()
-    else:
-        resp = OPENAI_CLIENT.ChatCompletion.create(
-            model="gpt-4o-mini",
-            messages=[{"role":"user","content":prompt}],
-            temperature=0.6
-        )
-        txt = resp.choices[0].message.content.strip()
-    
-    # JSON 파싱
-    txt = txt.replace("```json", "").replace("```", "").strip()
-    result = json.loads(txt)
+        
+        # JSON 파싱
+        txt = txt.replace("```json", "").replace("```", "").strip()
+        result = json.loads(txt)
+    except Exception as e:
+        # LLM 장애(서킷 열림, 제한 시간 초과 등) 시 휴리스틱으로 대체
+        print(f"⚠️  슬롯 추출 LLM 호출 실패, 휴리스틱으로 대체: {e}")
+        return {
+            "value": heuristic_extract_slot(slot_name, user_message),
+            "confidence": "low",
+            "response": None
+        }
     
     return result
 
 
-def natural_conversation_collect_info(resume: Dict, chat_history: List, slots: Dict) -> Dict:
+async def natural_conversation_collect_info(resume: Dict, chat_history: List, slots: Dict) -> Dict:
     """자연스러운 대화로 정보 수집"""
     if not USE_OPENAI:
         return {
@@ -139,7 +144,7 @@ def natural_conversation_collect_info(resume: Dict, chat_history: List, slots: D
     # 사용자 메시지가 있고, 아직 채워지지 않은 슬롯이 있으면 슬롯 값 추출 시도
     if user_message and next_slot:
         # LLM을 사용하여 슬롯 값 추출
-        extracted = openai_extract_slot_with_llm(next_slot, user_message, chat_history)
+        extracted = await openai_extract_slot_with_llm(next_slot, user_message, chat_history)
         extracted_value = extracted.get("value")
         
         if extracted_value and extracted_value.strip():
@@ -192,9 +197,7 @@ def natural_conversation_collect_info(resume: Dict, chat_history: List, slots: D
         prompt = f"""당신은 채용 정보를 수집하는 친절하고 자연스러운 AI 챗봇입니다.
 
 **지원자 이력서 정보:**
-- 이름: {resume.get('name', '지원자')}
-- 경력: {resume.get('experience_years', 0)}년
-- 기술: {', '.join(resume.get('skills', [])[:5])}
+{get_resume_digest(resume)}
 
 **이미 수집한 정보:**
 {json.dumps(slots, ensure_ascii=False, indent=2)}
@@ -212,20 +215,18 @@ def natural_conversation_collect_info(resume: Dict, chat_history: List, slots: D
 응답만 출력하세요 (설명이나 형식 없이).
 """
     
-    if hasattr(OPENAI_CLIENT, 'chat'):
-        resp = OPENAI_CLIENT.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role":"user","content":prompt}],
-            temperature=0.7
-        )
-        txt = resp.choices[0].message.content.strip()
-    else:
-        resp = OPENAI_CLIENT.ChatCompletion.create(
+    try:
+        txt = await openai_chat(
+            [{"role":"user","content":prompt}],
             model="gpt-4o-mini",
-            messages=[{"role":"user","content":prompt}],
+            priority=PRIORITY_INTERACTIVE,
+            call_site="chat.reply",
             temperature=0.7
         )
-        txt = resp.choices[0].message.content.strip()
+    except Exception as e:
+        # LLM 장애 시 고정 질문으로 대체
+        print(f"⚠️  대화 응답 LLM 호출 실패, 기본 질문으로 대체: {e}")
+        txt = SLOT_QUESTIONS.get(next_slot, "")
     
     return {
         "response": txt,
@@ -2,6 +2,7 @@
 설정 관리 모듈
 환경 변수 로드 및 설정값 관리
 """
+import json
 import os
 from pathlib import Path
 
@@ -45,6 +46,116 @@ if not OPENAI_API_KEY:
 
 # 선택적 환경 변수
 USE_GEMINI = bool(GEMINI_API_KEY)
+# API 주소 변경 (로컬 가짜 LLM 서버 benchmarks/fake_llm_server.py, 프록시 등)
+# OPENAI_BASE_URL 예: http://127.0.0.1:8100/v1
+# GEMINI_BASE_URL 예: http://127.0.0.1:8100 (지정하면 google.generativeai 대신 REST API 직접 호출)
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None
+GEMINI_BASE_URL = os.getenv("GEMINI_BASE_URL") or None
+
+# LLM 호출 설정
+# 호출별 제한 시간(초)과 비동기 클라이언트가 공유하는 최대 동시 연결 수
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "200"))
+# 일시적 오류(연결, 429, 5xx) 재시도: 최대 횟수와 지수 백오프(full jitter) 기준/최대 대기(초)
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+LLM_RETRY_BASE_DELAY = float(os.getenv("LLM_RETRY_BASE_DELAY", "0.5"))
+LLM_RETRY_MAX_DELAY = float(os.getenv("LLM_RETRY_MAX_DELAY", "8"))
+# hedging: 응답이 같은 호출 위치의 최근 p95 지연(최소 LLM_HEDGE_MIN_DELAY초)보다 늦으면 같은 요청을 하나 더 보내
+# 먼저 온 응답 사용 (중복 요청도 비용이 청구됨 - 호출 위치별 표본이 LLM_HEDGE_MIN_SAMPLES개 모이기 전에는 보내지 않으며,
+# 긴 생성 호출(자기소개서 초안/첨삭, 매칭 점수 일괄 평가)은 hedge=False로 제외)
+LLM_HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "true").lower() == "true"
+LLM_HEDGE_MIN_DELAY = float(os.getenv("LLM_HEDGE_MIN_DELAY", "3"))
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+# 서킷 브레이커: 공급자별 연속 실패가 기준에 도달하면 일정 시간 호출 차단 (대체 공급자/휴리스틱 사용)
+LLM_BREAKER_FAILURE_THRESHOLD = int(os.getenv("LLM_BREAKER_FAILURE_THRESHOLD", "5"))
+LLM_BREAKER_RESET_SECONDS = float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30"))
+# LLM 호출 스케줄러: 모델별 분당 요청 수(rpm)/토큰 수(tpm) 예산 안에서 우선순위 순으로 호출
+# (프로세스 단위 예산이므로 uvicorn 워커가 여러 개면 계정 한도를 워커 수로 나눠 설정)
+LLM_SCHEDULER_ENABLED = os.getenv("LLM_SCHEDULER_ENABLED", "true").lower() == "true"
+LLM_RATE_LIMITS = {
+    "gpt-4o": {"rpm": 500, "tpm": 30000},
+    "gpt-4o-mini": {"rpm": 500, "tpm": 200000},
+    "gemini-2.5-flash": {"rpm": 1000, "tpm": 1000000},
+}
+# 계정 한도에 맞춘 예산 파일 (JSON 객체 {모델: {"rpm", "tpm"}}, 지정한 모델만 덮어씀)
+LLM_RATE_LIMITS_PATH = os.getenv("LLM_RATE_LIMITS_PATH")
+if LLM_RATE_LIMITS_PATH:
+    try:
+        with open(LLM_RATE_LIMITS_PATH, encoding="utf-8") as f:
+            LLM_RATE_LIMITS.update({
+                model: {"rpm": float(limits["rpm"]), "tpm": float(limits["tpm"])}
+                for model, limits in json.load(f).items()
+            })
+    except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+        print(f"⚠️  LLM 호출 예산 파일을 읽을 수 없습니다 ({LLM_RATE_LIMITS_PATH}): {e}")
+# LLM 응답 캐시 (SQLite): 재현 가능한 호출(temperature=0 또는 seed 지정)만 저장
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+# 같은 입력에 같은 결과를 내도록 고정하는 seed (면접 질문, 첨삭 등 캐시 대상 호출에 사용)
+LLM_SEED = int(os.getenv("LLM_SEED", "42"))
+# LLM 호출 기록: 호출 위치별 지연/토큰/비용 히스토그램 + 호출마다 한 줄씩 남기는 JSONL 추적 파일
+LLM_TRACE_ENABLED = os.getenv("LLM_TRACE_ENABLED", "true").lower() == "true"
+# 추적 파일이 이 크기를 넘으면 .1 파일로 교체 (이전 .1 파일은 삭제)
+LLM_TRACE_MAX_BYTES = int(os.getenv("LLM_TRACE_MAX_BYTES", str(50 * 1024 * 1024)))
+# 비용 추정용 모델별 100만 토큰당 가격(USD): 입력, 캐시 적중 입력, 출력
+LLM_PRICES = {
+    "gpt-4o": {"input": 2.5, "cached_input": 1.25, "output": 10.0},
+    "gpt-4o-mini": {"input": 0.15, "cached_input": 0.075, "output": 0.6},
+    "gemini-2.5-flash": {"input": 0.3, "cached_input": 0.075, "output": 2.5},
+}
+# 자기소개서 섹션 동시 생성 수 (섹션마다 초안 + 첨삭 2회 호출)
+COVER_LETTER_CONCURRENCY = int(os.getenv("COVER_LETTER_CONCURRENCY", "4"))
+# 자기소개서 생성 방식: section(섹션마다 초안 + 첨삭) 또는 batch(모든 섹션을 한 번의 JSON 요청으로 초안 + 첨삭)
+COVER_LETTER_MODE = os.getenv("COVER_LETTER_MODE", "section").lower()
+# batch 방식에서 GPT-4o 첨삭 호출 여부 (false면 초안 1회 호출만 사용)
+COVER_LETTER_BATCH_REFINE = os.getenv("COVER_LETTER_BATCH_REFINE", "true").lower() == "true"
+
+# 검색 설정
+# 멀티 벡터 검색: 슬롯 키워드별로 임베딩하여 가중치로 융합 (false면 키워드를 하나의 문장으로 결합)
+SEARCH_MULTI_VECTOR = os.getenv("SEARCH_MULTI_VECTOR", "false").lower() == "true"
+# 이력서 벡터 혼합 비율: 0보다 크면 업로드 시 저장된 이력서 임베딩을 검색 쿼리 벡터에 혼합 (0~1)
+SEARCH_RESUME_WEIGHT = float(os.getenv("SEARCH_RESUME_WEIGHT", "0"))
+# 검색 후보 수: 한 번의 검색으로 순위를 매겨 캐시하는 공고 수 (페이지는 이 목록에서 잘라서 반환)
+SEARCH_CANDIDATE_POOL = int(os.getenv("SEARCH_CANDIDATE_POOL", "50"))
+# cross-encoder 재순위화: 상위 N개 후보를 로컬 CPU cross-encoder로 재정렬 (N이 클수록 정확하지만 느림)
+CROSS_ENCODER_ENABLED = os.getenv("CROSS_ENCODER_ENABLED", "false").lower() == "true"
+CROSS_ENCODER_TOP_N = int(os.getenv("CROSS_ENCODER_TOP_N", "20"))
+# 결과 다양화(MMR): 상위 N개를 관련도와 중복도(저장된 chunk 임베딩 유사도)로 다시 선택
+SEARCH_MMR_ENABLED = os.getenv("SEARCH_MMR_ENABLED", "false").lower() == "true"
+SEARCH_MMR_TOP_K = int(os.getenv("SEARCH_MMR_TOP_K", "20"))
+SEARCH_MMR_LAMBDA = float(os.getenv("SEARCH_MMR_LAMBDA", "0.7"))  # 1이면 기존 순서, 낮을수록 다양성 우선
+SEARCH_MAX_PER_COMPANY = int(os.getenv("SEARCH_MAX_PER_COMPANY", "2"))  # MMR 상위 N개 안에서 회사별 최대 공고 수 (0이면 제한 없음)
+# 재순위화 특징 가중치: rank_score = Σ(특징값 × 가중치)
+# 기본값은 기존 정렬(매칭된 키워드 개수 → 벡터 거리)과 같은 순서를 만듦
+# (키워드 매칭 1개 = 1.0, 벡터 유사도(0~1) 가중치 < 1.0이므로 매칭 개수가 같을 때만 순서에 영향)
+# *_equal 특징은 공고 수집 시 근무 조건/기업 정보에서 채운 메타데이터 기준 (기본 0, 가중치 파일로 사용)
+# 단, 채운 지역/고용형태/기업규모/산업군은 벡터 인덱스 청크 텍스트와 키워드 매칭에도 들어가므로
+# 재인덱싱 후에는 가중치가 0이어도 기본 검색 순위가 달라질 수 있음
+RERANK_FEATURE_WEIGHTS = {
+    "vector_similarity": 0.5,
+    "desired_job_match": 1.0,
+    "location_match": 1.0,
+    "job_type_match": 1.0,
+    "industry_match": 1.0,
+    "company_size_match": 1.0,
+    "experience_match": 1.0,
+    "location_equal": 0.0,
+    "job_type_equal": 0.0,
+    "company_size_equal": 0.0,
+    "industry_equal": 0.0,
+}
+# 학습/튜닝한 가중치 파일 (JSON 객체, 지정한 특징만 덮어씀)
+RERANK_FEATURE_WEIGHTS_PATH = os.getenv("RERANK_FEATURE_WEIGHTS_PATH")
+if RERANK_FEATURE_WEIGHTS_PATH:
+    try:
+        with open(RERANK_FEATURE_WEIGHTS_PATH, encoding="utf-8") as f:
+            RERANK_FEATURE_WEIGHTS.update({k: float(v) for k, v in json.load(f).items()})
+    except (OSError, ValueError, AttributeError) as e:
+        print(f"⚠️  재순위화 가중치 파일을 읽을 수 없습니다 ({RERANK_FEATURE_WEIGHTS_PATH}): {e}")
+
+# 검색 결과 항목별 매칭 점수 방식: embedding(로컬 임베딩 유사도) 또는 llm(공고 여러 개를 한 번에 LLM 평가)
+MATCH_SCORE_MODE = os.getenv("MATCH_SCORE_MODE", "embedding").lower()
 
 # 슬롯 정의
 SLOT_ORDER = ["desired_job", "location", "job_type", "company_size"]
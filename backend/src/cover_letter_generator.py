@@ -2,111 +2,90 @@
 자기소개서 생성 모듈
 이력서와 채용공고 정보를 바탕으로 자기소개서 생성
 """
-from typing import Dict, List, Optional
-from .llm_clients import OPENAI_CLIENT, USE_OPENAI, GEMINI_CLIENT, USE_GEMINI, initialize_gemini_client
+import asyncio
+import json
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from .prompt_context import format_prompt_context
+from .config import COVER_LETTER_CONCURRENCY, COVER_LETTER_MODE, COVER_LETTER_BATCH_REFINE, LLM_SEED
+from .llm_clients import USE_OPENAI
+from .llm_gateway import openai_chat, openai_chat_stream, generate_text_with_fallback, is_gemini_available
+from .llm_scheduler import PRIORITY_BATCH
+
+
+# 기본 섹션 목록
+DEFAULT_SECTIONS = ["지원 동기", "직무 관련 역량", "협업 관련 경험", "입사 후 포부"]
+
+# 섹션별 최대 글자 수 (기본값)
+SECTION_MAX_CHARS = 1000
+
+# 섹션별 작성 요구사항 (앞 1개 + 뒤 2개, 사이에 공통 형식 요구사항이 들어감)
+SECTION_GUIDELINES = {
+    "지원 동기": [
+        "회사와 직무에 대한 관심과 지원 동기를 구체적으로 작성",
+        "진솔하고 구체적인 내용으로 작성",
+        "구체적인 사례나 경험을 포함하여 설득력 있게 작성",
+    ],
+    "직무 관련 역량": [
+        "직무 수행에 필요한 핵심 역량과 기술을 구체적으로 제시",
+        "실제 경험과 사례를 중심으로 작성",
+        "구체적인 성과나 결과를 포함하여 작성",
+    ],
+    "협업 관련 경험": [
+        "팀 프로젝트나 협업 경험을 구체적으로 서술",
+        "구체적인 상황, 역할, 기여, 배운 점을 포함",
+        "협업 과정에서의 결과나 성과를 명시",
+    ],
+    "입사 후 포부": [
+        "입사 후 단기 목표와 장기 비전을 구체적으로 작성",
+        "회사와 직무에 기여할 수 있는 방안을 포함",
+        "현실적이고 구체적인 계획을 제시",
+    ],
+}
+
+
+# 프롬프트 구성 원칙: 공통 컨텍스트(이력서/채용공고 요약) → 고정 지시문 → 호출마다 바뀌는 내용(섹션명, 초안)
+# 순서로 두어, 같은 세션의 섹션별 호출이 공급자의 프롬프트 접두사 캐시를 공유하도록 함
+
+
+def _build_draft_prompt(section_name: str, resume: Dict, job_info: Dict) -> str:
+    """섹션별 초안 작성 프롬프트 (정의되지 않은 섹션은 '지원 동기' 요구사항 사용)"""
+    guidelines = SECTION_GUIDELINES.get(section_name, SECTION_GUIDELINES["지원 동기"])
+    section_requirements = "\n".join(f"- {line}" for line in guidelines)
+    return f"""{format_prompt_context(resume, job_info)}
+
+위 이력서와 채용공고 정보를 바탕으로 아래에 지정한 섹션의 자기소개서를 한 단락으로 작성해주세요.
+
+공통 요구사항:
+- 한 단락으로 작성 (단락 구분 없이 연속된 텍스트)
+- 1000자 이내로 작성 (반드시 준수)
+- 자기소개서 본문만 출력 (제목이나 설명 없이)
 
+【작성할 섹션】{section_name}
+섹션 요구사항:
+{section_requirements}
+"""
 
-def generate_draft_with_gemini(
+
+async def generate_draft_with_gemini(
     section_name: str,
     resume: Dict,
     job_info: Dict
 ) -> str:
-    """Gemini 2.5-flash로 초안 작성 (1000자 이내, 한 단락)"""
+    """Gemini 2.5-flash로 초안 작성 (1000자 이내, 한 단락, Gemini 장애 시 GPT-4o-mini로 대체)"""
 
-    initialize_gemini_client()
-    
-    if not USE_GEMINI or not GEMINI_CLIENT:
+    if not is_gemini_available() and not USE_OPENAI:
         return f"[{section_name} 섹션] Gemini API가 필요합니다."
     
-    # 이력서 정보 요약
-    resume_summary = f"""
-이름: {resume.get('name', 'N/A')}
-학력: {resume.get('education', [])}
-경력: {resume.get('experience', [])}
-기술 스택: {', '.join(resume.get('skills', []))}
-"""
-    
-    # 채용공고 정보
-    job_summary = f"""
-채용 제목: {job_info.get('title', 'N/A')}
-회사명: {job_info.get('company', 'N/A')}
-주요 업무: {job_info.get('work', 'N/A')}
-자격 요건: {job_info.get('requirements', 'N/A')}
-"""
-    
-    # 섹션별 초안 작성 프롬프트
-    draft_prompts = {
-        "지원 동기": f"""
-다음 이력서와 채용공고 정보를 바탕으로 '지원 동기' 자기소개서를 한 단락으로 작성해주세요.
-
-이력서 정보:
-{resume_summary}
-
-채용공고 정보:
-{job_summary}
-
-요구사항:
-- 회사와 직무에 대한 관심과 지원 동기를 구체적으로 작성
-- 한 단락으로 작성 (단락 구분 없이 연속된 텍스트)
-- 1000자 이내로 작성 (반드시 준수)
-- 진솔하고 구체적인 내용으로 작성
-- 구체적인 사례나 경험을 포함하여 설득력 있게 작성
-""",
-        "직무 관련 역량": f"""
-다음 이력서와 채용공고 정보를 바탕으로 '직무 관련 역량' 자기소개서를 한 단락으로 작성해주세요.
-
-이력서 정보:
-{resume_summary}
-
-채용공고 정보:
-{job_summary}
-
-요구사항:
-- 직무 수행에 필요한 핵심 역량과 기술을 구체적으로 제시
-- 한 단락으로 작성 (단락 구분 없이 연속된 텍스트)
-- 1000자 이내로 작성 (반드시 준수)
-- 실제 경험과 사례를 중심으로 작성
-- 구체적인 성과나 결과를 포함하여 작성
-""",
-        "협업 관련 경험": f"""
-다음 이력서와 채용공고 정보를 바탕으로 '협업 관련 경험' 자기소개서를 한 단락으로 작성해주세요.
-
-이력서 정보:
-{resume_summary}
-
-채용공고 정보:
-{job_summary}
-
-요구사항:
-- 팀 프로젝트나 협업 경험을 구체적으로 서술
-- 한 단락으로 작성 (단락 구분 없이 연속된 텍스트)
-- 1000자 이내로 작성 (반드시 준수)
-- 구체적인 상황, 역할, 기여, 배운 점을 포함
-- 협업 과정에서의 결과나 성과를 명시
-""",
-        "입사 후 포부": f"""
-다음 이력서와 채용공고 정보를 바탕으로 '입사 후 포부' 자기소개서를 한 단락으로 작성해주세요.
-
-이력서 정보:
-{resume_summary}
-
-채용공고 정보:
-{job_summary}
-
-요구사항:
-- 입사 후 단기 목표와 장기 비전을 구체적으로 작성
-- 한 단락으로 작성 (단락 구분 없이 연속된 텍스트)
-- 1000자 이내로 작성 (반드시 준수)
-- 회사와 직무에 기여할 수 있는 방안을 포함
-- 현실적이고 구체적인 계획을 제시
-"""
-    }
-    
-    prompt = draft_prompts.get(section_name, draft_prompts["지원 동기"])
+    prompt = _build_draft_prompt(section_name, resume, job_info)
     
     try:
-        response = GEMINI_CLIENT.generate_content(prompt)
-        draft_text = response.text.strip()
+        draft_text = await generate_text_with_fallback(
+            prompt,
+            priority=PRIORITY_BATCH,
+            call_site="cover_letter.draft",
+            hedge=False,  # 긴 생성은 중복 요청 비용이 커서 hedging 제외
+            temperature=0.7
+        )
         
         # 1000자 초과 시 자르기
         if len(draft_text) > 1000:
@@ -118,32 +97,13 @@ def generate_draft_with_gemini(
         return f"[오류] 초안 생성 중 문제가 발생했습니다: {str(e)}"
 
 
-def refine_with_gpt4o(
+def _build_refine_messages(
     draft_text: str,
     section_name: str,
     resume: Dict,
     job_info: Dict
-) -> str:
-    """GPT-4o로 초안을 첨삭하여 완성도 높임 (1000자 이내, 한 단락)"""
-    if not USE_OPENAI:
-        return draft_text
-    
-    # 이력서 정보 요약
-    resume_summary = f"""
-이름: {resume.get('name', 'N/A')}
-학력: {resume.get('education', [])}
-경력: {resume.get('experience', [])}
-기술 스택: {', '.join(resume.get('skills', []))}
-"""
-    
-    # 채용공고 정보
-    job_summary = f"""
-채용 제목: {job_info.get('title', 'N/A')}
-회사명: {job_info.get('company', 'N/A')}
-주요 업무: {job_info.get('work', 'N/A')}
-자격 요건: {job_info.get('requirements', 'N/A')}
-"""
-    
+) -> List[Dict]:
+    """초안 첨삭 요청 메시지 구성 (refine_with_gpt4o / refine_with_gpt4o_stream 공용)"""
     system_message = """당신은 15년 이상의 경력을 가진 자기소개서 첨삭 전문가입니다. 초안을 검토하고 완성도를 높여 최종 버전을 작성합니다.
 
 당신의 역할:
@@ -153,16 +113,9 @@ def refine_with_gpt4o(
 4. 1000자 이내 한 단락 형식을 유지합니다
 5. 채용 담당자가 인상깊게 읽을 수 있도록 다듬습니다"""
     
-    user_prompt = f"""다음은 '{section_name}' 섹션의 자기소개서 초안입니다. 이를 첨삭하여 완성도를 높인 최종 버전을 작성해주세요.
-
-【채용공고 정보】
-{job_summary}
+    user_prompt = f"""{format_prompt_context(resume, job_info)}
 
-【이력서 정보】
-{resume_summary}
-
-【초안】
-{draft_text}
+맨 아래의 자기소개서 초안을 첨삭하여 완성도를 높인 최종 버전을 작성해주세요.
 
 요구사항:
 - 초안의 핵심 내용과 의도는 유지합니다
@@ -172,40 +125,105 @@ def refine_with_gpt4o(
 - 반드시 1000자 이내로 작성합니다
 - 초안의 모든 중요한 내용을 포함합니다
 - 개선된 최종 버전만 출력하세요 (설명이나 메타데이터 없이 자기소개서 본문만)
+
+【섹션명】{section_name}
+
+【초안】
+{draft_text}
 """
     
+    return [
+        {"role": "system", "content": system_message},
+        {"role": "user", "content": user_prompt}
+    ]
+
+
+async def refine_with_gpt4o(
+    draft_text: str,
+    section_name: str,
+    resume: Dict,
+    job_info: Dict
+) -> str:
+    """GPT-4o로 초안을 첨삭하여 완성도 높임 (1000자 이내, 한 단락)"""
+    if not USE_OPENAI:
+        return draft_text
+    
     try:
-        response = OPENAI_CLIENT.chat.completions.create(
+        refined_text = await openai_chat(
+            _build_refine_messages(draft_text, section_name, resume, job_info),
             model="gpt-4o",
-            messages=[
-                {"role": "system", "content": system_message},
-                {"role": "user", "content": user_prompt}
-            ],
+            priority=PRIORITY_BATCH,
+            call_site="cover_letter.refine",
+            hedge=False,  # 긴 생성은 중복 요청 비용이 커서 hedging 제외
             temperature=0.3,
             max_tokens=1200  # 1000자 + 여유
         )
         
-        refined_text = response.choices[0].message.content.strip()
-        
-        # 마크다운 코드 블록이나 불필요한 텍스트 제거
-        if "```" in refined_text:
-            parts = refined_text.split("```")
-            if len(parts) > 1:
-                refined_text = parts[1].strip()
-                if refined_text.startswith("markdown") or refined_text.startswith("text"):
-                    refined_text = "\n".join(refined_text.split("\n")[1:]).strip()
-        
-        # 1000자 초과 시 자르기
-        if len(refined_text) > 1000:
-            refined_text = refined_text[:1000]
-        
-        return refined_text
+        return _clean_refined_text(refined_text)
     except Exception as e:
         print(f"❌ GPT-4o 첨삭 중 오류: {e}")
         return draft_text  # 오류 시 초안 반환
 
 
-def generate_cover_letter_section(
+async def refine_with_gpt4o_stream(
+    draft_text: str,
+    section_name: str,
+    resume: Dict,
+    job_info: Dict
+) -> AsyncIterator[str]:
+    """refine_with_gpt4o의 스트리밍 버전 - 첨삭 결과를 토큰이 도착하는 대로 전달 (1000자에서 중단)
+
+    스트리밍 중에는 코드 블록 제거 같은 후처리를 할 수 없으므로,
+    최종 텍스트는 전달한 조각을 이어 붙인 뒤 _clean_refined_text()로 정리하세요.
+    """
+    if not USE_OPENAI:
+        yield draft_text
+        return
+    
+    emitted = 0
+    try:
+        async for delta in openai_chat_stream(
+            _build_refine_messages(draft_text, section_name, resume, job_info),
+            model="gpt-4o",
+            priority=PRIORITY_BATCH,
+            call_site="cover_letter.refine",
+            temperature=0.3,
+            max_tokens=1200  # 1000자 + 여유
+        ):
+            if emitted == 0:
+                delta = delta.lstrip()
+            piece = delta[:1000 - emitted]
+            if piece:
+                emitted += len(piece)
+                yield piece
+            if emitted >= 1000:
+                break
+    except Exception as e:
+        print(f"❌ GPT-4o 첨삭 스트리밍 중 오류: {e}")
+        if emitted == 0:
+            yield draft_text  # 아직 전달한 내용이 없으면 초안 반환
+        else:
+            raise
+
+
+def _clean_refined_text(refined_text: str) -> str:
+    """첨삭 결과에서 마크다운 코드 블록 등 불필요한 텍스트 제거 후 1000자로 제한"""
+    refined_text = refined_text.strip()
+    if "```" in refined_text:
+        parts = refined_text.split("```")
+        if len(parts) > 1:
+            refined_text = parts[1].strip()
+            if refined_text.startswith("markdown") or refined_text.startswith("text"):
+                refined_text = "\n".join(refined_text.split("\n")[1:]).strip()
+    
+    # 1000자 초과 시 자르기
+    if len(refined_text) > 1000:
+        refined_text = refined_text[:1000]
+    
+    return refined_text
+
+
+async def generate_cover_letter_section(
     section_name: str,
     resume: Dict,
     job_info: Dict,
@@ -217,87 +235,349 @@ def generate_cover_letter_section(
         str: 최종 자기소개서 텍스트 (한 단락, 1000자 이내)
     """
     # Step 1: Gemini 2.5-flash로 초안 작성
-    draft = generate_draft_with_gemini(section_name, resume, job_info)
+    draft = await generate_draft_with_gemini(section_name, resume, job_info)
     
     # Step 2: GPT-4o로 첨삭하여 완성도 높임
-    final_text = refine_with_gpt4o(draft, section_name, resume, job_info)
+    final_text = await refine_with_gpt4o(draft, section_name, resume, job_info)
     
     return final_text
 
 
-def generate_cover_letter(
+def _section_limits(sections: List[str], max_chars: Optional[Dict[str, int]]) -> Dict[str, int]:
+    """섹션별 최대 글자 수 (지정하지 않은 섹션은 SECTION_MAX_CHARS)"""
+    max_chars = max_chars or {}
+    return {section: int(max_chars.get(section, SECTION_MAX_CHARS)) for section in sections}
+
+
+def _section_spec_lines(limits: Dict[str, int]) -> str:
+    """일괄 프롬프트용 섹션 목록 (섹션별 요구사항과 글자 수 제한)"""
+    lines = []
+    for section, limit in limits.items():
+        guidelines = SECTION_GUIDELINES.get(section, SECTION_GUIDELINES["지원 동기"])
+        lines.append(f"■ {section} ({limit}자 이내, 한 단락)")
+        lines.extend(f"  - {line}" for line in guidelines)
+    return "\n".join(lines)
+
+
+def _build_batch_draft_prompt(resume: Dict, job_info: Dict, limits: Dict[str, int]) -> str:
+    """모든 섹션의 초안을 한 번에 요청하는 프롬프트 (이력서/채용공고 정보는 한 번만 포함)"""
+    example = json.dumps({section: "..." for section in limits}, ensure_ascii=False)
+    return f"""{format_prompt_context(resume, job_info)}
+
+위 이력서와 채용공고 정보를 바탕으로 아래에 지정한 섹션들의 자기소개서를 각각 한 단락으로 작성해주세요.
+
+공통 요구사항:
+- 각 섹션은 한 단락으로 작성 (단락 구분 없이 연속된 텍스트)
+- 섹션별 글자 수 제한을 반드시 준수
+- 섹션끼리 같은 사례나 문장을 반복하지 않기
+- 섹션명을 키로, 본문을 값으로 하는 JSON 객체로만 응답 (설명이나 코드 블록 없이)
+
+【작성할 섹션】
+{_section_spec_lines(limits)}
+
+응답 형식:
+{example}
+"""
+
+
+def _build_batch_refine_messages(
+    drafts: Dict[str, str],
+    resume: Dict,
+    job_info: Dict,
+    limits: Dict[str, int]
+) -> List[Dict]:
+    """모든 섹션 초안을 한 번에 첨삭하는 요청 메시지 구성"""
+    system_message = """당신은 15년 이상의 경력을 가진 자기소개서 첨삭 전문가입니다. 초안을 검토하고 완성도를 높여 최종 버전을 작성합니다.
+
+당신의 역할:
+1. 초안의 핵심 내용과 의도를 유지합니다
+2. 표현을 더 명확하고 설득력 있게 개선합니다
+3. 구체성과 진정성을 높입니다
+4. 섹션별 글자 수 제한과 한 단락 형식을 유지합니다
+5. 채용 담당자가 인상깊게 읽을 수 있도록 다듬습니다"""
+    
+    draft_blocks = "\n\n".join(
+        f"【{section} 초안】 ({limits[section]}자 이내)\n{text}" for section, text in drafts.items()
+    )
+    user_prompt = f"""{format_prompt_context(resume, job_info)}
+
+아래의 자기소개서 섹션별 초안을 각각 첨삭하여 완성도를 높인 최종 버전을 작성해주세요.
+
+요구사항:
+- 초안의 핵심 내용과 의도는 유지합니다
+- 표현을 더 명확하고 설득력 있게 개선합니다
+- 각 섹션은 한 단락으로 작성합니다 (단락 구분 없이)
+- 섹션별 글자 수 제한을 반드시 준수합니다
+- 초안의 모든 중요한 내용을 포함합니다
+- 섹션명을 키로, 개선된 본문을 값으로 하는 JSON 객체로만 응답하세요
+
+{draft_blocks}
+"""
+    
+    return [
+        {"role": "system", "content": system_message},
+        {"role": "user", "content": user_prompt}
+    ]
+
+
+def _parse_sections_json(text: str, sections: List[str]) -> Dict[str, str]:
+    """일괄 응답 JSON에서 요청한 섹션의 본문만 추출 (형식이 잘못되었으면 빈 dict)"""
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.strip("`")
+        if text.startswith("json"):
+            text = text[4:]
+    try:
+        data = json.loads(text)
+    except (json.JSONDecodeError, TypeError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    
+    parsed = {}
+    for section in sections:
+        value = data.get(section)
+        if isinstance(value, str) and value.strip():
+            parsed[section] = " ".join(value.split())  # 한 단락으로 정리
+    return parsed
+
+
+def _enforce_length(text: str, limit: int) -> str:
+    """글자 수 제한 적용 - 가능하면 제한 안의 마지막 문장 끝에서 자름"""
+    if len(text) <= limit:
+        return text
+    cut = text[:limit]
+    sentence_end = max(cut.rfind(mark) for mark in (".", "!", "?"))
+    if sentence_end >= limit * 0.6:
+        return cut[:sentence_end + 1]
+    return cut
+
+
+async def _draft_all_sections(resume: Dict, job_info: Dict, limits: Dict[str, int]) -> Dict[str, str]:
+    """모든 섹션 초안을 한 번의 호출로 작성 (Gemini, 없거나 장애 시 GPT-4o-mini)"""
+    prompt = _build_batch_draft_prompt(resume, job_info, limits)
+    try:
+        text = await generate_text_with_fallback(
+            prompt,
+            priority=PRIORITY_BATCH,
+            call_site="cover_letter.batch_draft",
+            hedge=False,  # 긴 생성은 중복 요청 비용이 커서 hedging 제외
+            temperature=0.7,
+            response_format={"type": "json_object"}
+        )
+    except Exception as e:
+        print(f"❌ 자기소개서 일괄 초안 생성 중 오류: {e}")
+        return {}
+    return _parse_sections_json(text, list(limits))
+
+
+async def _refine_all_sections(
+    drafts: Dict[str, str],
+    resume: Dict,
+    job_info: Dict,
+    limits: Dict[str, int]
+) -> Dict[str, str]:
+    """모든 섹션 초안을 한 번의 GPT-4o 호출로 첨삭 (실패하거나 빠진 섹션은 초안 유지)"""
+    if not USE_OPENAI or not drafts:
+        return drafts
+    
+    try:
+        text = await openai_chat(
+            _build_batch_refine_messages(drafts, resume, job_info, limits),
+            model="gpt-4o",
+            priority=PRIORITY_BATCH,
+            call_site="cover_letter.batch_refine",
+            hedge=False,  # 긴 생성은 중복 요청 비용이 커서 hedging 제외
+            temperature=0.3,
+            max_tokens=1200 * len(drafts),  # 섹션당 1000자 + 여유
+            response_format={"type": "json_object"}
+        )
+    except Exception as e:
+        print(f"❌ GPT-4o 일괄 첨삭 중 오류: {e}")
+        return drafts
+    refined = _parse_sections_json(text, list(drafts))
+    return {section: refined.get(section, draft) for section, draft in drafts.items()}
+
+
+async def generate_cover_letter_batch(
     resume: Dict,
     job_info: Dict,
     sections: Optional[List[str]] = None,
-    chat_history: List = None
+    refine: Optional[bool] = None,
+    max_chars: Optional[Dict[str, int]] = None
 ) -> Dict:
-    """전체 자기소개서 생성
-    
+    """전체 자기소개서를 섹션 묶음으로 생성 (초안 1회 + 첨삭 1회 호출)
+
+    섹션별 방식은 섹션마다 같은 이력서/채용공고 정보를 두 번씩 보내지만,
+    이 방식은 모든 섹션을 하나의 JSON 요청으로 초안 작성하고 한 번에 첨삭합니다.
+    응답에서 빠진 섹션은 섹션별 방식(generate_cover_letter_section)으로 생성합니다.
+
+    Args:
+        resume: 이력서 정보
+        job_info: 채용공고 정보
+        sections: 생성할 섹션 목록 (없으면 DEFAULT_SECTIONS)
+        refine: GPT-4o 첨삭 여부 (없으면 COVER_LETTER_BATCH_REFINE)
+        max_chars: 섹션별 최대 글자 수 (없는 섹션은 SECTION_MAX_CHARS)
+
     Returns:
-        Dict: {섹션명: 자기소개서 텍스트} 형식 (한 단락, 1000자 이내)
+        Dict: {섹션명: 자기소개서 텍스트} 형식 (섹션 순서 유지)
     """
-    # 기본 섹션 목록
     if sections is None or len(sections) == 0:
-        sections = ["지원 동기", "직무 관련 역량", "협업 관련 경험", "입사 후 포부"]
+        sections = DEFAULT_SECTIONS
+    if refine is None:
+        refine = COVER_LETTER_BATCH_REFINE
+    limits = _section_limits(sections, max_chars)
     
-    cover_letter = {}
+    drafts = await _draft_all_sections(resume, job_info, limits)
+    missing = [section for section in sections if section not in drafts]
+    if missing:
+        print(f"⚠️  일괄 초안에서 빠진 섹션을 섹션별로 생성: {missing}")
     
-    for section in sections:
-        # 한 단락으로 생성된 최종 텍스트 반환
-        final_text = generate_cover_letter_section(section, resume, job_info, chat_history)
-        cover_letter[section] = final_text
+    if refine:
+        drafts = await _refine_all_sections(drafts, resume, job_info, limits)
     
-    return cover_letter
+    # 빠진 섹션은 섹션별 방식으로 생성 (초안 + 첨삭 포함, 섹션별 모드와 같은 동시 실행 수 제한)
+    semaphore = asyncio.Semaphore(max(1, COVER_LETTER_CONCURRENCY))
+    
+    async def generate_with_limit(section: str) -> str:
+        async with semaphore:
+            return await generate_cover_letter_section(section, resume, job_info)
+    
+    fallback_results = await asyncio.gather(
+        *[generate_with_limit(section) for section in missing],
+        return_exceptions=True
+    )
+    for section, result in zip(missing, fallback_results):
+        if isinstance(result, Exception):
+            print(f"❌ '{section}' 섹션 생성 중 오류: {result}")
+            drafts[section] = f"[오류] '{section}' 섹션 생성 중 문제가 발생했습니다: {str(result)}"
+        else:
+            drafts[section] = result
+    
+    return {section: _enforce_length(drafts[section], limits[section]) for section in sections}
 
 
-def review_and_improve_cover_letter(
-    cover_letter_text: str,
-    section_name: str,
+async def generate_cover_letter(
     resume: Dict,
-    job_info: Dict
+    job_info: Dict,
+    sections: Optional[List[str]] = None,
+    chat_history: List = None,
+    mode: Optional[str] = None
 ) -> Dict:
-    """자기소개서 첨삭 및 개선 (GPT-4o 사용)
+    """전체 자기소개서 생성 (섹션별 동시 생성, 최대 COVER_LETTER_CONCURRENCY개)
     
     Args:
-        cover_letter_text: 첨삭할 자기소개서 텍스트
-        section_name: 섹션 이름 (예: "지원 동기")
-        resume: 이력서 정보
-        job_info: 채용공고 정보
+        mode: section(섹션별 생성) 또는 batch(generate_cover_letter_batch), 없으면 COVER_LETTER_MODE
     
     Returns:
-        Dict: {
-            "original": 원본 텍스트,
-            "improved": 개선된 텍스트,
-            "review": 첨삭 의견,
-            "strengths": 강점 목록,
-            "improvements": 개선점 목록
-        }
+        Dict: {섹션명: 자기소개서 텍스트} 형식 (한 단락, 1000자 이내)
     """
-    if not USE_OPENAI:
-        return {
-            "original": cover_letter_text,
-            "improved": cover_letter_text,
-            "review": "OpenAI API가 필요합니다.",
-            "strengths": [],
-            "improvements": []
-        }
+    # 기본 섹션 목록
+    if sections is None or len(sections) == 0:
+        sections = DEFAULT_SECTIONS
     
-    # 이력서 정보 요약
-    resume_summary = f"""
-이름: {resume.get('name', 'N/A')}
-학력: {resume.get('education', [])}
-경력: {resume.get('experience', [])}
-기술 스택: {', '.join(resume.get('skills', []))}
-"""
+    if (mode or COVER_LETTER_MODE) == "batch":
+        return await generate_cover_letter_batch(resume, job_info, sections)
     
-    # 채용공고 정보
-    job_summary = f"""
-채용 제목: {job_info.get('title', 'N/A')}
-회사명: {job_info.get('company', 'N/A')}
-주요 업무: {job_info.get('work', 'N/A')}
-자격 요건: {job_info.get('requirements', 'N/A')}
-"""
+    # 섹션은 서로 독립적이므로 동시에 생성 (동시 실행 수 제한)
+    semaphore = asyncio.Semaphore(max(1, COVER_LETTER_CONCURRENCY))
+    
+    async def generate_with_limit(section: str) -> str:
+        async with semaphore:
+            return await generate_cover_letter_section(section, resume, job_info, chat_history)
+    
+    results = await asyncio.gather(
+        *[generate_with_limit(section) for section in sections],
+        return_exceptions=True
+    )
+    
+    # 일부 섹션이 실패해도 나머지 섹션은 반환 (섹션 순서 유지)
+    cover_letter = {}
+    for section, result in zip(sections, results):
+        if isinstance(result, Exception):
+            print(f"❌ '{section}' 섹션 생성 중 오류: {result}")
+            cover_letter[section] = f"[오류] '{section}' 섹션 생성 중 문제가 발생했습니다: {str(result)}"
+        else:
+            cover_letter[section] = result
+    
+    return cover_letter
+
+
+async def generate_cover_letter_stream(
+    resume: Dict,
+    job_info: Dict,
+    sections: Optional[List[str]] = None,
+    chat_history: List = None,
+    mode: Optional[str] = None
+) -> AsyncIterator[Tuple[str, Dict]]:
+    """generate_cover_letter의 스트리밍 버전 - 섹션별 이벤트를 (이벤트, 데이터)로 전달
+
+    섹션은 동시에 생성되므로 서로 다른 섹션의 이벤트가 섞여서 도착합니다.
+    batch 모드는 JSON 응답을 조각 단위로 나눌 수 없으므로 delta 없이
+    모든 섹션이 완성된 뒤 section_end를 전달합니다.
+
+    이벤트:
+        section_start: {"section"}
+        delta: {"section", "text"} - GPT-4o 첨삭 토큰
+        section_end: {"section", "text"} - 정리된 최종 텍스트
+        error: {"section", "message"} - 해당 섹션 실패 (section_end에는 오류 안내 문구)
+        done: {"cover_letter": {섹션명: 텍스트}}
+    """
+    if sections is None or len(sections) == 0:
+        sections = DEFAULT_SECTIONS
+    
+    if (mode or COVER_LETTER_MODE) == "batch":
+        for section in sections:
+            yield "section_start", {"section": section}
+        cover_letter = await generate_cover_letter_batch(resume, job_info, sections)
+        for section in sections:
+            yield "section_end", {"section": section, "text": cover_letter[section]}
+        yield "done", {"cover_letter": cover_letter}
+        return
+    
+    semaphore = asyncio.Semaphore(max(1, COVER_LETTER_CONCURRENCY))
+    queue: asyncio.Queue = asyncio.Queue()
+    cover_letter = {section: "" for section in sections}
     
+    async def stream_section(section: str):
+        try:
+            async with semaphore:
+                await queue.put(("section_start", {"section": section}))
+                draft = await generate_draft_with_gemini(section, resume, job_info)
+                parts = []
+                async for delta in refine_with_gpt4o_stream(draft, section, resume, job_info):
+                    parts.append(delta)
+                    await queue.put(("delta", {"section": section, "text": delta}))
+                cover_letter[section] = _clean_refined_text("".join(parts))
+        except Exception as e:
+            print(f"❌ '{section}' 섹션 생성 중 오류: {e}")
+            cover_letter[section] = f"[오류] '{section}' 섹션 생성 중 문제가 발생했습니다: {str(e)}"
+            await queue.put(("error", {"section": section, "message": str(e)}))
+        finally:
+            await queue.put(("section_end", {"section": section, "text": cover_letter[section]}))
+    
+    tasks = [asyncio.create_task(stream_section(section)) for section in sections]
+    try:
+        finished = 0
+        while finished < len(tasks):
+            event, data = await queue.get()
+            if event == "section_end":
+                finished += 1
+            yield event, data
+        yield "done", {"cover_letter": cover_letter}
+    finally:
+        # 클라이언트 연결 종료 등으로 중단되면 남은 섹션 생성 취소
+        for task in tasks:
+            task.cancel()
+
+
+def _build_review_messages(
+    cover_letter_text: str,
+    section_name: str,
+    resume: Dict,
+    job_info: Dict
+) -> List[Dict]:
+    """자기소개서 첨삭 요청 메시지 구성 (review_and_improve_cover_letter / 스트리밍 버전 공용)"""
     # 시스템 메시지: 자기소개서 첨삭 전문가 페르소나
     system_message = """당신은 15년 이상의 경력을 가진 자기소개서 첨삭 전문가입니다.
 
@@ -321,18 +601,9 @@ def review_and_improve_cover_letter(
 5. 더 효과적이고 설득력 있는 버전으로 개선합니다"""
     
     # 사용자 프롬프트
-    user_prompt = f"""다음 자기소개서를 첨삭하고 개선해주세요.
-
-【섹션명】{section_name}
+    user_prompt = f"""{format_prompt_context(resume, job_info)}
 
-【채용공고 정보】
-{job_summary}
-
-【이력서 정보】
-{resume_summary}
-
-【첨삭 대상 자기소개서】
-{cover_letter_text}
+맨 아래의 자기소개서를 첨삭하고 개선해주세요.
 
 다음 형식으로 응답해주세요:
 
@@ -350,66 +621,155 @@ def review_and_improve_cover_letter(
 
 4. **개선된 자기소개서** (검수 의견과 개선점을 반영하여 재작성한 버전)
 (원본의 의도와 핵심 내용은 유지하되, 더 효과적으로 표현하고 구체성을 높인 버전)
+
+【섹션명】{section_name}
+
+【첨삭 대상 자기소개서】
+{cover_letter_text}
 """
     
+    return [
+        {"role": "system", "content": system_message},
+        {"role": "user", "content": user_prompt}
+    ]
+
+
+def _parse_review_text(review_text: str, cover_letter_text: str) -> Dict:
+    """첨삭 응답 텍스트에서 개선본, 강점, 개선점 추출"""
+    # 응답 파싱 (간단한 파싱)
+    # 실제로는 더 정교한 파싱이 필요할 수 있음
+    improved_text = cover_letter_text  # 기본값은 원본
+    strengths = []
+    improvements = []
+    review_comment = review_text  # 전체 검수 의견
+    
+    # 개선된 버전 추출 시도
+    if "개선된 자기소개서" in review_text:
+        parts = review_text.split("개선된 자기소개서")
+        if len(parts) > 1:
+            improved_part = parts[1].strip()
+            # 마크다운 코드 블록이나 불필요한 텍스트 제거
+            improved_text = improved_part.split("```")[0].strip()
+            if improved_text.startswith(":"):
+                improved_text = improved_text[1:].strip()
+    
+    # 강점 추출 시도
+    if "강점" in review_text and "-" in review_text:
+        strengths_section = review_text.split("강점")[1].split("개선점")[0] if "개선점" in review_text else review_text.split("강점")[1]
+        for line in strengths_section.split("\n"):
+            if line.strip().startswith("-"):
+                strengths.append(line.strip()[1:].strip())
+    
+    # 개선점 추출 시도
+    if "개선점" in review_text and "-" in review_text:
+        improvements_section = review_text.split("개선점")[1].split("개선된 자기소개서")[0] if "개선된 자기소개서" in review_text else review_text.split("개선점")[1]
+        for line in improvements_section.split("\n"):
+            if line.strip().startswith("-"):
+                improvements.append(line.strip()[1:].strip())
+    
+    return {
+        "original": cover_letter_text,
+        "improved": improved_text if improved_text != cover_letter_text else cover_letter_text,
+        "review": review_comment,
+        "strengths": strengths[:5],  # 최대 5개
+        "improvements": improvements[:5],  # 최대 5개
+        "model": "GPT-4o"
+    }
+
+
+async def review_and_improve_cover_letter(
+    cover_letter_text: str,
+    section_name: str,
+    resume: Dict,
+    job_info: Dict
+) -> Dict:
+    """자기소개서 첨삭 및 개선 (GPT-4o 사용)
+    
+    Args:
+        cover_letter_text: 첨삭할 자기소개서 텍스트
+        section_name: 섹션 이름 (예: "지원 동기")
+        resume: 이력서 정보
+        job_info: 채용공고 정보
+    
+    Returns:
+        Dict: {
+            "original": 원본 텍스트,
+            "improved": 개선된 텍스트,
+            "review": 첨삭 의견,
+            "strengths": 강점 목록,
+            "improvements": 개선점 목록
+        }
+    """
+    if not USE_OPENAI:
+        return {
+            "original": cover_letter_text,
+            "improved": cover_letter_text,
+            "review": "OpenAI API가 필요합니다.",
+            "strengths": [],
+            "improvements": []
+        }
+    
     try:
-        response = OPENAI_CLIENT.chat.completions.create(
+        review_text = await openai_chat(
+            _build_review_messages(cover_letter_text, section_name, resume, job_info),
             model="gpt-4o",  # GPT-4o 모델 사용
-            messages=[
-                {"role": "system", "content": system_message},
-                {"role": "user", "content": user_prompt}
-            ],
+            call_site="cover_letter.review",
+            hedge=False,  # 긴 생성은 중복 요청 비용이 커서 hedging 제외
             temperature=0.3,  # 첨삭은 일관성 있게
-            max_tokens=2000
+            max_tokens=2000,
+            seed=LLM_SEED,
+            cache=True  # 같은 텍스트를 다시 첨삭하면 캐시된 결과 사용
         )
         
-        review_text = response.choices[0].message.content.strip()
-        
-        # 응답 파싱 (간단한 파싱)
-        # 실제로는 더 정교한 파싱이 필요할 수 있음
-        improved_text = cover_letter_text  # 기본값은 원본
-        strengths = []
-        improvements = []
-        review_comment = review_text  # 전체 검수 의견
-        
-        # 개선된 버전 추출 시도
-        if "개선된 자기소개서" in review_text:
-            parts = review_text.split("개선된 자기소개서")
-            if len(parts) > 1:
-                improved_part = parts[1].strip()
-                # 마크다운 코드 블록이나 불필요한 텍스트 제거
-                improved_text = improved_part.split("```")[0].strip()
-                if improved_text.startswith(":"):
-                    improved_text = improved_text[1:].strip()
-        
-        # 강점 추출 시도
-        if "강점" in review_text and "-" in review_text:
-            strengths_section = review_text.split("강점")[1].split("개선점")[0] if "개선점" in review_text else review_text.split("강점")[1]
-            for line in strengths_section.split("\n"):
-                if line.strip().startswith("-"):
-                    strengths.append(line.strip()[1:].strip())
-        
-        # 개선점 추출 시도
-        if "개선점" in review_text and "-" in review_text:
-            improvements_section = review_text.split("개선점")[1].split("개선된 자기소개서")[0] if "개선된 자기소개서" in review_text else review_text.split("개선점")[1]
-            for line in improvements_section.split("\n"):
-                if line.strip().startswith("-"):
-                    improvements.append(line.strip()[1:].strip())
-        
+        return _parse_review_text(review_text, cover_letter_text)
+    except Exception as e:
+        print(f"❌ 자기소개서 첨삭 중 오류: {e}")
         return {
             "original": cover_letter_text,
-            "improved": improved_text if improved_text != cover_letter_text else cover_letter_text,
-            "review": review_comment,
-            "strengths": strengths[:5],  # 최대 5개
-            "improvements": improvements[:5],  # 최대 5개
-            "model": "GPT-4o"
+            "improved": cover_letter_text,
+            "review": f"첨삭 중 오류가 발생했습니다: {str(e)}",
+            "strengths": [],
+            "improvements": []
         }
+
+
+async def review_and_improve_cover_letter_stream(
+    cover_letter_text: str,
+    section_name: str,
+    resume: Dict,
+    job_info: Dict
+) -> AsyncIterator[Tuple[str, Dict]]:
+    """review_and_improve_cover_letter의 스트리밍 버전
+
+    이벤트:
+        delta: {"section", "text"} - 첨삭 의견 토큰
+        done: {"review": review_and_improve_cover_letter()와 같은 형식}
+    """
+    if not USE_OPENAI:
+        yield "done", {"review": await review_and_improve_cover_letter(cover_letter_text, section_name, resume, job_info)}
+        return
+    
+    parts = []
+    try:
+        async for delta in openai_chat_stream(
+            _build_review_messages(cover_letter_text, section_name, resume, job_info),
+            model="gpt-4o",
+            call_site="cover_letter.review",
+            temperature=0.3,
+            max_tokens=2000,
+            seed=LLM_SEED,
+            cache=True
+        ):
+            parts.append(delta)
+            yield "delta", {"section": section_name, "text": delta}
+        review = _parse_review_text("".join(parts).strip(), cover_letter_text)
     except Exception as e:
-        print(f"❌ 자기소개서 첨삭 중 오류: {e}")
-        return {
+        print(f"❌ 자기소개서 첨삭 스트리밍 중 오류: {e}")
+        review = {
             "original": cover_letter_text,
             "improved": cover_letter_text,
             "review": f"첨삭 중 오류가 발생했습니다: {str(e)}",
             "strengths": [],
             "improvements": []
         }
+    yield "done", {"review": review}
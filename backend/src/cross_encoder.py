@@ -0,0 +1,136 @@
+"""
+Cross-encoder 재순위화 모듈
+로컬 CPU cross-encoder로 (검색 쿼리, 공고 요약) 쌍의 관련도를 계산하여 상위 후보 재정렬
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Dict
+
+# 다국어(한국어 포함) 소형 cross-encoder
+CROSS_ENCODER_MODEL_NAME = "cross-encoder/mmarco-mMiniLMv2-L12-H384-v1"
+
+# 공고 요약 길이 제한 (cross-encoder 입력 길이와 추론 시간 제한)
+JOB_SUMMARY_MAX_CHARS = 400
+
+# 쌍 점수 캐시 최대 항목 수
+PAIR_SCORE_CACHE_SIZE = 4096
+
+# 지연 로딩을 위해 모듈 레벨에서는 import하지 않음
+CrossEncoder = None
+CROSS_ENCODER_MODEL = None
+_LOAD_FAILED = False  # 로드 실패 시 매 요청마다 재시도하지 않음
+_PAIR_SCORE_CACHE: "OrderedDict[str, float]" = OrderedDict()
+_MODEL_LOCK = threading.Lock()
+
+
+def _load_cross_encoder():
+    """cross-encoder 모델 지연 로딩 (실패 시 None)"""
+    global CrossEncoder, CROSS_ENCODER_MODEL, _LOAD_FAILED
+
+    with _MODEL_LOCK:
+        if CROSS_ENCODER_MODEL is not None or _LOAD_FAILED:
+            return CROSS_ENCODER_MODEL
+
+        try:
+            from sentence_transformers import CrossEncoder
+        except ImportError:
+            print("⚠️  sentence-transformers가 설치되지 않아 cross-encoder를 사용할 수 없습니다.")
+            _LOAD_FAILED = True
+            return None
+
+        try:
+            print(f"📦 cross-encoder 모델 로드 중... ({CROSS_ENCODER_MODEL_NAME})")
+            CROSS_ENCODER_MODEL = CrossEncoder(CROSS_ENCODER_MODEL_NAME, device="cpu")
+            print("✅ cross-encoder 모델 로드 완료")
+        except Exception as e:
+            print(f"❌ cross-encoder 모델 로드 중 오류: {e}")
+            CROSS_ENCODER_MODEL = None
+            _LOAD_FAILED = True
+        return CROSS_ENCODER_MODEL
+
+
+def build_job_summary_text(job: Dict) -> str:
+    """cross-encoder 입력용 공고 요약 (제목, 회사, 주요 업무, 자격 요건)"""
+    full_content = job.get('full_content', {}) or {}
+    parts = [
+        job.get('title', ''),
+        job.get('company', ''),
+        full_content.get('work', '') or job.get('description', ''),
+        full_content.get('requirements', ''),
+        full_content.get('conditions', ''),
+    ]
+    summary = " ".join(" ".join(str(p).split()) for p in parts if p)
+    return summary[:JOB_SUMMARY_MAX_CHARS]
+
+
+def _pair_key(query_text: str, summary: str) -> str:
+    """(쿼리, 공고 요약) 내용 기반 캐시 키"""
+    return hashlib.sha1(f"{query_text}\x00{summary}".encode("utf-8")).hexdigest()
+
+
+def cross_encoder_rerank(
+    query_text: str,
+    ranked_records: List[Dict],
+    all_jobs: List[Dict],
+    top_n: int = 20
+) -> List[Dict]:
+    """상위 top_n개 후보를 cross-encoder 점수로 재정렬 (나머지 순위는 유지)
+
+    캐시에 없는 쌍만 한 번의 배치 추론으로 계산합니다.
+    모델을 사용할 수 없으면 입력 순위를 그대로 반환합니다.
+
+    Args:
+        query_text: 검색 쿼리 텍스트
+        ranked_records: rerank_jobs()가 반환한 순위 레코드
+        all_jobs: 채용공고 카탈로그 (job_id = 인덱스)
+        top_n: cross-encoder로 점수를 계산할 상위 후보 수
+
+    Returns:
+        List[Dict]: 재정렬된 레코드 (점수를 계산한 레코드에는 cross_encoder_score 추가)
+    """
+    if not ranked_records or top_n <= 0 or not query_text:
+        return ranked_records
+
+    model = _load_cross_encoder()
+    if model is None:
+        return ranked_records
+
+    head = ranked_records[:top_n]
+    tail = ranked_records[top_n:]
+
+    keys = []
+    missing_pairs = []
+    missing_keys = []
+    for record in head:
+        summary = build_job_summary_text(all_jobs[record["job_id"]])
+        key = _pair_key(query_text, summary)
+        keys.append(key)
+        if key in _PAIR_SCORE_CACHE:
+            _PAIR_SCORE_CACHE.move_to_end(key)  # 이번 요청에서 사용할 항목은 제거 대상에서 제외
+        elif key not in missing_keys:
+            missing_pairs.append((query_text, summary))
+            missing_keys.append(key)
+
+    start = time.perf_counter()
+    if missing_pairs:
+        try:
+            scores = model.predict(missing_pairs, batch_size=len(missing_pairs), show_progress_bar=False)
+        except Exception as e:
+            print(f"❌ cross-encoder 추론 중 오류 (기존 순위 유지): {e}")
+            return ranked_records
+        for key, score in zip(missing_keys, scores):
+            _PAIR_SCORE_CACHE[key] = float(score)
+        while len(_PAIR_SCORE_CACHE) > PAIR_SCORE_CACHE_SIZE:
+            _PAIR_SCORE_CACHE.popitem(last=False)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"🧮 cross-encoder: {len(head)}개 후보 중 {len(missing_pairs)}개 추론 "
+          f"({len(head) - len(missing_pairs)}개 캐시 적중), {elapsed_ms:.1f}ms")
+
+    for record, key in zip(head, keys):
+        record["cross_encoder_score"] = _PAIR_SCORE_CACHE[key]
+
+    # 점수가 같으면 기존 순위 유지 (안정 정렬)
+    head = sorted(head, key=lambda r: -r["cross_encoder_score"])
+    return head + tail
@@ -0,0 +1,75 @@
+"""
+결과 다양화 모듈
+MMR(Maximal Marginal Relevance)로 같은 회사/같은 템플릿 공고가 상위를 채우지 않도록 재정렬
+"""
+from typing import List, Dict
+
+import numpy as np
+
+from .vector_store import get_chunk_embeddings
+
+
+def mmr_diversify(
+    ranked_records: List[Dict],
+    all_jobs: List[Dict],
+    top_k: int = 20,
+    lambda_mult: float = 0.7,
+    max_per_company: int = 0
+) -> List[Dict]:
+    """순위 레코드의 상위 top_k개를 MMR로 다시 선택 (나머지는 기존 순서로 뒤에 이어 붙임)
+
+    관련도는 입력 순위(1 - 순위/후보 수)를 사용하므로 재순위화/cross-encoder 어느 단계 뒤에도
+    적용할 수 있습니다. 유사도는 벡터 스토어에 저장된 대표 chunk 임베딩의 코사인 유사도이며,
+    선택할 때마다 후보 전체와 한 번씩만 비교하므로 계산량은 후보 수 × top_k에 비례합니다.
+
+    Args:
+        ranked_records: rerank_jobs() 등이 반환한 순위 레코드 (chunk_id 포함)
+        all_jobs: 채용공고 카탈로그 (job_id = 인덱스, 회사명 조회용)
+        top_k: 다양화할 상위 결과 수
+        lambda_mult: 관련도 비중 (1이면 기존 순서, 0에 가까울수록 다양성 우선)
+        max_per_company: 상위 top_k 안에서 회사별 최대 공고 수 (0이면 제한 없음)
+
+    Returns:
+        List[Dict]: 재정렬된 순위 레코드
+    """
+    num_candidates = len(ranked_records)
+    if num_candidates <= 1 or top_k <= 0:
+        return ranked_records
+
+    embeddings = get_chunk_embeddings([r.get("chunk_id") for r in ranked_records])
+    relevance = 1.0 - np.arange(num_candidates, dtype=np.float64) / num_candidates
+
+    # 회사명을 정수 코드로 변환 (회사명이 없으면 공고마다 고유 코드 → 제한 대상 아님)
+    company_codes = np.empty(num_candidates, dtype=np.int64)
+    code_of = {}
+    for i, record in enumerate(ranked_records):
+        company = str(all_jobs[record["job_id"]].get("company", "") or "").strip()
+        key = company if company else f"\x00{i}"
+        company_codes[i] = code_of.setdefault(key, len(code_of))
+    company_counts = np.zeros(len(code_of), dtype=np.int64)
+
+    max_similarity = np.zeros(num_candidates, dtype=np.float64)
+    available = np.ones(num_candidates, dtype=bool)
+    selected = []
+
+    for _ in range(min(top_k, num_candidates)):
+        mmr_scores = lambda_mult * relevance - (1.0 - lambda_mult) * max_similarity
+        mmr_scores[~available] = -np.inf
+        best = int(np.argmax(mmr_scores))
+        if not np.isfinite(mmr_scores[best]):
+            break
+
+        selected.append(best)
+        available[best] = False
+
+        code = company_codes[best]
+        company_counts[code] += 1
+        if max_per_company > 0 and company_counts[code] >= max_per_company:
+            available[company_codes == code] = False
+
+        if embeddings.shape[1]:
+            np.maximum(max_similarity, embeddings @ embeddings[best], out=max_similarity)
+
+    selected_set = set(selected)
+    remaining = [i for i in range(num_candidates) if i not in selected_set]
+    return [ranked_records[i] for i in selected + remaining]
@@ -0,0 +1,198 @@
+"""
+전문 검색(Full-text) 모듈
+SQLite FTS5(trigram) 인덱스로 채용공고 키워드 검색
+"""
+import sqlite3
+import threading
+from pathlib import Path
+from typing import List, Dict, Optional
+
+from .job_parser import load_job_catalog, get_jobs_file_fingerprint
+
+# 인덱스 파일 경로 (프로젝트 루트 기준, chroma_db와 같은 위치)
+FTS_DB_PATH = Path(__file__).parent.parent / "job_fts.sqlite3"
+
+# trigram 토크나이저는 3글자 미만 검색어를 MATCH로 찾을 수 없음 (LIKE로 대체)
+TRIGRAM_MIN_LENGTH = 3
+
+_FTS_CONN = None
+_FTS_LOCK = threading.Lock()
+
+
+def _get_connection() -> sqlite3.Connection:
+    """FTS 인덱스 DB 연결 반환 (최초 호출 시 생성)"""
+    global _FTS_CONN
+
+    if _FTS_CONN is None:
+        _FTS_CONN = sqlite3.connect(str(FTS_DB_PATH), check_same_thread=False)
+        _FTS_CONN.execute(
+            "CREATE TABLE IF NOT EXISTS fts_meta (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        _FTS_CONN.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS job_fts USING fts5("
+            "title, company, body, url UNINDEXED, tokenize='trigram')"
+        )
+        _FTS_CONN.commit()
+    return _FTS_CONN
+
+
+def _job_body(job: Dict) -> str:
+    """공고의 섹션 내용을 하나의 검색 대상 텍스트로 결합"""
+    full_content = job.get('full_content', {}) or {}
+    parts = [str(v) for v in full_content.values() if v]
+    if not parts:
+        parts = [str(job.get('description', ''))]
+    return "\n".join(parts)
+
+
+def build_fulltext_index(jobs: List[Dict], source_fingerprint: Optional[str] = None) -> bool:
+    """채용공고 리스트로 FTS5 인덱스를 (재)구성
+
+    Args:
+        jobs: load_jobs_from_txt() / load_job_catalog()가 반환한 채용공고 리스트
+        source_fingerprint: 원본 파일 지문 (변경 감지용, 없으면 저장하지 않음)
+
+    Note:
+        rowid는 리스트 인덱스(0부터)와 동일하게 저장하여
+        벡터 스토어의 job_id와 같은 값을 사용합니다.
+    """
+    if not jobs:
+        print("⚠️  [FTS] 인덱싱할 채용공고가 없습니다.")
+        return False
+
+    try:
+        with _FTS_LOCK:
+            conn = _get_connection()
+            conn.execute("DELETE FROM job_fts")
+            conn.executemany(
+                "INSERT INTO job_fts (rowid, title, company, body, url) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (idx, job.get('title', ''), job.get('company', ''), _job_body(job), job.get('url', ''))
+                    for idx, job in enumerate(jobs)
+                ]
+            )
+            if source_fingerprint:
+                conn.execute(
+                    "INSERT OR REPLACE INTO fts_meta (key, value) VALUES ('source_fingerprint', ?)",
+                    (source_fingerprint,)
+                )
+            conn.commit()
+        print(f"✅ [FTS] 전문 검색 인덱스 구성 완료 ({len(jobs)}개 공고)")
+        return True
+    except sqlite3.Error as e:
+        print(f"❌ [FTS] 인덱스 구성 중 오류: {e}")
+        return False
+
+
+def ensure_fulltext_index(txt_file_path: str = "jobs.txt") -> bool:
+    """인덱스가 없거나 원본 파일이 바뀐 경우에만 인덱스를 재구성"""
+    fingerprint = get_jobs_file_fingerprint(txt_file_path)
+    if fingerprint is None:
+        print(f"⚠️  [FTS] {txt_file_path} 파일을 찾을 수 없습니다.")
+        return False
+
+    try:
+        with _FTS_LOCK:
+            row = _get_connection().execute(
+                "SELECT value FROM fts_meta WHERE key = 'source_fingerprint'"
+            ).fetchone()
+        if row and row[0] == fingerprint:
+            return True
+    except sqlite3.Error as e:
+        print(f"⚠️  [FTS] 인덱스 상태 확인 중 오류 (재구성 진행): {e}")
+
+    jobs = load_job_catalog(txt_file_path)
+    return build_fulltext_index(jobs, source_fingerprint=fingerprint)
+
+
+def _quote_fts_term(term: str) -> str:
+    """FTS5 쿼리 문법 문자를 무력화하도록 검색어를 문자열 리터럴로 감싸기"""
+    return '"' + term.replace('"', '""') + '"'
+
+
+def _escape_like(term: str) -> str:
+    """LIKE 패턴의 와일드카드 문자 이스케이프"""
+    return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def _make_snippet(text: str, terms: List[str], width: int = 60) -> str:
+    """MATCH를 쓰지 않는 짧은 검색어용 스니펫 생성 (FTS5 snippet()과 같은 표기)"""
+    text_lower = text.lower()
+    for term in terms:
+        pos = text_lower.find(term.lower())
+        if pos < 0:
+            continue
+        start = max(0, pos - width // 2)
+        end = min(len(text), pos + len(term) + width // 2)
+        prefix = "…" if start > 0 else ""
+        suffix = "…" if end < len(text) else ""
+        return (
+            prefix + text[start:pos] + "[" + text[pos:pos + len(term)] + "]"
+            + text[pos + len(term):end] + suffix
+        ).replace("\n", " ")
+    return text[:width].replace("\n", " ")
+
+
+def search_jobs_fulltext(query: str, page: int = 1, page_size: int = 10) -> Dict:
+    """키워드로 채용공고 전문 검색 (모든 검색어를 포함하는 공고만 반환)
+
+    Args:
+        query: 공백으로 구분된 검색어 (회사명, 기술명 등)
+        page: 페이지 번호 (1부터)
+        page_size: 페이지당 결과 수
+
+    Returns:
+        Dict: {"query", "page", "page_size", "total", "jobs": [{job_id, title, company, url, snippet}]}
+    """
+    terms = [t for t in query.split() if t]
+    result = {"query": query, "page": page, "page_size": page_size, "total": 0, "jobs": []}
+    if not terms:
+        return result
+
+    # 3글자 이상은 trigram MATCH, 미만은 LIKE 조건으로 처리
+    match_terms = [t for t in terms if len(t) >= TRIGRAM_MIN_LENGTH]
+    like_terms = [t for t in terms if len(t) < TRIGRAM_MIN_LENGTH]
+
+    where_clauses = []
+    params: List = []
+    if match_terms:
+        where_clauses.append("job_fts MATCH ?")
+        params.append(" AND ".join(_quote_fts_term(t) for t in match_terms))
+    for term in like_terms:
+        where_clauses.append(
+            "(title LIKE ? ESCAPE '\\' OR company LIKE ? ESCAPE '\\' OR body LIKE ? ESCAPE '\\')"
+        )
+        pattern = f"%{_escape_like(term)}%"
+        params.extend([pattern, pattern, pattern])
+    where_sql = " AND ".join(where_clauses)
+
+    if match_terms:
+        # 제목/회사명 매칭에 더 높은 가중치 부여 (bm25는 낮을수록 관련도 높음)
+        select_sql = (
+            "SELECT rowid, title, company, url, snippet(job_fts, -1, '[', ']', '…', 16), "
+            "bm25(job_fts, 10.0, 5.0, 1.0) AS rank, body "
+            f"FROM job_fts WHERE {where_sql} ORDER BY rank LIMIT ? OFFSET ?"
+        )
+    else:
+        select_sql = (
+            "SELECT rowid, title, company, url, NULL, 0.0, body "
+            f"FROM job_fts WHERE {where_sql} ORDER BY rowid LIMIT ? OFFSET ?"
+        )
+
+    offset = (page - 1) * page_size
+    with _FTS_LOCK:
+        conn = _get_connection()
+        total = conn.execute(f"SELECT count(*) FROM job_fts WHERE {where_sql}", params).fetchone()[0]
+        rows = conn.execute(select_sql, params + [page_size, offset]).fetchall()
+
+    result["total"] = total
+    for job_id, title, company, url, snippet, rank, body in rows:
+        result["jobs"].append({
+            "job_id": job_id,
+            "title": title,
+            "company": company,
+            "url": url,
+            "snippet": snippet if snippet else _make_snippet(body, terms),
+            "score": round(-rank, 4)
+        })
+    return result
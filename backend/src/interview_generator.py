@@ -2,46 +2,46 @@
 면접 질문 생성 및 평가 모듈
 이력서, 채용공고, 자기소개서를 바탕으로 면접 질문 생성 및 답변 평가
 """
-from typing import Dict, List, Optional
-from .llm_clients import OPENAI_CLIENT, USE_OPENAI, GEMINI_CLIENT, USE_GEMINI
+import json
+import re
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from .config import LLM_SEED
+from .prompt_context import format_prompt_context
+from .llm_clients import USE_OPENAI
+from .llm_gateway import openai_chat, openai_chat_stream
+from .llm_scheduler import PRIORITY_INTERACTIVE
 
+# 스트리밍 중인 JSON에서 완성된 문자열 리터럴 찾기
+_JSON_STRING_PATTERN = re.compile(r'"((?:[^"\\]|\\.)*)"')
 
-def generate_interview_questions(
+# 질문 생성, 답변 평가, 전체 평가가 같은 시스템 메시지와 공통 컨텍스트로 시작하도록 하여
+# 한 세션의 면접 호출이 공급자의 프롬프트 접두사 캐시를 공유하게 함 (질문/답변 등은 프롬프트 끝에 배치)
+INTERVIEWER_SYSTEM_MESSAGE = (
+    "당신은 면접관이자 면접 평가관입니다. 지원자의 이력서, 자기소개서, 채용공고를 바탕으로 "
+    "실질적이고 구체적인 면접 질문을 생성하고, 지원자의 답변과 전체 면접을 객관적이고 건설적으로 평가합니다. "
+    "반드시 JSON 형식으로 응답합니다."
+)
+
+
+def _interview_messages(resume: Dict, job_info: Dict, task_prompt: str) -> List[Dict]:
+    """면접 요청 메시지 구성 (공통 시스템 메시지 + 공통 컨텍스트 + 작업별 지시문)"""
+    return [
+        {"role": "system", "content": INTERVIEWER_SYSTEM_MESSAGE},
+        {"role": "user", "content": f"{format_prompt_context(resume, job_info)}\n\n{task_prompt}"}
+    ]
+
+
+def _build_question_messages(
     resume: Dict,
     job_info: Dict,
-    cover_letter: Optional[Dict] = None,
-    num_questions: int = 5
-) -> List[str]:
-    """면접 질문 생성"""
-    if not USE_OPENAI:
-        return [
-            "자기소개를 해주세요.",
-            "지원 동기를 말씀해주세요.",
-            "직무 관련 경험을 설명해주세요.",
-            "협업 경험에 대해 말씀해주세요.",
-            "입사 후 포부를 말씀해주세요."
-        ]
-    
-    # 이력서 정보 요약
-    resume_summary = f"""
-이름: {resume.get('name', 'N/A')}
-학력: {resume.get('education', [])}
-경력: {resume.get('experience', [])}
-기술 스택: {', '.join(resume.get('skills', []))}
-"""
-    
-    # 채용공고 정보
-    job_summary = f"""
-채용 제목: {job_info.get('title', 'N/A')}
-회사명: {job_info.get('company', 'N/A')}
-주요 업무: {job_info.get('work', 'N/A')}
-자격 요건: {job_info.get('requirements', 'N/A')}
-"""
-    
+    cover_letter: Optional[Dict],
+    num_questions: int
+) -> List[Dict]:
+    """면접 질문 생성 요청 메시지 구성 (generate_interview_questions / 스트리밍 버전 공용)"""
     # 자기소개서 정보 (있는 경우)
     cover_letter_summary = ""
     if cover_letter and isinstance(cover_letter, dict):
-        cover_letter_summary = "\n자기소개서 내용:\n"
+        cover_letter_summary = "【자기소개서 내용】\n"
         for section, content in cover_letter.items():
             if isinstance(content, dict):
                 p1 = content.get('paragraph1', '')
@@ -51,15 +51,8 @@ def generate_interview_questions(
                 # content가 문자열인 경우
                 cover_letter_summary += f"- {section}: {content}\n"
     
-    prompt = f"""
-다음 이력서와 채용공고 정보를 바탕으로 면접 질문 {num_questions}개를 생성해주세요.
-
-이력서 정보:
-{resume_summary}
-{cover_letter_summary}
-
-채용공고 정보:
-{job_summary}
+    prompt = f"""【작업】면접 질문 생성
+위 이력서와 채용공고 정보(아래에 자기소개서가 있으면 함께)를 바탕으로 면접 질문을 생성해주세요.
 
 요구사항:
 - 지원자의 이력서와 자기소개서를 바탕으로 구체적이고 실질적인 질문 생성
@@ -68,48 +61,79 @@ def generate_interview_questions(
 
 반드시 다음 JSON 형식으로 반환해주세요:
 {{"questions": ["질문1", "질문2", "질문3", "질문4", "질문5"]}}
+
+{cover_letter_summary}
+생성할 질문 수: {num_questions}개
 """
     
+    return _interview_messages(resume, job_info, prompt)
+
+
+def _has_questions(content: str) -> bool:
+    """질문 생성 응답이 "questions" 목록을 가진 JSON인지 확인 (캐시 저장 조건)"""
+    result = json.loads(content)
+    return isinstance(result, dict) and isinstance(result.get("questions"), list)
+
+
+def _parse_questions(content: str, num_questions: int) -> List[str]:
+    """질문 생성 응답(JSON)에서 질문 목록 추출 (부족하면 기본 질문으로 채움)"""
+    # JSON 파싱
+    default_questions = [
+        "자기소개를 해주세요.",
+        "지원 동기를 말씀해주세요.",
+        "직무 관련 경험을 설명해주세요.",
+        "협업 경험에 대해 말씀해주세요.",
+        "입사 후 포부를 말씀해주세요."
+    ]
+    
     try:
-        response = OPENAI_CLIENT.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "당신은 면접관입니다. 지원자의 이력서와 자기소개서를 바탕으로 실질적이고 구체적인 면접 질문을 생성합니다. 반드시 JSON 형식으로 응답합니다."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7,
-            response_format={"type": "json_object"}
-        )
-        
-        content = response.choices[0].message.content.strip()
-        
-        # JSON 파싱
-        import json
-        default_questions = [
+        result = json.loads(content)
+        # "questions" 키에서 질문 리스트 가져오기
+        if "questions" in result and isinstance(result["questions"], list):
+            questions = result["questions"]
+        else:
+            questions = default_questions[:num_questions]
+    except json.JSONDecodeError:
+        # JSON 파싱 실패 시 기본 질문 사용
+        print(f"⚠️  JSON 파싱 실패, 기본 질문 사용: {content[:100]}")
+        questions = default_questions[:num_questions]
+    
+    # 질문이 부족하면 기본 질문 추가
+    while len(questions) < num_questions:
+        questions.append(default_questions[len(questions) % len(default_questions)])
+    
+    return questions[:num_questions]
+
+
+async def generate_interview_questions(
+    resume: Dict,
+    job_info: Dict,
+    cover_letter: Optional[Dict] = None,
+    num_questions: int = 5
+) -> List[str]:
+    """면접 질문 생성"""
+    if not USE_OPENAI:
+        return [
             "자기소개를 해주세요.",
             "지원 동기를 말씀해주세요.",
             "직무 관련 경험을 설명해주세요.",
             "협업 경험에 대해 말씀해주세요.",
             "입사 후 포부를 말씀해주세요."
         ]
+    
+    try:
+        content = await openai_chat(
+            _build_question_messages(resume, job_info, cover_letter, num_questions),
+            model="gpt-4o-mini",
+            call_site="interview.questions",
+            temperature=0.7,
+            response_format={"type": "json_object"},
+            seed=LLM_SEED,
+            cache=True,  # 같은 이력서/공고/자기소개서면 캐시된 질문 사용
+            validate=_has_questions
+        )
         
-        try:
-            result = json.loads(content)
-            # "questions" 키에서 질문 리스트 가져오기
-            if "questions" in result and isinstance(result["questions"], list):
-                questions = result["questions"]
-            else:
-                questions = default_questions[:num_questions]
-        except json.JSONDecodeError:
-            # JSON 파싱 실패 시 기본 질문 사용
-            print(f"⚠️  JSON 파싱 실패, 기본 질문 사용: {content[:100]}")
-            questions = default_questions[:num_questions]
-        
-        # 질문이 부족하면 기본 질문 추가
-        while len(questions) < num_questions:
-            questions.append(default_questions[len(questions) % len(default_questions)])
-        
-        return questions[:num_questions]
+        return _parse_questions(content, num_questions)
     except Exception as e:
         print(f"❌ 면접 질문 생성 중 오류: {e}")
         # 기본 질문 반환
@@ -122,7 +146,59 @@ def generate_interview_questions(
         ][:num_questions]
 
 
-def evaluate_answer(
+async def generate_interview_questions_stream(
+    resume: Dict,
+    job_info: Dict,
+    cover_letter: Optional[Dict] = None,
+    num_questions: int = 5
+) -> AsyncIterator[Tuple[str, Dict]]:
+    """generate_interview_questions의 스트리밍 버전
+
+    이벤트:
+        delta: {"section": "questions", "text"} - 모델 출력 토큰 (JSON 원문)
+        question: {"index", "text"} - 완성된 질문 (JSON 배열 항목이 닫히는 즉시)
+        done: {"questions": generate_interview_questions()와 같은 목록}
+    """
+    if not USE_OPENAI:
+        yield "done", {"questions": await generate_interview_questions(resume, job_info, cover_letter, num_questions)}
+        return
+    
+    content = ""
+    emitted = 0
+    try:
+        async for delta in openai_chat_stream(
+            _build_question_messages(resume, job_info, cover_letter, num_questions),
+            model="gpt-4o-mini",
+            call_site="interview.questions",
+            temperature=0.7,
+            response_format={"type": "json_object"},
+            seed=LLM_SEED,
+            cache=True,
+            validate=_has_questions
+        ):
+            content += delta
+            yield "delta", {"section": "questions", "text": delta}
+            
+            # "questions" 배열에서 새로 완성된 항목 전달
+            array_start = content.find("[", content.find('"questions"'))
+            if array_start < 0 or '"questions"' not in content:
+                continue
+            items = _JSON_STRING_PATTERN.findall(content, array_start)
+            for raw in items[emitted:num_questions]:
+                try:
+                    text = json.loads(f'"{raw}"')
+                except json.JSONDecodeError:
+                    text = raw
+                yield "question", {"index": emitted, "text": text}
+                emitted += 1
+        questions = _parse_questions(content.strip(), num_questions)
+    except Exception as e:
+        print(f"❌ 면접 질문 스트리밍 중 오류: {e}")
+        questions = _parse_questions(content.strip(), num_questions)
+    yield "done", {"questions": questions}
+
+
+async def evaluate_answer(
     question: str,
     answer: str,
     resume: Dict,
@@ -142,34 +218,8 @@ def evaluate_answer(
             "improvements": ["더 구체적인 사례 추가"]
         }
     
-    # 이력서 정보 요약
-    resume_summary = f"""
-이름: {resume.get('name', 'N/A')}
-학력: {resume.get('education', [])}
-경력: {resume.get('experience', [])}
-기술 스택: {', '.join(resume.get('skills', []))}
-"""
-    
-    # 채용공고 정보
-    job_summary = f"""
-채용 제목: {job_info.get('title', 'N/A')}
-회사명: {job_info.get('company', 'N/A')}
-주요 업무: {job_info.get('work', 'N/A')}
-자격 요건: {job_info.get('requirements', 'N/A')}
-"""
-    
-    prompt = f"""
-다음 면접 질문과 답변을 평가해주세요.
-
-면접 질문: {question}
-
-지원자 답변: {answer}
-
-이력서 정보:
-{resume_summary}
-
-채용공고 정보:
-{job_summary}
+    prompt = f"""【작업】면접 답변 평가
+맨 아래의 면접 질문과 지원자 답변을 위 이력서와 채용공고 정보를 참고하여 평가해주세요.
 
 평가 기준:
 1. 답변의 구체성과 진정성
@@ -184,21 +234,23 @@ def evaluate_answer(
     "strengths": ["강점1", "강점2"],
     "improvements": ["개선점1", "개선점2"]
 }}
+
+【면접 질문】{question}
+
+【지원자 답변】
+{answer}
 """
     
     try:
-        response = OPENAI_CLIENT.chat.completions.create(
+        content = await openai_chat(
+            _interview_messages(resume, job_info, prompt),
             model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "당신은 면접 평가관입니다. 지원자의 답변을 객관적이고 건설적으로 평가합니다."},
-                {"role": "user", "content": prompt}
-            ],
+            priority=PRIORITY_INTERACTIVE,
+            call_site="interview.evaluate",
             temperature=0.3,
             response_format={"type": "json_object"}
         )
         
-        content = response.choices[0].message.content.strip()
-        
         import json
         try:
             result = json.loads(content)
@@ -238,7 +290,7 @@ def evaluate_answer(
         }
 
 
-def generate_overall_evaluation(
+async def generate_overall_evaluation(
     questions: List[str],
     answers: List[str],
     evaluations: List[Dict],
@@ -272,19 +324,8 @@ def generate_overall_evaluation(
         for i, (q, a, eval) in enumerate(zip(questions, answers, evaluations))
     ])
     
-    prompt = f"""
-다음 면접 질문, 답변, 개별 평가를 바탕으로 전체 면접 평가를 작성해주세요.
-
-면접 질문 및 답변:
-{qa_summary}
-
-이력서 정보:
-이름: {resume.get('name', 'N/A')}
-경력: {resume.get('experience', [])}
-
-채용공고 정보:
-채용 제목: {job_info.get('title', 'N/A')}
-회사명: {job_info.get('company', 'N/A')}
+    prompt = f"""【작업】전체 면접 평가
+맨 아래의 면접 질문, 답변, 개별 평가를 바탕으로 위 이력서와 채용공고 정보를 참고하여 전체 면접 평가를 작성해주세요.
 
 평가 기준:
 1. 전체적인 답변의 질과 일관성
@@ -294,29 +335,29 @@ def generate_overall_evaluation(
 
 다음 JSON 형식으로 전체 평가를 반환해주세요:
 {{
-    "total_score": {total_score:.1f},
+    "total_score": 계산된 평균 점수,
     "summary": "전체 평가 요약 (3-5문장)",
     "recommendations": ["권장사항1", "권장사항2", "권장사항3"],
     "strengths": ["강점1", "강점2"],
     "improvements": ["개선점1", "개선점2"]
 }}
 
-중요: total_score는 반드시 {total_score:.1f} 값을 사용하세요. 계산된 평균 점수를 그대로 사용합니다.
+중요: total_score는 맨 아래의 계산된 평균 점수를 그대로 사용합니다.
+
+【면접 질문 및 답변】
+{qa_summary}
+【계산된 평균 점수】{total_score:.1f}
 """
     
     try:
-        response = OPENAI_CLIENT.chat.completions.create(
+        content = await openai_chat(
+            _interview_messages(resume, job_info, prompt),
             model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "당신은 면접 평가관입니다. 전체 면접을 종합적으로 평가합니다."},
-                {"role": "user", "content": prompt}
-            ],
+            call_site="interview.overall",
             temperature=0.3,
             response_format={"type": "json_object"}
         )
         
-        content = response.choices[0].message.content.strip()
-        
         import json
         try:
             result = json.loads(content)
@@ -0,0 +1,128 @@
+"""
+채용공고 요약(digest) 모듈
+공고 파싱 시 주요 업무/필수 요건/우대 사항/근무 조건을 항목 수와 길이가 제한된 구조로 정리하여
+프롬프트 크기를 공고 원문 길이와 관계없이 일정하게 유지
+"""
+import re
+from typing import Dict, List
+
+# 항목당 최대 글자 수
+JOB_DIGEST_ITEM_CHARS = 80
+# 필드별 (최대 항목 수, 최대 글자 수) - 공고 하나의 요약은 최대 약 600자
+JOB_DIGEST_LIMITS = {
+    "duties": (5, 220),
+    "must_haves": (5, 160),
+    "nice_to_haves": (4, 120),
+    "conditions": (3, 100),
+}
+
+JOB_DIGEST_FIELDS = ["duties", "must_haves", "nice_to_haves", "conditions"]
+JOB_DIGEST_LABELS = {
+    "duties": "주요 업무",
+    "must_haves": "필수 요건",
+    "nice_to_haves": "우대 사항",
+    "conditions": "근무 조건",
+}
+
+_BULLET_PATTERN = re.compile(r'^\s*[-*•·]\s*')
+_MUST_PREFIX_PATTERN = re.compile(r'^(필수|자격\s*요건|지원\s*자격)\s*(사항)?\s*[:：]\s*')
+_NICE_PREFIX_PATTERN = re.compile(r'^우대\s*(사항|요건)?\s*[:：]\s*')
+
+
+def _lines(value) -> List[str]:
+    """섹션 값(여러 줄 문자열 또는 리스트)을 글머리표를 뗀 줄 목록으로 변환"""
+    if isinstance(value, list):
+        raw_lines = [str(v) for v in value]
+    else:
+        raw_lines = str(value or "").split("\n")
+    lines = []
+    for line in raw_lines:
+        line = " ".join(_BULLET_PATTERN.sub("", line).split())
+        if line:
+            lines.append(line)
+    return lines
+
+
+def _split_items(line: str) -> List[str]:
+    """쉼표로 나열된 요건을 항목으로 분리 (괄호 안의 쉼표는 유지)"""
+    items, depth, current = [], 0, []
+    for ch in line:
+        if ch in "([":
+            depth += 1
+        elif ch in ")]":
+            depth = max(0, depth - 1)
+        if ch == "," and depth == 0:
+            items.append("".join(current).strip())
+            current = []
+        else:
+            current.append(ch)
+    items.append("".join(current).strip())
+    return [item for item in items if item]
+
+
+def _bounded(items: List[str], field: str) -> List[str]:
+    """중복 제거 후 필드별 항목 수, 글자 수 제한 (앞쪽 항목 우선)"""
+    max_items, max_chars = JOB_DIGEST_LIMITS[field]
+    result, used = [], 0
+    for item in dict.fromkeys(items):
+        if len(item) > JOB_DIGEST_ITEM_CHARS:
+            item = item[:JOB_DIGEST_ITEM_CHARS - 1] + "…"
+        if result and used + len(item) > max_chars:
+            break
+        result.append(item)
+        used += len(item)
+        if len(result) >= max_items:
+            break
+    return result
+
+
+def build_job_digest(job: Dict) -> Dict[str, List[str]]:
+    """공고 하나의 요약 생성
+
+    load_jobs_from_txt() 형식(full_content 섹션)과 work/requirements 필드를 직접 가진
+    형식(parse_saramin_job_summary(), 기본 공고 정보)을 모두 지원합니다.
+
+    Returns:
+        Dict: {"duties", "must_haves", "nice_to_haves", "conditions"} - 필드별 문자열 목록
+    """
+    full_content = job.get('full_content', {}) or {}
+    work = full_content.get('work') or job.get('work') or job.get('description', '')
+    requirements = full_content.get('requirements') or job.get('requirements', '')
+    conditions = full_content.get('conditions') or job.get('conditions', '')
+
+    must_haves, nice_to_haves = [], list(job.get('preferences', []) or [])
+    for line in _lines(requirements):
+        if _NICE_PREFIX_PATTERN.match(line):
+            nice_to_haves.extend(_split_items(_NICE_PREFIX_PATTERN.sub("", line)))
+        elif "우대" in line:
+            nice_to_haves.append(line)
+        else:
+            must_haves.extend(_split_items(_MUST_PREFIX_PATTERN.sub("", line)))
+
+    return {
+        "duties": _bounded(_lines(work), "duties"),
+        "must_haves": _bounded(must_haves, "must_haves"),
+        "nice_to_haves": _bounded(nice_to_haves, "nice_to_haves"),
+        "conditions": _bounded(_lines(conditions), "conditions"),
+    }
+
+
+def get_job_digest(job: Dict) -> Dict[str, List[str]]:
+    """공고 요약 반환 (카탈로그에서 미리 만든 요약이 있으면 재사용)"""
+    digest = job.get('digest')
+    if isinstance(digest, dict):
+        return digest
+    return build_job_digest(job)
+
+
+def format_job_digest(job: Dict) -> str:
+    """프롬프트용 공고 정보 블록 (제목, 회사명 + 요약 필드, 비어 있는 필드는 생략)"""
+    digest = get_job_digest(job)
+    lines = [
+        f"채용 제목: {job.get('title', 'N/A')}",
+        f"회사명: {job.get('company', 'N/A')}",
+    ]
+    for field in JOB_DIGEST_FIELDS:
+        if digest.get(field):
+            lines.append(f"{JOB_DIGEST_LABELS[field]}: {'; '.join(digest[field])}")
+    return "\n".join(lines)
@@ -4,7 +4,33 @@ TXT 파일에서 채용공고 정보 추출
 """
 import re
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
+
+from .job_digest import build_job_digest
+
+# 공고 메타데이터 필드 → 원문 표기 ("- 형태: 정규직", "* 기업형태: 중견기업" 등, parse_saramin_job_summary()와 같은 라벨)
+_METADATA_PATTERNS = {
+    "location": re.compile(r'^\s*[-*]?\s*지역\s*[:：]\s*(.+)$', re.MULTILINE),
+    "job_type": re.compile(r'^\s*[-*]?\s*형태\s*[:：]\s*(.+)$', re.MULTILINE),
+    "industry": re.compile(r'^\s*[-*]?\s*업종\s*[:：]\s*(.+)$', re.MULTILINE),
+    "company_size": re.compile(r'^\s*[-*]?\s*기업\s*형태\s*[:：]\s*(.+)$', re.MULTILINE),
+}
+_EMPLOYMENT_TYPE_PATTERN = re.compile(r'^\s*[-*]?\s*(.*(?:정규직|계약직|인턴|프리랜서).*)$', re.MULTILINE)
+
+
+def _extract_job_metadata(job: Dict, section: str):
+    """근무 조건/기업 정보에서 지역, 고용 형태, 업종, 기업 형태를 채움 (재순위화 메타데이터 일치 특징에 사용)"""
+    conditions = job["full_content"].get("conditions", "")
+    for field, pattern in _METADATA_PATTERNS.items():
+        # 지역/고용 형태는 근무 조건 섹션에서, 업종/기업 형태는 공고 전체(9. 기업 정보)에서 찾음
+        match = pattern.search(conditions if field in ("location", "job_type") else section)
+        if match and match.group(1).strip() not in ("정보 없음", "없음", "N/A"):
+            job[field] = match.group(1).strip()
+    if not job["job_type"]:
+        # 라벨 없이 "- 정규직"처럼 적힌 근무 조건
+        match = _EMPLOYMENT_TYPE_PATTERN.search(conditions)
+        if match:
+            job["job_type"] = match.group(1).strip()
 
 
 def load_jobs_from_txt(txt_file_path: str = "jobs.txt") -> List[Dict]:
@@ -139,6 +165,9 @@ def load_jobs_from_txt(txt_file_path: str = "jobs.txt") -> List[Dict]:
         job["title"] = job["full_content"].get("title", "").split('\n')[0] if job["full_content"].get("title") else ""
         job["company"] = job["full_content"].get("company", "").split('\n')[0] if job["full_content"].get("company") else ""
         job["description"] = job["full_content"].get("work", "")
+        _extract_job_metadata(job, section)
+        # 프롬프트용 공고 요약 (항목 수/길이 제한)
+        job["digest"] = build_job_digest(job)
         
         jobs.append(job)
     
@@ -146,6 +175,38 @@ def load_jobs_from_txt(txt_file_path: str = "jobs.txt") -> List[Dict]:
     return jobs
 
 
+_JOB_CATALOG = None
+_JOB_CATALOG_FINGERPRINT = None
+
+
+def get_jobs_file_fingerprint(txt_file_path: str = "jobs.txt") -> Optional[str]:
+    """채용공고 TXT 파일의 변경 여부 판단용 지문 (mtime + 크기, 파일이 없으면 None)"""
+    txt_path = Path(__file__).parent.parent / txt_file_path
+    if not txt_path.exists():
+        return None
+    stat = txt_path.stat()
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def load_job_catalog(txt_file_path: str = "jobs.txt") -> List[Dict]:
+    """채용공고 카탈로그 반환 (파일이 바뀌지 않았으면 이전 파싱 결과 재사용)
+    
+    리스트 인덱스가 벡터 스토어의 job_id와 같습니다.
+    반환된 공고 딕셔너리는 공유되므로 수정하지 말고 필요하면 복사해서 사용하세요.
+    """
+    global _JOB_CATALOG, _JOB_CATALOG_FINGERPRINT
+    
+    fingerprint = get_jobs_file_fingerprint(txt_file_path)
+    if _JOB_CATALOG is not None and fingerprint is not None and fingerprint == _JOB_CATALOG_FINGERPRINT:
+        return _JOB_CATALOG
+    
+    jobs = load_jobs_from_txt(txt_file_path)
+    if jobs:
+        _JOB_CATALOG = jobs
+        _JOB_CATALOG_FINGERPRINT = fingerprint
+    return jobs
+
+
 def parse_saramin_job_summary(file_path: str = "saramin_job_summary_20251203.txt") -> List[Dict]:
     """saramin_job_summary 파일을 파싱하여 채용공고 리스트 반환"""
     jobs = []
@@ -295,6 +356,7 @@ def parse_saramin_job_summary(file_path: str = "saramin_job_summary_20251203.txt
         
         # 제목과 회사명이 있는 경우만 추가
         if job["title"] and job["company"]:
+            job["digest"] = build_job_digest(job)
             jobs.append(job)
             print(f"  ✅ 공고 #{section_idx} 파싱 완료: {job['title']} - {job['company']}")
         else:
@@ -0,0 +1,114 @@
+"""
+LLM 응답 캐시 모듈
+모델/파라미터/정규화된 프롬프트 해시를 키로 SQLite에 응답 저장 (TTL, 최대 항목 수 제한)
+결과가 재현 가능한 호출(temperature=0 또는 seed 지정)만 캐시합니다.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .config import LLM_CACHE_ENABLED, LLM_CACHE_TTL_SECONDS, LLM_CACHE_MAX_ENTRIES
+
+# 캐시 파일 경로 (프로젝트 루트 기준, job_fts.sqlite3와 같은 위치)
+LLM_CACHE_DB_PATH = Path(__file__).parent.parent / "llm_cache.sqlite3"
+
+_CACHE_CONN = None
+_CACHE_LOCK = threading.Lock()
+
+
+def _get_connection() -> sqlite3.Connection:
+    """캐시 DB 연결 반환 (최초 호출 시 생성)"""
+    global _CACHE_CONN
+
+    if _CACHE_CONN is None:
+        _CACHE_CONN = sqlite3.connect(str(LLM_CACHE_DB_PATH), check_same_thread=False)
+        _CACHE_CONN.execute("PRAGMA journal_mode=WAL")
+        _CACHE_CONN.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "key TEXT PRIMARY KEY, response TEXT NOT NULL, "
+            "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        _CACHE_CONN.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache (accessed_at)")
+        _CACHE_CONN.commit()
+    return _CACHE_CONN
+
+
+def is_cacheable(params: Dict) -> bool:
+    """같은 요청에 같은 응답을 기대할 수 있는 호출인지 확인 (temperature=0 또는 seed 지정)"""
+    if not LLM_CACHE_ENABLED:
+        return False
+    return params.get("seed") is not None or params.get("temperature") == 0
+
+
+def make_cache_key(provider: str, model: str, messages: List[Dict], params: Dict) -> str:
+    """캐시 키 생성 - 메시지 내용의 앞뒤 공백만 제거 (줄바꿈 등 내부 공백은 응답에 영향을 주므로 유지)"""
+    normalized_messages = [
+        {"role": m.get("role"), "content": str(m.get("content", "")).strip()}
+        for m in messages
+    ]
+    payload = {
+        "provider": provider,
+        "model": model,
+        "params": params,
+        "messages": normalized_messages,
+    }
+    raw = json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def get_cached_response(key: str) -> Optional[str]:
+    """캐시된 응답 반환 (없거나 만료되었으면 None)"""
+    now = time.time()
+    try:
+        with _CACHE_LOCK:
+            conn = _get_connection()
+            row = conn.execute(
+                "SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > LLM_CACHE_TTL_SECONDS:
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                conn.commit()
+                return None
+            conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            conn.commit()
+            return row[0]
+    except sqlite3.Error as e:
+        print(f"⚠️  [LLM 캐시] 조회 중 오류: {e}")
+        return None
+
+
+def store_cached_response(key: str, response: str):
+    """응답 저장 후 만료 항목 삭제, 최대 항목 수를 넘으면 오래 사용되지 않은 항목부터 삭제"""
+    if not response:
+        return
+    now = time.time()
+    try:
+        with _CACHE_LOCK:
+            conn = _get_connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, response, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, response, now, now)
+            )
+            conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - LLM_CACHE_TTL_SECONDS,))
+            conn.execute(
+                "DELETE FROM llm_cache WHERE key IN ("
+                "SELECT key FROM llm_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (LLM_CACHE_MAX_ENTRIES,)
+            )
+            conn.commit()
+    except sqlite3.Error as e:
+        print(f"⚠️  [LLM 캐시] 저장 중 오류: {e}")
+
+
+def clear_llm_cache():
+    """LLM 응답 캐시 전체 삭제"""
+    with _CACHE_LOCK:
+        conn = _get_connection()
+        conn.execute("DELETE FROM llm_cache")
+        conn.commit()
@@ -2,17 +2,23 @@
 LLM 클라이언트 초기화 모듈
 OpenAI, Gemini 클라이언트 관리
 """
-from .config import OPENAI_API_KEY, GEMINI_API_KEY, USE_GEMINI
+from types import SimpleNamespace
+from typing import Dict, Optional
+
+from .config import OPENAI_API_KEY, GEMINI_API_KEY, USE_GEMINI, OPENAI_BASE_URL, GEMINI_BASE_URL
 
 # OpenAI 클라이언트 초기화
+import httpx
 import openai
 
 openai_version = openai.__version__
 print(f"📦 OpenAI 버전: {openai_version}")
 
 if hasattr(openai, 'OpenAI'):
-    OPENAI_CLIENT = openai.OpenAI(api_key=OPENAI_API_KEY)
+    OPENAI_CLIENT = openai.OpenAI(api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL)
     print("✅ OpenAI 신버전 클라이언트 초기화 완료")
+    if OPENAI_BASE_URL:
+        print(f"ℹ️  OpenAI API 주소 변경: {OPENAI_BASE_URL}")
 else:
     openai.api_key = OPENAI_API_KEY
     OPENAI_CLIENT = openai
@@ -25,6 +31,63 @@ print(f"✅ OpenAI API 키 로드 성공")
 GEMINI_CLIENT = None
 GEMINI_MODEL_NAME = None
 
+
+def _camel_case(name: str) -> str:
+    head, *rest = name.split("_")
+    return head + "".join(word.capitalize() for word in rest)
+
+
+class GeminiRestError(RuntimeError):
+    """Gemini REST API 오류 응답 (status_code로 재시도 여부 판단)"""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"Gemini API 오류 {status_code}: {message}")
+        self.status_code = status_code
+
+
+class GeminiRestClient:
+    """GEMINI_BASE_URL이 지정된 경우 사용하는 Gemini REST API 클라이언트
+
+    gateway에서 사용하는 generate_content_async()만 구현하며,
+    응답은 google.generativeai 응답처럼 text와 usage_metadata 속성으로 읽을 수 있습니다.
+    """
+
+    def __init__(self, model_name: str, api_key: str, base_url: str):
+        from .config import LLM_TIMEOUT_SECONDS, LLM_MAX_CONNECTIONS
+
+        self.model_name = model_name
+        self.url = f"{base_url.rstrip('/')}/v1beta/models/{model_name}:generateContent"
+        self.http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=LLM_MAX_CONNECTIONS, max_keepalive_connections=LLM_MAX_CONNECTIONS),
+            timeout=httpx.Timeout(LLM_TIMEOUT_SECONDS, connect=10.0),
+            headers={"x-goog-api-key": api_key or ""}
+        )
+
+    async def generate_content_async(self, prompt: str, generation_config: Optional[Dict] = None):
+        body = {"contents": [{"role": "user", "parts": [{"text": prompt}]}]}
+        if generation_config:
+            # SDK 형식(response_mime_type)을 REST 형식(responseMimeType)으로 변환
+            body["generationConfig"] = {_camel_case(key): value for key, value in generation_config.items()}
+        response = await self.http_client.post(self.url, json=body)
+        if response.status_code != 200:
+            raise GeminiRestError(response.status_code, response.text[:200])
+        data = response.json()
+        parts = data["candidates"][0]["content"]["parts"]
+        usage = data.get("usageMetadata", {})
+        return SimpleNamespace(
+            text="".join(part.get("text", "") for part in parts),
+            usage_metadata=SimpleNamespace(
+                prompt_token_count=usage.get("promptTokenCount"),
+                cached_content_token_count=usage.get("cachedContentTokenCount", 0),
+                candidates_token_count=usage.get("candidatesTokenCount", 0),
+                total_token_count=usage.get("totalTokenCount"),
+            )
+        )
+
+    async def aclose(self):
+        await self.http_client.aclose()
+
+
 def initialize_gemini_client():
     """Gemini 클라이언트를 초기화합니다. LLM 기능 사용 직전에 호출되어야 합니다."""
     global GEMINI_CLIENT, GEMINI_MODEL_NAME
@@ -37,6 +100,14 @@ def initialize_gemini_client():
     # NOTE: .config 모듈에서 직접 변수를 가져옵니다.
     from .config import GEMINI_API_KEY, USE_GEMINI
 
+    if USE_GEMINI and GEMINI_API_KEY and GEMINI_BASE_URL:
+        # 주소를 바꾼 경우 google.generativeai 없이 REST API로 호출
+        model_name = 'gemini-2.5-flash'
+        GEMINI_CLIENT = GeminiRestClient(model_name, GEMINI_API_KEY, GEMINI_BASE_URL)
+        GEMINI_MODEL_NAME = model_name
+        print(f"✅ Gemini REST 클라이언트 초기화 완료: {model_name} ({GEMINI_BASE_URL})")
+        return True
+
     if USE_GEMINI and GEMINI_API_KEY:
         try:
             import google.generativeai as genai
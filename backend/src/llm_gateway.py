@@ -0,0 +1,343 @@
+"""
+비동기 LLM 게이트웨이 모듈
+AsyncOpenAI / Gemini 비동기 호출 공통 처리 (연결 풀 공유, 호출별 타임아웃, 취소 전파,
+재시도/hedging/서킷 브레이커, Gemini 장애 시 OpenAI로 대체, 모델별 호출 예산 스케줄링,
+호출 위치별 지연/토큰/재시도/캐시 적중 기록)
+"""
+import asyncio
+import time
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+import httpx
+import openai
+
+from . import llm_clients
+from .llm_cache import is_cacheable, make_cache_key, get_cached_response, store_cached_response
+from .llm_resilience import BREAKERS, call_with_resilience, is_provider_available, is_retryable_error
+from .llm_scheduler import PRIORITY_NORMAL, Reservation, estimate_tokens
+from .llm_telemetry import flush_llm_trace, record_llm_call
+from .config import OPENAI_API_KEY, OPENAI_BASE_URL, LLM_TIMEOUT_SECONDS, LLM_MAX_CONNECTIONS
+
+ASYNC_OPENAI_CLIENT = None
+_HTTP_CLIENT = None
+
+
+def _is_valid_response(text: str, validate: Optional[Callable[[str], bool]]) -> bool:
+    """캐시 저장/사용 전에 호출한 쪽의 검증 함수로 응답 확인 (검증 함수가 없으면 항상 True)"""
+    if validate is None:
+        return True
+    try:
+        return bool(validate(text))
+    except Exception:
+        return False
+
+
+def get_async_openai_client():
+    """공유 연결 풀을 사용하는 AsyncOpenAI 클라이언트 반환 (최초 호출 시 생성)"""
+    global ASYNC_OPENAI_CLIENT, _HTTP_CLIENT
+
+    if ASYNC_OPENAI_CLIENT is None:
+        _HTTP_CLIENT = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=LLM_MAX_CONNECTIONS
+            ),
+            timeout=httpx.Timeout(LLM_TIMEOUT_SECONDS, connect=10.0)
+        )
+        # 재시도는 call_with_resilience()에서 제한 시간 안에서만 처리하므로 라이브러리 자체 재시도는 끔
+        ASYNC_OPENAI_CLIENT = openai.AsyncOpenAI(
+            api_key=OPENAI_API_KEY,
+            base_url=OPENAI_BASE_URL,
+            http_client=_HTTP_CLIENT,
+            max_retries=0
+        )
+    return ASYNC_OPENAI_CLIENT
+
+
+async def openai_chat(
+    messages: List[Dict],
+    model: str = "gpt-4o-mini",
+    timeout: Optional[float] = None,
+    cache: bool = False,
+    priority: int = PRIORITY_NORMAL,
+    call_site: str = "default",
+    hedge: bool = True,
+    validate: Optional[Callable[[str], bool]] = None,
+    **params
+) -> str:
+    """OpenAI Chat Completions 비동기 호출 후 응답 텍스트 반환
+
+    Args:
+        messages: 대화 메시지 목록
+        model: 모델 이름
+        timeout: 재시도를 포함한 호출 제한 시간(초, 없으면 LLM_TIMEOUT_SECONDS)
+        cache: True이면 LLM 응답 캐시 사용 (temperature=0 또는 seed를 지정한 호출만 적용)
+        priority: 스케줄러 우선순위 (llm_scheduler.PRIORITY_*, 예산이 부족하면 높은 우선순위부터 호출)
+        call_site: 사용량 통계와 hedging 지연 기준에 쓰는 호출 위치 이름 (예: "interview.evaluate")
+        hedge: 지연 시 중복 요청 허용 여부 (긴 생성처럼 중복 비용이 큰 호출은 False)
+        validate: 응답 검증 함수 (cache 사용 시 True를 반환한 응답만 캐시에 저장/사용,
+            예: JSON 파싱에 성공한 응답만 저장하여 잘못된 응답이 TTL 동안 재사용되지 않게 함)
+        **params: temperature, max_tokens, response_format, seed 등 요청 파라미터
+
+    Raises:
+        CircuitOpenError: OpenAI 서킷이 열려 있음 (호출하는 쪽에서 휴리스틱 등으로 대체)
+        asyncio.TimeoutError: 제한 시간 초과
+        asyncio.CancelledError: 호출한 쪽(클라이언트 연결 종료 등)에서 취소
+    """
+    started = time.perf_counter()
+    cache_key = make_cache_key("openai", model, messages, params) if cache and is_cacheable(params) else None
+    if cache_key:
+        cached = await asyncio.to_thread(get_cached_response, cache_key)
+        if cached is not None and _is_valid_response(cached, validate):
+            record_llm_call(call_site, "openai", model, started, cache_hit=True)
+            return cached
+
+    client = get_async_openai_client()
+    reservation = Reservation(model, estimate_tokens(messages, params.get("max_tokens")), priority)
+    
+    async def attempt():
+        response = await client.chat.completions.create(model=model, messages=messages, **params)
+        usage = getattr(response, "usage", None)
+        reservation.settle(getattr(usage, "total_tokens", None))
+        return response
+    
+    trace = {}
+    try:
+        response = await call_with_resilience(
+            "openai",
+            model,
+            attempt,
+            timeout=timeout or LLM_TIMEOUT_SECONDS,
+            hedge=hedge,
+            trace=trace,
+            call_site=call_site,
+            reservation=reservation
+        )
+    except BaseException as e:
+        record_llm_call(call_site, "openai", model, started, error=e, **trace)
+        raise
+    record_llm_call(call_site, "openai", model, started, getattr(response, "usage", None), **trace)
+    text = (response.choices[0].message.content or "").strip()
+
+    if cache_key and _is_valid_response(text, validate):
+        await asyncio.to_thread(store_cached_response, cache_key, text)
+    return text
+
+
+async def openai_chat_stream(
+    messages: List[Dict],
+    model: str = "gpt-4o-mini",
+    timeout: Optional[float] = None,
+    cache: bool = False,
+    priority: int = PRIORITY_NORMAL,
+    call_site: str = "default",
+    validate: Optional[Callable[[str], bool]] = None,
+    **params
+) -> AsyncIterator[str]:
+    """OpenAI Chat Completions 스트리밍 호출 - 응답 텍스트 조각을 도착하는 대로 전달
+
+    timeout은 첫 토큰까지가 아니라 스트림 전체에 적용됩니다.
+    재시도는 스트림 연결까지만 하고, hedging은 하지 않습니다 (이미 전달한 조각을 되돌릴 수 없음).
+    cache가 True이면 openai_chat()과 같은 캐시를 사용합니다 (적중 시 전체 응답을 한 조각으로 전달,
+    스트림을 끝까지 받고 validate를 통과한 경우에만 저장).
+    사용량은 stream_options.include_usage로 받은 마지막 조각에서 기록합니다.
+    """
+    started = time.perf_counter()
+    cache_key = make_cache_key("openai", model, messages, params) if cache and is_cacheable(params) else None
+    if cache_key:
+        cached = await asyncio.to_thread(get_cached_response, cache_key)
+        if cached is not None and _is_valid_response(cached, validate):
+            record_llm_call(call_site, "openai", model, started, cache_hit=True, stream=True)
+            yield cached
+            return
+
+    client = get_async_openai_client()
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + (timeout or LLM_TIMEOUT_SECONDS)
+    reservation = Reservation(model, estimate_tokens(messages, params.get("max_tokens")), priority)
+
+    async def attempt():
+        return await client.chat.completions.create(
+            model=model,
+            messages=messages,
+            stream=True,
+            stream_options={"include_usage": True},
+            **params
+        )
+
+    trace = {}
+    try:
+        stream = await call_with_resilience(
+            "openai",
+            model,
+            attempt,
+            timeout=max(0.0, deadline - loop.time()),
+            hedge=False,
+            trace=trace,
+            call_site=call_site,
+            reservation=reservation
+        )
+    except BaseException as e:
+        record_llm_call(call_site, "openai", model, started, error=e, stream=True, **trace)
+        raise
+    parts = []
+    usage = None
+    ttft = None
+    error = None
+    try:
+        iterator = stream.__aiter__()
+        while True:
+            try:
+                chunk = await asyncio.wait_for(iterator.__anext__(), timeout=max(0.0, deadline - loop.time()))
+            except StopAsyncIteration:
+                break
+            if getattr(chunk, "usage", None) is not None:
+                # 마지막 조각 (choices 없이 usage만 포함)
+                usage = chunk.usage
+                reservation.settle(usage.total_tokens)
+            if chunk.choices and chunk.choices[0].delta.content:
+                if ttft is None:
+                    ttft = time.perf_counter() - started
+                parts.append(chunk.choices[0].delta.content)
+                yield chunk.choices[0].delta.content
+    except Exception as e:
+        error = e
+        if is_retryable_error("openai", e):
+            BREAKERS["openai"].record_failure()
+        raise
+    except asyncio.CancelledError as e:
+        error = e
+        raise
+    finally:
+        # 받는 쪽이 중간에 그만 읽은 경우(GeneratorExit)는 오류로 세지 않음
+        await stream.close()
+        record_llm_call(call_site, "openai", model, started, usage, error=error, stream=True, ttft=ttft, **trace)
+
+    text = "".join(parts).strip()  # openai_chat()과 같은 형식(앞뒤 공백 제거)으로 저장
+    if cache_key and _is_valid_response(text, validate):
+        await asyncio.to_thread(store_cached_response, cache_key, text)
+
+
+def is_gemini_available() -> bool:
+    """Gemini 사용 가능 여부 (필요 시 클라이언트 초기화)"""
+    llm_clients.initialize_gemini_client()
+    return bool(llm_clients.USE_GEMINI and llm_clients.GEMINI_CLIENT is not None)
+
+
+async def gemini_generate(
+    prompt: str,
+    timeout: Optional[float] = None,
+    priority: int = PRIORITY_NORMAL,
+    call_site: str = "default",
+    hedge: bool = True,
+    json_mode: bool = False
+) -> str:
+    """Gemini generate_content 비동기 호출 후 응답 텍스트 반환 (call_site, hedge는 openai_chat()과 같음)
+
+    json_mode가 True이면 response_mime_type을 application/json으로 지정하여 JSON만 응답하게 합니다.
+
+    Raises:
+        RuntimeError: Gemini 클라이언트를 사용할 수 없음
+        CircuitOpenError: Gemini 서킷이 열려 있음
+        asyncio.TimeoutError: 제한 시간 초과
+    """
+    if not is_gemini_available():
+        raise RuntimeError("Gemini 클라이언트가 초기화되지 않았습니다.")
+
+    started = time.perf_counter()
+    client = llm_clients.GEMINI_CLIENT
+    model = llm_clients.GEMINI_MODEL_NAME or "gemini"
+    reservation = Reservation(model, estimate_tokens([{"content": prompt}]), priority)
+    generation_config = {"response_mime_type": "application/json"} if json_mode else None
+
+    async def attempt():
+        response = await client.generate_content_async(prompt, generation_config=generation_config)
+        usage = getattr(response, "usage_metadata", None)
+        reservation.settle(getattr(usage, "total_token_count", None))
+        return response
+
+    trace = {}
+    try:
+        response = await call_with_resilience(
+            "gemini",
+            model,
+            attempt,
+            timeout=timeout or LLM_TIMEOUT_SECONDS,
+            hedge=hedge,
+            trace=trace,
+            call_site=call_site,
+            reservation=reservation
+        )
+    except BaseException as e:
+        record_llm_call(call_site, "gemini", model, started, error=e, **trace)
+        raise
+    record_llm_call(call_site, "gemini", model, started, getattr(response, "usage_metadata", None), **trace)
+    return response.text.strip()
+
+
+async def generate_text_with_fallback(
+    prompt: str,
+    timeout: Optional[float] = None,
+    priority: int = PRIORITY_NORMAL,
+    call_site: str = "default",
+    hedge: bool = True,
+    **openai_params
+) -> str:
+    """Gemini로 텍스트 생성, Gemini를 쓸 수 없거나 실패하면 GPT-4o-mini로 대체
+
+    response_format이 json_object이면 Gemini도 JSON 모드(json_mode)로 호출하여 두 공급자의 응답 형식을 맞춥니다.
+
+    Args:
+        prompt: 프롬프트
+        timeout: 공급자별 호출 제한 시간(초)
+        priority: 스케줄러 우선순위
+        call_site: 사용량 통계와 hedging 지연 기준에 쓰는 호출 위치 이름
+        hedge: 지연 시 중복 요청 허용 여부
+        **openai_params: OpenAI로 대체할 때 사용할 요청 파라미터 (temperature, response_format 등)
+
+    Raises:
+        RuntimeError: 두 공급자 모두 사용할 수 없음
+    """
+    if is_gemini_available() and is_provider_available("gemini"):
+        try:
+            return await gemini_generate(
+                prompt,
+                timeout=timeout,
+                priority=priority,
+                call_site=call_site,
+                hedge=hedge,
+                json_mode=(openai_params.get("response_format") or {}).get("type") == "json_object"
+            )
+        except Exception as e:
+            if not llm_clients.USE_OPENAI:
+                raise
+            print(f"⚠️  Gemini 호출 실패, GPT-4o-mini로 대체: {e}")
+    elif not llm_clients.USE_OPENAI:
+        raise RuntimeError("사용 가능한 LLM 공급자가 없습니다.")
+
+    return await openai_chat(
+        [{"role": "user", "content": prompt}],
+        model="gpt-4o-mini",
+        timeout=timeout,
+        priority=priority,
+        call_site=call_site,
+        hedge=hedge,
+        **openai_params
+    )
+
+
+async def close_llm_gateway():
+    """공유 연결 풀 종료, 남은 호출 추적 기록 저장 (앱 종료 시 호출)"""
+    global ASYNC_OPENAI_CLIENT, _HTTP_CLIENT
+
+    await asyncio.to_thread(flush_llm_trace)
+
+    if _HTTP_CLIENT is not None:
+        await _HTTP_CLIENT.aclose()
+    ASYNC_OPENAI_CLIENT = None
+    _HTTP_CLIENT = None
+
+    # REST Gemini 클라이언트(GEMINI_BASE_URL 지정 시)의 연결 풀 종료
+    if isinstance(llm_clients.GEMINI_CLIENT, llm_clients.GeminiRestClient):
+        await llm_clients.GEMINI_CLIENT.aclose()
+        llm_clients.GEMINI_CLIENT = None
@@ -0,0 +1,263 @@
+"""
+LLM 호출 복원력 모듈
+호출 전체 제한 시간(deadline) 안에서 지터 재시도, 지연 시 중복 요청(hedging), 공급자별 서킷 브레이커 처리
+"""
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+import httpx
+import openai
+
+from .config import (
+    LLM_MAX_RETRIES,
+    LLM_RETRY_BASE_DELAY,
+    LLM_RETRY_MAX_DELAY,
+    LLM_HEDGE_ENABLED,
+    LLM_HEDGE_MIN_DELAY,
+    LLM_HEDGE_MIN_SAMPLES,
+    LLM_BREAKER_FAILURE_THRESHOLD,
+    LLM_BREAKER_RESET_SECONDS,
+)
+
+# hedging 기준 지연 시간 계산에 사용하는 최근 성공 호출 수 (공급자·모델·호출 위치별)
+LATENCY_WINDOW_SIZE = 200
+
+# 재시도 가능한 Gemini(google.api_core) 예외 이름 (선택 의존성이므로 import하지 않고 이름으로 판별)
+_GEMINI_RETRYABLE_ERRORS = {"ResourceExhausted", "ServiceUnavailable", "InternalServerError", "DeadlineExceeded", "TooManyRequests"}
+
+# 재시도 가능한 HTTP 상태 코드 (속도 제한, 서버 오류)
+_RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+_LATENCY_SAMPLES: Dict[Tuple[str, str, str], deque] = {}
+
+
+class CircuitOpenError(RuntimeError):
+    """서킷이 열려 있어 공급자를 호출하지 않음"""
+
+
+class CircuitBreaker:
+    """공급자별 서킷 브레이커
+
+    연속 실패가 failure_threshold회에 도달하면 reset_seconds 동안 호출을 즉시 거부(open)하고,
+    이후 한 번의 시험 호출(half-open)이 성공하면 다시 정상 상태(closed)로 돌아갑니다.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_seconds: float):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def allow_request(self) -> bool:
+        """호출 허용 여부 (half-open 상태에서는 시험 호출 1개만 허용)"""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self.trial_in_flight:
+            self.trial_in_flight = True
+            return True
+        return False
+
+    def is_available(self) -> bool:
+        """호출 가능 상태인지 확인 (시험 호출 자리를 차지하지 않음)"""
+        state = self.state
+        return state == "closed" or (state == "half_open" and not self.trial_in_flight)
+
+    def record_success(self):
+        if self.opened_at is not None:
+            print(f"✅ [{self.name}] 서킷 닫힘 (공급자 응답 회복)")
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        self.trial_in_flight = False
+        if self.opened_at is not None or self.consecutive_failures >= self.failure_threshold:
+            if self.state != "open":
+                print(f"⚠️  [{self.name}] 서킷 열림: 연속 {self.consecutive_failures}회 실패, "
+                      f"{self.reset_seconds:.0f}초 동안 호출 차단")
+            self.opened_at = time.monotonic()
+
+    def release_trial(self):
+        """시험 호출이 성공/실패 판정 없이 끝난 경우(취소 등) 자리 반환"""
+        self.trial_in_flight = False
+
+
+BREAKERS: Dict[str, CircuitBreaker] = {
+    provider: CircuitBreaker(provider, LLM_BREAKER_FAILURE_THRESHOLD, LLM_BREAKER_RESET_SECONDS)
+    for provider in ("openai", "gemini")
+}
+
+
+def is_provider_available(provider: str) -> bool:
+    """공급자 서킷이 호출을 받을 수 있는 상태인지 확인"""
+    return BREAKERS[provider].is_available()
+
+
+def is_retryable_error(provider: str, error: BaseException) -> bool:
+    """일시적 오류(연결, 제한 시간, 속도 제한, 서버 오류)인지 확인 - 요청 형식 오류 등은 재시도하지 않음"""
+    if isinstance(error, asyncio.TimeoutError):
+        return True
+    if provider == "openai":
+        return isinstance(error, (openai.APIConnectionError, openai.RateLimitError, openai.InternalServerError))
+    if getattr(error, "status_code", None) in _RETRYABLE_STATUS_CODES:  # REST 클라이언트(GeminiRestError)
+        return True
+    return type(error).__name__ in _GEMINI_RETRYABLE_ERRORS or isinstance(
+        error, (ConnectionError, TimeoutError, httpx.TransportError)
+    )
+
+
+def _record_latency(provider: str, model: str, call_site: str, seconds: float):
+    _LATENCY_SAMPLES.setdefault((provider, model, call_site), deque(maxlen=LATENCY_WINDOW_SIZE)).append(seconds)
+
+
+def hedge_delay(provider: str, model: str, call_site: str = "default") -> Optional[float]:
+    """중복 요청을 보낼 대기 시간 - 같은 호출 위치의 최근 성공 호출 지연 p95 (최소 LLM_HEDGE_MIN_DELAY)
+
+    호출 위치마다 응답 길이가 크게 다르므로 지연 표본을 호출 위치별로 따로 모으고,
+    표본이 LLM_HEDGE_MIN_SAMPLES개 미만이면 None(hedging 안 함)을 반환합니다.
+    기준 없이 중복 요청을 보내면 원래 오래 걸리는 호출마다 비용이 두 배가 되기 때문입니다.
+    """
+    samples = _LATENCY_SAMPLES.get((provider, model, call_site))
+    if not samples or len(samples) < LLM_HEDGE_MIN_SAMPLES:
+        return None
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return max(LLM_HEDGE_MIN_DELAY, p95)
+
+
+def _backoff_delay(attempt: int) -> float:
+    """지수 백오프 + full jitter"""
+    return random.uniform(0, min(LLM_RETRY_MAX_DELAY, LLM_RETRY_BASE_DELAY * (2 ** attempt)))
+
+
+async def _hedged_call(
+    make_call: Callable[[], Awaitable],
+    delay: Optional[float],
+    trace: Dict,
+    reservation=None
+):
+    """첫 요청이 delay 안에 끝나지 않으면 같은 요청을 하나 더 보내고 먼저 성공한 결과 사용
+
+    reservation이 있으면 중복 요청은 예산이 바로 확보될 때만 보냅니다 (대기열에서 기다리지 않음).
+    사용하지 않은 요청(취소된 요청 + 함께 끝났지만 버린 응답)도 비용이 청구되므로
+    trace["hedge_losers"]에 개수를, trace["loser_responses"]에 버린 응답을 기록합니다.
+    """
+    tasks = [asyncio.ensure_future(make_call())]
+    try:
+        if delay is not None:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done and (reservation is None or reservation.try_acquire()):
+                trace["hedged"] = True
+                tasks.append(asyncio.ensure_future(make_call()))
+        while True:
+            done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            errors = [task.exception() for task in done]
+            succeeded = [task for task, error in zip(done, errors) if error is None]
+            if succeeded:
+                winner, *discarded = succeeded
+                if discarded or pending:
+                    trace["hedge_losers"] = len(discarded) + len(pending)
+                    trace["loser_responses"] = [task.result() for task in discarded]
+                return winner.result()
+            tasks = list(pending)
+            if not tasks:
+                raise errors[0]
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def call_with_resilience(
+    provider: str,
+    model: str,
+    make_call: Callable[[], Awaitable],
+    timeout: float,
+    hedge: bool = True,
+    trace: Optional[Dict] = None,
+    call_site: str = "default",
+    reservation=None
+):
+    """공급자 호출을 서킷 브레이커, 지터 재시도, hedging으로 감싸서 실행
+
+    Args:
+        provider: "openai" 또는 "gemini"
+        model: 모델 이름 (hedging 지연 기준을 모델별로 관리)
+        make_call: 호출할 때마다 새 코루틴을 만드는 함수 (재시도/중복 요청에 재사용)
+        timeout: 재시도와 대기를 포함한 전체 제한 시간(초)
+        hedge: 지연 시 중복 요청 허용 여부 (스트리밍, 긴 생성처럼 중복 비용이 큰 호출은 False)
+        trace: 넘기면 재시도 횟수("retries"), 중복 요청 여부("hedged"), 사용하지 않은 중복 요청 수와
+            버린 응답("hedge_losers", "loser_responses")을 기록 (record_llm_call()에 그대로 전달)
+        call_site: 호출 위치 이름 (hedging 지연 기준을 호출 위치별로 관리)
+        reservation: 호출 예산 (llm_scheduler.Reservation, 공급자 호출마다 make_call 밖에서 확보)
+
+    Raises:
+        CircuitOpenError: 서킷이 열려 있음 (호출하지 않음)
+        asyncio.TimeoutError: 전체 제한 시간 초과 (예산 대기 중 초과는 공급자 실패로 세지 않음)
+        그 밖의 공급자 예외: 재시도할 수 없는 오류이거나 재시도 횟수 초과
+    """
+    breaker = BREAKERS[provider]
+    trace = trace if trace is not None else {}
+    trace.setdefault("retries", 0)
+    trace.setdefault("hedged", False)
+    trace.setdefault("hedge_losers", 0)
+    trace.setdefault("loser_responses", [])
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    attempt = 0
+
+    while True:
+        if not breaker.is_available():
+            raise CircuitOpenError(f"{provider} 서킷이 열려 있어 호출을 건너뜁니다.")
+        if reservation is not None:
+            # 로컬 대기열 대기는 공급자 호출이 아니므로 서킷/hedging 판단에서 제외
+            await asyncio.wait_for(reservation.acquire(), timeout=max(0.0, deadline - loop.time()))
+        if not breaker.allow_request():
+            if reservation is not None:
+                reservation.release()
+            raise CircuitOpenError(f"{provider} 서킷이 열려 있어 호출을 건너뜁니다.")
+
+        remaining = deadline - loop.time()
+        delay = hedge_delay(provider, model, call_site) if hedge and LLM_HEDGE_ENABLED else None
+        started = loop.time()
+        try:
+            result = await asyncio.wait_for(
+                _hedged_call(make_call, delay, trace, reservation), timeout=max(0.0, remaining)
+            )
+        except asyncio.CancelledError:
+            breaker.release_trial()
+            raise
+        except Exception as e:
+            retryable = is_retryable_error(provider, e)
+            if not retryable:
+                # 요청 형식 오류 등은 공급자 장애가 아니므로 서킷 실패로 세지 않음
+                breaker.release_trial()
+                raise
+            breaker.record_failure()
+            backoff = _backoff_delay(attempt)
+            if attempt >= LLM_MAX_RETRIES or breaker.state == "open" or loop.time() + backoff >= deadline:
+                raise
+            attempt += 1
+            trace["retries"] = attempt
+            print(f"🔁 [{provider}] {model} 호출 재시도 {attempt}/{LLM_MAX_RETRIES} "
+                  f"({type(e).__name__}, {backoff:.2f}초 후)")
+            await asyncio.sleep(backoff)
+            continue
+
+        breaker.record_success()
+        _record_latency(provider, model, call_site, loop.time() - started)
+        return result
@@ -0,0 +1,239 @@
+"""
+LLM 호출 스케줄러 모듈
+모델별 분당 요청 수(RPM)/토큰 수(TPM) 토큰 버킷 예산 안에서 우선순위가 높은 호출부터 내보냄
+(대화형 채팅 > 일반 > 자기소개서 생성 같은 일괄 작업)
+"""
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+from .config import LLM_SCHEDULER_ENABLED, LLM_RATE_LIMITS
+
+# 우선순위 (작을수록 먼저 처리)
+PRIORITY_INTERACTIVE = 0  # 채팅, 면접 답변 평가 등 사용자가 바로 기다리는 호출
+PRIORITY_NORMAL = 1
+PRIORITY_BATCH = 2  # 자기소개서 생성, 매칭 점수 일괄 평가 등
+PRIORITY_NAMES = {PRIORITY_INTERACTIVE: "interactive", PRIORITY_NORMAL: "normal", PRIORITY_BATCH: "batch"}
+
+# 대기 시간 통계에 사용하는 최근 호출 수
+WAIT_WINDOW_SIZE = 500
+
+
+class TokenBucket:
+    """분당 한도를 초당 일정 속도로 채우는 토큰 버킷 (최대 1분치까지 누적)"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        """amount만큼 사용할 수 있을 때까지 남은 시간(초) - 한도보다 큰 요청은 버킷이 가득 차면 허용"""
+        self._refill()
+        needed = min(amount, self.capacity) - self.tokens
+        return max(0.0, needed / self.rate)
+
+    def consume(self, amount: float):
+        self._refill()
+        self.tokens -= amount
+
+    def available(self) -> float:
+        self._refill()
+        return self.tokens
+
+    def refund(self, amount: float):
+        """예상보다 적게 (음수면 많이) 사용한 만큼 반환"""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class _ModelQueue:
+    """모델 하나의 RPM/TPM 버킷과 우선순위 대기열"""
+
+    def __init__(self, model: str, rpm: float, tpm: float):
+        self.model = model
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.heap: List = []
+        self.wakeup = asyncio.Event()
+        self.dispatcher: Optional[asyncio.Task] = None
+        self.waits: deque = deque(maxlen=WAIT_WINDOW_SIZE)
+        self.dispatched = 0
+
+    def wait_time(self, tokens: int) -> float:
+        return max(self.requests.wait_time(1), self.tokens.wait_time(tokens))
+
+    def consume(self, tokens: int):
+        self.requests.consume(1)
+        self.tokens.consume(tokens)
+
+    def queue_depth(self) -> Dict[str, int]:
+        depth = {name: 0 for name in PRIORITY_NAMES.values()}
+        for priority, _, _, future, _ in self.heap:
+            if not future.done():
+                depth[PRIORITY_NAMES.get(priority, str(priority))] += 1
+        return depth
+
+
+_QUEUES: Dict[str, _ModelQueue] = {}
+_SEQUENCE = itertools.count()
+
+
+def _get_queue(model: str) -> Optional[_ModelQueue]:
+    """모델 대기열 반환 (예산이 정의되지 않은 모델은 None - 제한 없이 호출)"""
+    if model not in _QUEUES:
+        limits = LLM_RATE_LIMITS.get(model)
+        if not limits:
+            return None
+        _QUEUES[model] = _ModelQueue(model, limits["rpm"], limits["tpm"])
+    return _QUEUES[model]
+
+
+async def _dispatch(queue: _ModelQueue):
+    """대기열 맨 앞(가장 높은 우선순위, 같으면 먼저 온 순서) 호출을 예산이 생기는 대로 내보냄"""
+    while queue.heap:
+        priority, _, tokens, future, enqueued_at = queue.heap[0]
+        if future.done():  # 기다리던 쪽이 취소됨
+            heapq.heappop(queue.heap)
+            continue
+
+        wait = queue.wait_time(tokens)
+        if wait > 0:
+            # 예산이 찰 때까지 기다리되, 더 높은 우선순위 호출이 들어오면 다시 확인
+            queue.wakeup.clear()
+            try:
+                await asyncio.wait_for(queue.wakeup.wait(), timeout=wait)
+            except asyncio.TimeoutError:
+                pass
+            continue
+
+        heapq.heappop(queue.heap)
+        queue.consume(tokens)
+        queue.waits.append(time.monotonic() - enqueued_at)
+        queue.dispatched += 1
+        future.set_result(None)
+    queue.dispatcher = None
+
+
+async def acquire(model: str, estimated_tokens: int, priority: int = PRIORITY_NORMAL):
+    """모델 예산에서 요청 1회와 예상 토큰을 확보할 때까지 대기
+
+    대기열이 비어 있고 예산이 남아 있으면 바로 반환합니다.
+    """
+    if not LLM_SCHEDULER_ENABLED:
+        return
+    queue = _get_queue(model)
+    if queue is None:
+        return
+
+    if not queue.heap and queue.wait_time(estimated_tokens) == 0:
+        queue.consume(estimated_tokens)
+        queue.waits.append(0.0)
+        queue.dispatched += 1
+        return
+
+    future = asyncio.get_running_loop().create_future()
+    heapq.heappush(queue.heap, (priority, next(_SEQUENCE), estimated_tokens, future, time.monotonic()))
+    queue.wakeup.set()
+    if queue.dispatcher is None:
+        queue.dispatcher = asyncio.create_task(_dispatch(queue))
+    try:
+        await future
+    except asyncio.CancelledError:
+        # 예산을 확보한 직후(공급자 호출 전)에 취소되면 확보한 예산 반환
+        if future.done() and not future.cancelled():
+            release(model, estimated_tokens)
+        raise
+
+
+def try_acquire(model: str, estimated_tokens: int) -> bool:
+    """기다리지 않고 예산 확보 (대기열이 비어 있고 예산이 남아 있을 때만 True - hedging 중복 요청용)"""
+    if not LLM_SCHEDULER_ENABLED:
+        return True
+    queue = _get_queue(model)
+    if queue is None:
+        return True
+    if queue.heap or queue.wait_time(estimated_tokens) > 0:
+        return False
+    queue.consume(estimated_tokens)
+    queue.dispatched += 1
+    return True
+
+
+def release(model: str, estimated_tokens: int):
+    """확보했지만 공급자에 보내지 않은 요청의 예산(요청 1회 + 예상 토큰) 반환"""
+    queue = _QUEUES.get(model)
+    if queue is None:
+        return
+    queue.requests.refund(1)
+    queue.tokens.refund(estimated_tokens)
+
+
+def settle(model: str, estimated_tokens: int, actual_tokens: Optional[int]):
+    """응답의 실제 사용 토큰으로 TPM 예산 보정 (usage가 없으면 예상값 유지)"""
+    queue = _QUEUES.get(model)
+    if queue is None or actual_tokens is None:
+        return
+    queue.tokens.refund(estimated_tokens - actual_tokens)
+
+
+class Reservation:
+    """호출 한 번의 예산 확보/반환 묶음
+
+    call_with_resilience()에 넘기면 재시도마다 공급자 호출 직전에 예산을 확보하고,
+    대기열 대기 시간은 서킷 브레이커 실패나 hedging 지연 표본에 포함되지 않습니다.
+    """
+
+    def __init__(self, model: str, estimated_tokens: int, priority: int = PRIORITY_NORMAL):
+        self.model = model
+        self.estimated_tokens = estimated_tokens
+        self.priority = priority
+
+    async def acquire(self):
+        await acquire(self.model, self.estimated_tokens, self.priority)
+
+    def try_acquire(self) -> bool:
+        return try_acquire(self.model, self.estimated_tokens)
+
+    def release(self):
+        release(self.model, self.estimated_tokens)
+
+    def settle(self, actual_tokens: Optional[int]):
+        settle(self.model, self.estimated_tokens, actual_tokens)
+
+
+def estimate_tokens(messages: List[Dict], max_tokens: Optional[int] = None) -> int:
+    """요청이 사용할 토큰 수 추정 (한글 위주 프롬프트 기준 약 2자당 1토큰 + 응답 최대 토큰)"""
+    prompt_chars = sum(len(str(m.get("content", ""))) for m in messages)
+    return prompt_chars // 2 + (max_tokens or 512)
+
+
+def get_scheduler_stats() -> Dict:
+    """모델별 대기열 깊이, 대기 시간, 남은 예산"""
+    stats = {}
+    for model, queue in _QUEUES.items():
+        waits = sorted(queue.waits)
+        stats[model] = {
+            "queue_depth": queue.queue_depth(),
+            "dispatched": queue.dispatched,
+            "wait_ms": {
+                "avg": round(sum(waits) / len(waits) * 1000, 1) if waits else 0.0,
+                "p95": round(waits[min(len(waits) - 1, int(len(waits) * 0.95))] * 1000, 1) if waits else 0.0,
+                "max": round(waits[-1] * 1000, 1) if waits else 0.0,
+            },
+            "available": {
+                "requests": round(queue.requests.available(), 1),
+                "tokens": round(queue.tokens.available(), 1),
+            },
+            "limits": {"rpm": queue.requests.capacity, "tpm": queue.tokens.capacity},
+        }
+    return {"enabled": LLM_SCHEDULER_ENABLED, "models": stats}
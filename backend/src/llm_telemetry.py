@@ -0,0 +1,337 @@
+"""
+LLM 호출 기록(telemetry) 모듈
+모든 LLM 호출의 모델, 호출 위치(call site), 프롬프트/응답 토큰, 지연 시간, 재시도 횟수, 캐시 적중을
+호출 위치·모델별 프로세스 내 히스토그램으로 집계하고, 호출마다 JSONL 추적 파일에 한 줄씩 기록
+(파일 쓰기는 이벤트 루프를 막지 않도록 백그라운드 스레드에서 처리)
+"""
+import json
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+from .config import LLM_TRACE_ENABLED, LLM_TRACE_MAX_BYTES, LLM_PRICES
+
+# 추적 파일 경로 (프로젝트 루트 기준, llm_cache.sqlite3와 같은 위치)
+LLM_TRACE_PATH = Path(__file__).parent.parent / "llm_trace.jsonl"
+
+# 히스토그램 구간 상한 (마지막 구간은 +Inf)
+LATENCY_BUCKETS_MS = (100, 250, 500, 1000, 2000, 5000, 10000, 20000, 60000)
+TOKEN_BUCKETS = (64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384)
+
+_TRACE_QUEUE: "queue.Queue[Dict]" = queue.Queue()
+_TRACE_WRITER: Optional[threading.Thread] = None
+_TRACE_WRITER_LOCK = threading.Lock()
+
+
+class Histogram:
+    """고정 구간 히스토그램 (구간별 개수, 합계, 최댓값, 구간 상한으로 추정한 분위수)"""
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        index = len(self.bounds)
+        for i, bound in enumerate(self.bounds):
+            if value <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """q 분위수가 속한 구간의 상한 (+Inf 구간이면 관측 최댓값)"""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return float(self.bounds[i]) if i < len(self.bounds) else self.max
+        return self.max
+
+    def to_dict(self) -> Dict:
+        buckets = {f"le_{bound:g}": count for bound, count in zip(self.bounds, self.counts)}
+        buckets["le_inf"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 1),
+            "avg": round(self.sum / self.count, 1) if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "max": round(self.max, 1),
+            "buckets": buckets,
+        }
+
+
+class _CallStats:
+    """호출 위치 + 모델 하나의 누적 통계"""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors: Dict[str, int] = {}
+        self.cache_hits = 0  # LLM 응답 캐시(llm_cache) 적중 - 공급자를 호출하지 않음
+        self.retries = 0
+        self.hedged = 0
+        self.hedge_losers = 0  # 응답을 사용하지 않은 중복 요청 수 (취소되었거나 늦게 끝난 쪽)
+        self.hedge_loser_cost_usd = 0.0  # 버린 응답 중 usage를 받은 요청의 비용 (cost_usd에 포함)
+        self.usage_calls = 0  # 응답에 usage가 있던 호출 수
+        self.prompt_cache_hit_calls = 0  # 공급자 프롬프트 캐시 적중 토큰이 있던 호출 수
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self.completion_tokens = 0
+        self.cost_usd = 0.0
+        self.latency_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.ttft_ms = Histogram(LATENCY_BUCKETS_MS)  # 스트리밍 첫 조각까지 걸린 시간
+        self.prompt_tokens_hist = Histogram(TOKEN_BUCKETS)
+        self.completion_tokens_hist = Histogram(TOKEN_BUCKETS)
+
+    def to_dict(self) -> Dict:
+        return {
+            "calls": self.calls,
+            "errors": dict(self.errors),
+            "cache_hits": self.cache_hits,
+            "retries": self.retries,
+            "hedged": self.hedged,
+            "hedge_losers": self.hedge_losers,
+            "hedge_loser_cost_usd": round(self.hedge_loser_cost_usd, 6),
+            "tokens": {
+                "prompt": self.prompt_tokens,
+                "cached": self.cached_tokens,
+                "completion": self.completion_tokens,
+            },
+            "cost_usd": round(self.cost_usd, 6),
+            "latency_ms": self.latency_ms.to_dict(),
+            "ttft_ms": self.ttft_ms.to_dict(),
+            "prompt_tokens": self.prompt_tokens_hist.to_dict(),
+            "completion_tokens": self.completion_tokens_hist.to_dict(),
+        }
+
+
+_STATS: Dict[Tuple[str, str], _CallStats] = {}
+
+
+def _usage_tokens(usage) -> Tuple[Optional[int], int, int]:
+    """응답 usage에서 (프롬프트 토큰, 캐시 적중 토큰, 응답 토큰) 추출
+
+    OpenAI: usage.prompt_tokens, usage.prompt_tokens_details.cached_tokens, usage.completion_tokens
+    Gemini: usage_metadata.prompt_token_count, cached_content_token_count, candidates_token_count
+    """
+    if usage is None:
+        return None, 0, 0
+    if hasattr(usage, "prompt_tokens"):
+        details = getattr(usage, "prompt_tokens_details", None)
+        return (
+            getattr(usage, "prompt_tokens", None),
+            getattr(details, "cached_tokens", None) or 0,
+            getattr(usage, "completion_tokens", None) or 0,
+        )
+    return (
+        getattr(usage, "prompt_token_count", None),
+        getattr(usage, "cached_content_token_count", None) or 0,
+        getattr(usage, "candidates_token_count", None) or 0,
+    )
+
+
+def estimate_cost(model: str, prompt_tokens: int, cached_tokens: int, completion_tokens: int) -> float:
+    """LLM_PRICES 기준 호출 비용(USD) 추정 (가격이 없는 모델은 0)"""
+    prices = LLM_PRICES.get(model)
+    if not prices:
+        return 0.0
+    uncached = max(0, prompt_tokens - cached_tokens)
+    return (
+        uncached * prices["input"]
+        + cached_tokens * prices.get("cached_input", prices["input"])
+        + completion_tokens * prices["output"]
+    ) / 1_000_000
+
+
+def _write_trace(records: Sequence[Dict]):
+    """추적 파일에 기록 추가 (LLM_TRACE_MAX_BYTES를 넘으면 .1 파일로 교체)"""
+    lines = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+    try:
+        if LLM_TRACE_PATH.exists() and LLM_TRACE_PATH.stat().st_size > LLM_TRACE_MAX_BYTES:
+            LLM_TRACE_PATH.replace(LLM_TRACE_PATH.with_suffix(".jsonl.1"))
+        with open(LLM_TRACE_PATH, "a", encoding="utf-8") as f:
+            f.write(lines)
+    except OSError as e:
+        print(f"⚠️  LLM 호출 추적 기록 실패: {e}")
+
+
+def _trace_writer_loop():
+    """대기열에 쌓인 추적 기록을 모아서 파일에 쓰는 백그라운드 스레드"""
+    while True:
+        records = [_TRACE_QUEUE.get()]
+        while True:
+            try:
+                records.append(_TRACE_QUEUE.get_nowait())
+            except queue.Empty:
+                break
+        _write_trace(records)
+        for _ in records:
+            _TRACE_QUEUE.task_done()
+
+
+def _enqueue_trace(record: Dict):
+    """추적 기록을 백그라운드 스레드로 넘김 (최초 호출 시 스레드 시작)"""
+    global _TRACE_WRITER
+
+    if _TRACE_WRITER is None:
+        with _TRACE_WRITER_LOCK:
+            if _TRACE_WRITER is None:
+                _TRACE_WRITER = threading.Thread(target=_trace_writer_loop, name="llm-trace-writer", daemon=True)
+                _TRACE_WRITER.start()
+    _TRACE_QUEUE.put(record)
+
+
+def flush_llm_trace():
+    """대기 중인 추적 기록을 모두 파일에 쓸 때까지 대기 (앱 종료 시 asyncio.to_thread로 호출)"""
+    if _TRACE_WRITER is not None:
+        _TRACE_QUEUE.join()
+
+
+def record_llm_call(
+    call_site: str,
+    provider: str,
+    model: str,
+    started: float,
+    usage=None,
+    error: Optional[BaseException] = None,
+    cache_hit: bool = False,
+    retries: int = 0,
+    hedged: bool = False,
+    stream: bool = False,
+    ttft: Optional[float] = None,
+    hedge_losers: int = 0,
+    loser_responses: Sequence = ()
+):
+    """LLM 호출 한 번의 결과 기록 (게이트웨이에서 호출 종료 시 호출)
+
+    Args:
+        call_site: 호출 위치 이름 (예: "interview.evaluate")
+        provider: "openai" 또는 "gemini"
+        model: 모델 이름
+        started: 호출 시작 시각 (time.perf_counter())
+        usage: 응답 usage (OpenAI usage / Gemini usage_metadata, 없으면 토큰 통계 생략)
+        error: 실패한 경우 예외
+        cache_hit: LLM 응답 캐시 적중 여부
+        retries: 재시도 횟수
+        hedged: 중복 요청(hedging)을 보냈는지 여부
+        stream: 스트리밍 호출 여부
+        ttft: 스트리밍 첫 조각까지 걸린 시간(초)
+        hedge_losers: 응답을 사용하지 않은 중복 요청 수 (비용이 청구되므로 따로 집계)
+        loser_responses: 함께 끝났지만 버린 응답 (usage가 있으면 비용에 포함)
+    """
+    latency_ms = (time.perf_counter() - started) * 1000
+    prompt_tokens, cached_tokens, completion_tokens = _usage_tokens(usage)
+    cost = estimate_cost(model, prompt_tokens, cached_tokens, completion_tokens) if prompt_tokens is not None else 0.0
+
+    stats = _STATS.setdefault((call_site, model), _CallStats())
+    stats.calls += 1
+    stats.retries += retries
+    stats.hedged += 1 if hedged else 0
+    stats.hedge_losers += hedge_losers
+    loser_cost = 0.0
+    for response in loser_responses:
+        loser_usage = getattr(response, "usage", None) or getattr(response, "usage_metadata", None)
+        loser_prompt, loser_cached, loser_completion = _usage_tokens(loser_usage)
+        if loser_prompt is not None:
+            loser_cost += estimate_cost(model, loser_prompt, loser_cached, loser_completion)
+    stats.hedge_loser_cost_usd += loser_cost
+    stats.cost_usd += loser_cost
+    if error is not None:
+        name = type(error).__name__
+        stats.errors[name] = stats.errors.get(name, 0) + 1
+    if cache_hit:
+        stats.cache_hits += 1
+    else:
+        stats.latency_ms.observe(latency_ms)
+    if ttft is not None:
+        stats.ttft_ms.observe(ttft * 1000)
+    if prompt_tokens is not None:
+        stats.usage_calls += 1
+        stats.prompt_cache_hit_calls += 1 if cached_tokens else 0
+        stats.prompt_tokens += prompt_tokens
+        stats.cached_tokens += cached_tokens
+        stats.completion_tokens += completion_tokens
+        stats.cost_usd += cost
+        stats.prompt_tokens_hist.observe(prompt_tokens)
+        stats.completion_tokens_hist.observe(completion_tokens)
+
+    if LLM_TRACE_ENABLED:
+        _enqueue_trace({
+            "ts": round(time.time(), 3),
+            "call_site": call_site,
+            "provider": provider,
+            "model": model,
+            "stream": stream,
+            "status": type(error).__name__ if error is not None else ("cache_hit" if cache_hit else "ok"),
+            "latency_ms": round(latency_ms, 1),
+            "ttft_ms": round(ttft * 1000, 1) if ttft is not None else None,
+            "prompt_tokens": prompt_tokens,
+            "cached_tokens": cached_tokens,
+            "completion_tokens": completion_tokens,
+            "retries": retries,
+            "hedged": hedged,
+            "hedge_losers": hedge_losers,
+            "cost_usd": round(cost + loser_cost, 6),
+        })
+
+
+def get_llm_metrics() -> Dict:
+    """호출 위치·모델별 통계 (호출 위치는 누적 지연 시간이 큰 순서)"""
+    call_sites: Dict[str, Dict] = {}
+    latency_by_site: Dict[str, float] = {}
+    totals = {
+        "calls": 0, "errors": 0, "cache_hits": 0, "hedge_losers": 0,
+        "prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0,
+    }
+    for (site, model), stats in _STATS.items():
+        call_sites.setdefault(site, {})[model] = stats.to_dict()
+        latency_by_site[site] = latency_by_site.get(site, 0.0) + stats.latency_ms.sum
+        totals["calls"] += stats.calls
+        totals["errors"] += sum(stats.errors.values())
+        totals["cache_hits"] += stats.cache_hits
+        totals["hedge_losers"] += stats.hedge_losers
+        totals["prompt_tokens"] += stats.prompt_tokens
+        totals["completion_tokens"] += stats.completion_tokens
+        totals["cost_usd"] += stats.cost_usd
+    totals["cost_usd"] = round(totals["cost_usd"], 6)
+
+    ordered = sorted(call_sites, key=lambda site: latency_by_site[site], reverse=True)
+    return {
+        "trace": {"enabled": LLM_TRACE_ENABLED, "path": str(LLM_TRACE_PATH)},
+        "totals": totals,
+        "call_sites": {site: call_sites[site] for site in ordered},
+    }
+
+
+def get_prompt_cache_stats(call_site: Optional[str] = None) -> Dict:
+    """호출 위치별 프롬프트 캐시 통계 (cached_ratio: 프롬프트 토큰 중 캐시 적중 비율)"""
+    result = {}
+    for (site, model), stats in _STATS.items():
+        if (call_site and site != call_site) or stats.usage_calls == 0:
+            continue
+        entry = result.setdefault(site, {
+            "calls": 0,
+            "cache_hit_calls": 0,
+            "prompt_tokens": 0,
+            "cached_tokens": 0,
+            "models": {},
+        })
+        entry["calls"] += stats.usage_calls
+        entry["cache_hit_calls"] += stats.prompt_cache_hit_calls
+        entry["prompt_tokens"] += stats.prompt_tokens
+        entry["cached_tokens"] += stats.cached_tokens
+        entry["models"][model] = stats.usage_calls
+    for entry in result.values():
+        entry["cached_ratio"] = round(entry["cached_tokens"] / entry["prompt_tokens"], 3) if entry["prompt_tokens"] else 0.0
+    return result
@@ -0,0 +1,19 @@
+"""
+프롬프트 공통 앞부분 모듈
+자기소개서/면접 프롬프트가 같은 순서(이력서 요약 → 채용공고 요약)의 고정 블록으로 시작하도록 통일
+섹션명, 질문, 답변, 초안처럼 호출마다 바뀌는 내용은 이 블록과 고정 지시문 뒤에 붙여서
+공급자의 프롬프트 접두사 캐시(prefix caching)가 같은 세션의 호출끼리 적중하게 함
+"""
+from typing import Dict
+
+from .job_digest import format_job_digest
+from .resume_digest import get_resume_digest
+
+
+def format_prompt_context(resume: Dict, job_info: Dict) -> str:
+    """이력서 요약과 채용공고 요약으로 만든 공통 컨텍스트 블록 (같은 세션이면 바이트 단위로 동일)"""
+    return f"""【이력서 정보】
+{get_resume_digest(resume)}
+
+【채용공고 정보】
+{format_job_digest(job_info)}"""
@@ -1,21 +1,129 @@
 """
 Reranker 모듈: 추출된 공고들을 정밀하게 재순위화
 """
-from typing import List, Dict
+from typing import List, Dict, Optional
 
+import numpy as np
 
-def rerank_jobs(resume: Dict, slots: Dict, retrieved_jobs: List[Dict], all_jobs: List[Dict]) -> List[Dict]:
-    """추출된 공고들을 정밀하게 재순위화 (Reranker) - 벡터 거리로만 정렬"""
-    reranked_jobs = []
+from .config import RERANK_FEATURE_WEIGHTS
+from .retriever import extract_experience_keyword
+
+# 특징 행렬의 열 순서 (가중치 벡터도 이 순서로 구성)
+RERANK_FEATURES = [
+    "vector_similarity",   # 1 - 벡터 거리/2 (0~1)
+    "desired_job_match",   # 슬롯별 키워드 매칭 여부 (retriever의 matched_keywords 기준)
+    "location_match",
+    "job_type_match",
+    "industry_match",
+    "company_size_match",
+    "experience_match",    # 이력서 경력 키워드(신입/경력) 매칭 여부
+    "location_equal",      # 공고 메타데이터와 슬롯 값 일치 여부
+    "job_type_equal",
+    "company_size_equal",
+    "industry_equal",
+]
+
+# 키워드 매칭 특징 → 슬롯 이름
+_KEYWORD_FEATURE_SLOTS = {
+    "desired_job_match": "desired_job",
+    "location_match": "location",
+    "job_type_match": "job_type",
+    "industry_match": "industry",
+    "company_size_match": "company_size",
+}
+
+# 메타데이터 일치 특징 → 공고/슬롯 필드 이름
+_EQUALITY_FEATURE_FIELDS = {
+    "location_equal": "location",
+    "job_type_equal": "job_type",
+    "company_size_equal": "company_size",
+    "industry_equal": "industry",
+}
+
+
+def _fields_match(slot_value: str, job_value) -> bool:
+    """슬롯 값과 공고 메타데이터 값이 서로 포함 관계인지 확인 (대소문자 무시)"""
+    slot_value = slot_value.strip().lower()
+    job_value = str(job_value or "").strip().lower()
+    if not slot_value or not job_value:
+        return False
+    return slot_value in job_value or job_value in slot_value
+
+
+def build_feature_matrix(resume: Dict, slots: Dict, records: List[Dict], all_jobs: List[Dict]) -> np.ndarray:
+    """후보 공고별 특징 행렬 구성 (행: 후보, 열: RERANK_FEATURES)
+
+    Args:
+        resume: 이력서 딕셔너리
+        slots: 챗봇으로 수집한 정보
+        records: job_id, vector_distance, matched_keywords를 가진 순위 레코드
+        all_jobs: 채용공고 카탈로그 (job_id = 인덱스)
+    """
+    slots = slots or {}
+    features = np.zeros((len(records), len(RERANK_FEATURES)), dtype=np.float64)
+    if not records:
+        return features
+
+    column = {name: i for i, name in enumerate(RERANK_FEATURES)}
+
+    distances = np.array([r["vector_distance"] for r in records], dtype=np.float64)
+    features[:, column["vector_similarity"]] = np.clip(1.0 - distances / 2.0, 0.0, 1.0)
+
+    slot_keywords = {
+        name: (slots.get(slot_name) or "").strip()
+        for name, slot_name in _KEYWORD_FEATURE_SLOTS.items()
+    }
+    experience_keyword = extract_experience_keyword(resume)
+
+    for row, record in enumerate(records):
+        matched = set(record["matched_keywords"])
+        for name, keyword in slot_keywords.items():
+            if keyword and keyword in matched:
+                features[row, column[name]] = 1.0
+        if experience_keyword and experience_keyword in matched:
+            features[row, column["experience_match"]] = 1.0
+
+        job = all_jobs[record["job_id"]]
+        for name, field in _EQUALITY_FEATURE_FIELDS.items():
+            if _fields_match(slots.get(field) or "", job.get(field)):
+                features[row, column[name]] = 1.0
+
+    return features
+
+
+def _weight_vector(feature_weights: Optional[Dict[str, float]]) -> np.ndarray:
+    """특징 가중치 딕셔너리를 RERANK_FEATURES 순서의 벡터로 변환 (없는 특징은 0)"""
+    weights = feature_weights if feature_weights is not None else RERANK_FEATURE_WEIGHTS
+    return np.array([float(weights.get(name, 0.0)) for name in RERANK_FEATURES], dtype=np.float64)
+
+
+def rerank_jobs(
+    resume: Dict,
+    slots: Dict,
+    retrieved_jobs: List[Dict],
+    all_jobs: List[Dict],
+    feature_weights: Optional[Dict[str, float]] = None
+) -> List[Dict]:
+    """추출된 공고들을 정밀하게 재순위화 (Reranker) - 특징 행렬 × 가중치 점수 순으로 정렬
+    
+    공고 본문을 복사하지 않고 순위 정보만 담은 가벼운 레코드를 반환합니다.
+    공고 본문은 응답을 만들 때 job_id로 카탈로그(all_jobs)에서 필요한 필드만 가져오세요.
     
+    기본 가중치(RERANK_FEATURE_WEIGHTS)는 기존 정렬(매칭 개수 → 벡터 거리)과 같은 순서를 만듭니다.
+    
+    Args:
+        feature_weights: 특징별 가중치 (None이면 config의 RERANK_FEATURE_WEIGHTS 사용)
+    
+    Returns:
+        List[Dict]: [{job_id, chunk_id, vector_distance, match_score, matched_keywords, match_count, total_keywords,
+                      rank_score, score_breakdown}]
+    """
     if not retrieved_jobs or not all_jobs:
         return []
     
-    # job_dict 생성 (job_id로 빠른 조회)
-    job_dict = {idx: job for idx, job in enumerate(all_jobs)}
-    
+    num_jobs = len(all_jobs)  # job_id는 all_jobs의 인덱스
     seen_job_ids = set()  # 중복 제거
-    jobs_with_distance = []  # 거리와 함께 저장
+    ranked_records = []
     
     for result in retrieved_jobs:
         if not isinstance(result, dict):
@@ -42,36 +150,43 @@ def rerank_jobs(resume: Dict, slots: Dict, retrieved_jobs: List[Dict], all_jobs:
             continue
         seen_job_ids.add(job_id)
         
-        # job_dict에서 공고 찾기
-        if job_id not in job_dict:
+        # 카탈로그에 없는 공고 제외
+        if not 0 <= job_id < num_jobs:
             continue
         
-        job = job_dict[job_id].copy()
-        
-        # 벡터 거리 가져오기 (낮을수록 유사함)
-        vector_distance = result.get("distance", 1.0)
-        
-        # 키워드 매칭 정보 가져오기 (retriever에서 계산된 정보)
-        matched_keywords = metadata.get("matched_keywords", [])
-        match_count = metadata.get("match_count", 0)
-        total_keywords = metadata.get("total_keywords", 5)
-        final_score = metadata.get("final_score", 0.0)
-        
-        # job 객체에 키워드 매칭 정보 추가
-        job["matched_keywords"] = matched_keywords
-        job["match_count"] = match_count
-        job["total_keywords"] = total_keywords
-        job["match_score"] = final_score
-        
-        jobs_with_distance.append((job, vector_distance, match_count))
+        # 벡터 거리(낮을수록 유사함)와 retriever에서 계산된 키워드 매칭 정보
+        ranked_records.append({
+            "job_id": job_id,
+            "chunk_id": result.get("id"),  # 대표 chunk (결과 다양화 단계에서 임베딩 조회용)
+            "vector_distance": result.get("distance", 1.0),
+            "match_score": metadata.get("final_score", 0.0),
+            "matched_keywords": metadata.get("matched_keywords", []),
+            "match_count": metadata.get("match_count", 0),
+            "total_keywords": metadata.get("total_keywords", 5)
+        })
     
-    # 매칭 개수가 많은 순서대로 정렬 (매칭 개수가 같으면 벡터 거리로 정렬)
-    # match_count는 높을수록 좋으므로 -match_count로 정렬 (내림차순)
-    # vector_distance는 낮을수록 좋으므로 그대로 사용 (오름차순)
-    jobs_with_distance.sort(key=lambda x: (-x[2], x[1]))
+    if not ranked_records:
+        return []
     
-    # 점수 없이 공고만 반환
-    reranked_jobs = [job for job, _, _ in jobs_with_distance]
+    # 후보 × 특징 행렬과 가중치 벡터의 곱 한 번으로 전체 점수 계산
+    features = build_feature_matrix(resume, slots, ranked_records, all_jobs)
+    weights = _weight_vector(feature_weights)
+    scores = features @ weights
+    contributions = features * weights  # 점수 설명용 특징별 기여도
     
-    return reranked_jobs
-
+    # 점수 내림차순 (같으면 retriever 순서 유지)
+    order = np.argsort(-scores, kind="stable")
+    
+    reranked = []
+    for row in order:
+        record = ranked_records[row]
+        record["rank_score"] = round(float(scores[row]), 4)
+        # 점수 설명: 0이 아닌 특징 기여도만 포함
+        record["score_breakdown"] = {
+            name: round(float(contributions[row, col]), 4)
+            for col, name in enumerate(RERANK_FEATURES)
+            if contributions[row, col] != 0.0
+        }
+        reranked.append(record)
+    
+    return reranked
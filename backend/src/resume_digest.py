@@ -0,0 +1,78 @@
+"""
+이력서 요약(digest) 모듈
+이력서 업로드 시 한 번 만들어 세션 이력서에 저장하고, 모든 프롬프트가 같은 블록을 재사용
+(필드 순서 고정, 전체 길이 제한 - 같은 세션의 프롬프트 앞부분이 바이트 단위로 같아짐)
+"""
+from typing import Dict, List
+
+# 이력서 요약 최대 글자 수 (한글 기준 약 400토큰)
+RESUME_DIGEST_MAX_CHARS = 800
+
+# 필드별 최대 항목 수와 항목당 최대 글자 수
+RESUME_DIGEST_MAX_SKILLS = 15
+RESUME_DIGEST_MAX_ENTRIES = 3
+RESUME_DIGEST_ENTRY_CHARS = 120
+
+
+def _clip(text: str, limit: int) -> str:
+    text = " ".join(str(text or "").split())
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+def _entries(value) -> List[str]:
+    """학력/경력 목록(문자열 또는 딕셔너리 리스트)을 한 줄 항목으로 변환"""
+    if not value:
+        return []
+    if not isinstance(value, list):
+        value = [value]
+    entries = []
+    for item in value[:RESUME_DIGEST_MAX_ENTRIES]:
+        if isinstance(item, dict):
+            item = " / ".join(str(v) for v in item.values() if v)
+        entry = _clip(item, RESUME_DIGEST_ENTRY_CHARS)
+        if entry:
+            entries.append(entry)
+    return entries
+
+
+def build_resume_digest(resume: Dict) -> str:
+    """프롬프트용 이력서 요약 블록 생성
+
+    필드 순서: 이름 → 경력 연수 → 기술 스택 → 학력 → 경력 사항 → 요약
+    연락처(이메일, 전화번호)는 포함하지 않으며, 요약은 남은 길이만큼만 넣습니다.
+    """
+    lines = [f"이름: {_clip(resume.get('name', '') or 'N/A', 40)}"]
+    if resume.get('experience_years'):
+        lines.append(f"경력: {resume.get('experience_years')}년")
+    skills = [str(s) for s in (resume.get('skills') or [])][:RESUME_DIGEST_MAX_SKILLS]
+    if skills:
+        lines.append(f"기술 스택: {', '.join(skills)}")
+    education = _entries(resume.get('education'))
+    if education:
+        lines.append(f"학력: {'; '.join(education)}")
+    experience = _entries(resume.get('experience'))
+    if experience:
+        lines.append(f"경력 사항: {'; '.join(experience)}")
+
+    digest = "\n".join(lines)
+    if len(digest) > RESUME_DIGEST_MAX_CHARS:
+        return digest[:RESUME_DIGEST_MAX_CHARS - 1] + "…"
+
+    # 휴리스틱 추출 요약에는 이력서 앞부분(연락처 포함)이 그대로 들어 있으므로 연락처 제거
+    summary = str(resume.get('summary', '') or "")
+    for contact in (resume.get('email'), resume.get('phone')):
+        if contact:
+            summary = summary.replace(str(contact), "")
+    remaining = RESUME_DIGEST_MAX_CHARS - len(digest) - len("\n요약: ")
+    summary = _clip(summary, remaining) if remaining > 20 else ""
+    if summary:
+        digest += f"\n요약: {summary}"
+    return digest
+
+
+def get_resume_digest(resume: Dict) -> str:
+    """이력서 요약 반환 (업로드 시 저장한 요약이 있으면 재사용)"""
+    digest = resume.get('digest') if resume else None
+    if isinstance(digest, str) and digest:
+        return digest
+    return build_resume_digest(resume or {})
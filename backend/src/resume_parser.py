@@ -17,7 +17,8 @@ try:
 except ImportError:
     PyPDF2 = None
 
-from .llm_clients import OPENAI_CLIENT, USE_OPENAI
+from .llm_clients import USE_OPENAI
+from .llm_gateway import openai_chat
 
 
 def extract_text_from_pdf_bytes(pdf_bytes: bytes) -> str:
@@ -75,7 +76,15 @@ def heuristic_extract_resume(text: str) -> Dict:
     }
 
 
-def openai_extract_resume(text: str) -> Dict:
+def _parse_resume_json(txt: str) -> Dict:
+    """LLM 응답에서 이력서 JSON 추출 (코드 블록 표시 제거, 객체가 아니면 ValueError)"""
+    data = json.loads(txt.replace("```json", "").replace("```", "").strip())
+    if not isinstance(data, dict):
+        raise ValueError("이력서 추출 응답이 JSON 객체가 아닙니다.")
+    return data
+
+
+async def openai_extract_resume(text: str) -> Dict:
     """OpenAI를 사용하여 이력서 정보 추출"""
     if not USE_OPENAI:
         return heuristic_extract_resume(text)
@@ -91,22 +100,19 @@ def openai_extract_resume(text: str) -> Dict:
 JSON만 출력하세요 (마크다운 없이).
 """
     
-    if hasattr(OPENAI_CLIENT, 'chat'):
-        resp = OPENAI_CLIENT.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role":"user","content":prompt}],
-            temperature=0
-        )
-        txt = resp.choices[0].message.content.strip()
-    else:
-        resp = OPENAI_CLIENT.ChatCompletion.create(
+    try:
+        txt = await openai_chat(
+            [{"role":"user","content":prompt}],
             model="gpt-4o-mini",
-            messages=[{"role":"user","content":prompt}],
-            temperature=0
+            call_site="resume.extract",
+            temperature=0,
+            cache=True,  # 같은 이력서를 다시 업로드하면 캐시된 결과 사용
+            validate=_parse_resume_json  # JSON 파싱에 성공한 응답만 캐시
         )
-        txt = resp.choices[0].message.content.strip()
-    
-    # JSON 파싱
-    txt = txt.replace("```json", "").replace("```", "").strip()
-    return json.loads(txt)
+        
+        return _parse_resume_json(txt)
+    except Exception as e:
+        # LLM 장애(서킷 열림, 제한 시간 초과 등) 또는 잘못된 JSON 응답 시 휴리스틱으로 대체
+        print(f"⚠️  이력서 LLM 추출 실패, 휴리스틱으로 대체: {e}")
+        return heuristic_extract_resume(text)
 
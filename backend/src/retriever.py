@@ -1,9 +1,11 @@
 """
 Retriever 모듈: 이력서와 챗봇 정보를 기반으로 유사 공고 추출
 """
-from typing import List, Dict
+from typing import List, Dict, Optional
 from difflib import SequenceMatcher
 
+import numpy as np
+
 
 def extract_experience_keyword(resume: Dict) -> str:
     """이력서에서 경력 정보를 추출하여 키워드 반환 (신입/경력)
@@ -240,9 +242,92 @@ def calculate_weighted_score(result: Dict, keyword_weights: Dict[str, float], qu
     return final_score, matched_keywords
 
 
-def retrieve_similar_jobs(resume: Dict, slots: Dict, top_k: int = 10) -> List[Dict]:
+def aggregate_chunk_scores(job_ids, distances, top_n: int = 3) -> tuple:
+    """chunk 단위 검색 결과를 공고 단위로 집계 (NumPy 그룹 연산)
+    
+    공고별로 벡터 점수(1 - distance / 2)가 높은 상위 top_n개 chunk의 평균을 계산합니다.
+    공고 순서는 검색 결과에 처음 등장한 순서를 따릅니다.
+    
+    Args:
+        job_ids: chunk별 공고 ID 배열
+        distances: chunk별 벡터 거리 배열
+        top_n: 공고당 평균에 사용할 chunk 개수
+    
+    Returns:
+        tuple: (unique_job_ids, avg_vector_scores, chunk_positions, chunk_counts, total_chunk_counts)
+        - chunk_positions: 공고별 상위 chunk의 원본 인덱스 배열 리스트 (점수 내림차순)
+        - chunk_counts: 평균에 사용된 chunk 개수
+        - total_chunk_counts: 검색 결과에 포함된 해당 공고의 전체 chunk 개수
+    """
+    job_ids = np.asarray(job_ids, dtype=np.int64)
+    distances = np.asarray(distances, dtype=np.float64)
+    
+    if job_ids.size == 0:
+        empty_int = np.zeros(0, dtype=np.int64)
+        return empty_int, np.zeros(0), [], empty_int, empty_int
+    
+    scores = np.maximum(0.0, 1.0 - distances / 2.0)
+    
+    # job_id 기준으로 묶고, 같은 공고 안에서는 점수 내림차순
+    # (점수가 0~1 범위이므로 job_id * 2 + (1 - score) 단일 키 정렬로 lexsort보다 빠르게 처리)
+    order = np.argsort(job_ids * 2.0 + (1.0 - scores))
+    sorted_ids = job_ids[order]
+    starts = np.flatnonzero(np.r_[True, sorted_ids[1:] != sorted_ids[:-1]])
+    total_counts = np.diff(np.r_[starts, sorted_ids.size])
+    
+    # 그룹 내 순위가 top_n 미만인 chunk만 합산
+    group_of = np.repeat(np.arange(starts.size), total_counts)
+    rank_in_group = np.arange(sorted_ids.size) - starts[group_of]
+    keep = rank_in_group < top_n
+    kept_counts = np.minimum(total_counts, top_n)
+    sums = np.bincount(group_of[keep], weights=scores[order][keep], minlength=starts.size)
+    avg_scores = sums / kept_counts
+    
+    # 검색 결과에 처음 등장한 순서로 공고 재배열 (동점 시 기존 정렬 순서 유지)
+    first_seen = np.minimum.reduceat(order, starts)
+    group_order = np.argsort(first_seen, kind="stable")
+    
+    chunk_positions = [order[starts[g]:starts[g] + kept_counts[g]] for g in group_order]
+    return (
+        sorted_ids[starts][group_order],
+        avg_scores[group_order],
+        chunk_positions,
+        kept_counts[group_order],
+        total_counts[group_order],
+    )
+
+
+def select_top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """점수 상위 k개의 인덱스를 내림차순으로 반환 (argpartition으로 전체 정렬 회피)"""
+    scores = np.asarray(scores)
+    if k <= 0 or scores.size == 0:
+        return np.zeros(0, dtype=np.int64)
+    if k < scores.size:
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(scores.size)
+    # 동점이면 인덱스가 작은(먼저 등장한) 공고 우선
+    return candidates[np.lexsort((candidates, -scores[candidates]))]
+
+
+def retrieve_similar_jobs(
+    resume: Dict,
+    slots: Dict,
+    top_k: int = 10,
+    multi_vector: bool = False,
+    resume_embedding: Optional[List[float]] = None,
+    resume_weight: float = 0.0
+) -> List[Dict]:
     """이력서와 챗봇 정보를 기반으로 유사 공고 추출 (Retriever)
     
+    Args:
+        resume: 이력서 딕셔너리
+        slots: 챗봇으로 수집한 정보
+        top_k: 반환할 공고 수
+        multi_vector: True면 키워드별 임베딩을 가중치로 융합하는 멀티 벡터 검색 사용
+        resume_embedding: 업로드 시 저장된 이력서 임베딩 (있으면 쿼리 벡터에 혼합)
+        resume_weight: 이력서 벡터 혼합 비율 (0이면 사용하지 않음)
+    
     개선사항:
     - 복합 키워드 보존 (분리하지 않음)
     - 가중치 기반 점수 계산
@@ -285,11 +370,19 @@ def retrieve_similar_jobs(resume: Dict, slots: Dict, top_k: int = 10) -> List[Di
         for keyword, weight in sorted(keyword_weights.items(), key=lambda x: x[1], reverse=True):
             print(f"   - '{keyword}': {weight}")
         
-        # 통합 검색 (한 번의 벡터 검색으로 처리, 충분히 많은 chunk 가져오기)
+        # 통합 검색 (서로 다른 공고가 top_k개 이상 나올 때까지만 검색 범위 확대)
         chunks_per_job = 3  # 각 공고에서 가져올 chunk 개수
-        search_top_k = top_k * chunks_per_job * 2  # 충분히 많은 chunk 가져오기
-        print(f"\n🔎 벡터 스토어 검색 실행 (top_k={search_top_k}, 공고당 {chunks_per_job}개 chunk)...")
-        search_results = search_vector_store(query_keywords, top_k=search_top_k)
+        search_top_k = top_k * chunks_per_job  # 첫 검색의 chunk 수
+        print(f"\n🔎 벡터 스토어 검색 실행 (top_k={search_top_k}, 최소 {top_k}개 공고, 공고당 최대 {chunks_per_job}개 chunk)...")
+        search_results = search_vector_store(
+            query_keywords,
+            top_k=search_top_k,
+            min_distinct_jobs=top_k,
+            max_chunks_per_job=chunks_per_job,
+            keyword_weights=keyword_weights if multi_vector else None,
+            resume_embedding=resume_embedding,
+            resume_weight=resume_weight
+        )
         
         print("\n📊 검색 결과:")
         print(f"   - 반환된 chunk 수: {len(search_results)}개")
@@ -300,30 +393,44 @@ def retrieve_similar_jobs(resume: Dict, slots: Dict, top_k: int = 10) -> List[Di
             print("   💡 벡터 스토어에 데이터가 있는지, 검색 키워드가 적절한지 확인하세요.")
             return []
         
-        # job_id별로 chunk 그룹핑
-        from collections import defaultdict
-        job_chunks = defaultdict(list)
-        
+        # job_id / distance 배열 구성 (chunk 단위)
+        valid_results = []
+        job_id_list = []
+        distance_list = []
         for result in search_results:
             metadata = result.get('metadata', {})
             job_id = metadata.get('job_id')
-            if job_id is not None:
-                job_chunks[job_id].append(result)
+            if job_id is None:
+                continue
+            try:
+                job_id_list.append(int(job_id))
+            except (ValueError, TypeError):
+                continue
+            distance_list.append(result.get('distance', 1.0))
+            valid_results.append(result)
+        
+        # 공고별 상위 chunk 평균 벡터 점수 (NumPy 그룹 집계)
+        unique_job_ids, avg_vector_scores, chunk_positions, chunk_counts, total_chunk_counts = \
+            aggregate_chunk_scores(job_id_list, distance_list, top_n=chunks_per_job)
         
-        print(f"✅ 초기 검색 결과: {len(search_results)}개 chunk, {len(job_chunks)}개 공고")
+        print(f"✅ 초기 검색 결과: {len(search_results)}개 chunk, {len(unique_job_ids)}개 공고")
         
         # 각 공고의 전체 텍스트(full_text)에서 키워드 매칭 확인
-        print(f"\n📊 각 공고 전체에서 키워드 매칭 확인 중... ({len(job_chunks)}개 공고)")
+        print(f"\n📊 각 공고 전체에서 키워드 매칭 확인 중... ({len(unique_job_ids)}개 공고)")
         print(f"   검색 키워드 (5개): {query_keywords}")
-        job_scores = {}  # job_id -> (최종 점수, matched_keywords, chunks)
+        num_jobs = len(unique_job_ids)
+        keyword_bonuses = np.zeros(num_jobs)
+        matched_counts = np.zeros(num_jobs, dtype=np.int64)
+        job_matched_keywords = [[] for _ in range(num_jobs)]
+        job_top_chunks = [[] for _ in range(num_jobs)]
         
-        for job_id, chunks in job_chunks.items():
+        for g in range(num_jobs):
+            job_id = int(unique_job_ids[g])
             try:
-                # 공고의 full_text 가져오기 (첫 번째 chunk의 metadata에서)
-                if not chunks:
-                    continue
+                top_chunks = [valid_results[i] for i in chunk_positions[g]]
                 
-                first_chunk_metadata = chunks[0].get('metadata', {})
+                # 공고의 full_text 가져오기 (가장 점수가 높은 chunk의 metadata에서)
+                first_chunk_metadata = top_chunks[0].get('metadata', {})
                 full_text = first_chunk_metadata.get('full_text', '')
                 
                 # full_text가 없으면 구조화된 정보로 구성
@@ -337,97 +444,64 @@ def retrieve_similar_jobs(resume: Dict, slots: Dict, top_k: int = 10) -> List[Di
                         first_chunk_metadata.get('industry', ''),
                     ]
                     metadata_text = ' '.join([str(part) for part in metadata_text_parts if part])
-                    # 모든 chunk의 document 결합
-                    all_chunk_texts = ' '.join([chunk.get('document', '') for chunk in chunks])
+                    # 상위 chunk의 document 결합
+                    all_chunk_texts = ' '.join([chunk.get('document', '') for chunk in top_chunks])
                     full_text = f"{metadata_text} {all_chunk_texts}"
                 
                 # 공고 전체 텍스트에서 키워드 매칭 확인
                 full_text_lower = full_text.lower()
                 matched_keywords = []
-                matched_count = 0
                 
                 for keyword in query_keywords:
                     keyword_lower = keyword.lower()
                     # 정확한 매칭 확인
                     if keyword_lower in full_text_lower:
                         matched_keywords.append(keyword)
-                        matched_count += 1
                     # 공백 제거 후 매칭 확인
                     elif keyword_lower.replace(' ', '') in full_text_lower.replace(' ', ''):
                         if keyword not in matched_keywords:
                             matched_keywords.append(keyword)
-                            matched_count += 1
                     # 유사 키워드 매칭 확인
                     else:
                         similar_keywords = find_similar_keywords(keyword, full_text, threshold=0.6)
                         if similar_keywords and keyword not in matched_keywords:
                             matched_keywords.append(keyword)
-                            matched_count += 1
                 
-                # 각 chunk의 점수 계산 (벡터 유사도 기반)
-                chunk_scores = []
-                for chunk in chunks:
-                    distance = chunk.get('distance', 1.0)
-                    vector_score = max(0.0, 1.0 - (distance / 2.0))
-                    chunk_scores.append({
-                        'chunk': chunk,
-                        'score': vector_score
-                    })
-                
-                # chunk들을 점수 기준으로 정렬
-                chunk_scores.sort(key=lambda x: x['score'], reverse=True)
-                
-                # 상위 N개 chunk 선택
-                top_chunks = chunk_scores[:chunks_per_job]
-                
-                # 공고의 최종 점수 = 상위 chunk들의 평균 벡터 점수 + 키워드 매칭 보너스
-                if top_chunks:
-                    avg_vector_score = sum(c['score'] for c in top_chunks) / len(top_chunks)
-                    # 키워드 매칭 보너스: 매칭된 키워드 개수에 비례
-                    keyword_bonus = sum(keyword_weights.get(kw, 1.0) * 0.1 for kw in matched_keywords)
-                    final_score = avg_vector_score + keyword_bonus
-                else:
-                    final_score = 0.0
-                
-                job_scores[job_id] = {
-                    'final_score': final_score,
-                    'matched_keywords': matched_keywords,
-                    'matched_count': matched_count,  # 매칭된 키워드 개수
-                    'total_keywords': len(query_keywords),  # 전체 키워드 개수
-                    'chunks': [c['chunk'] for c in top_chunks],
-                    'chunk_count': len(top_chunks),
-                    'total_chunks': len(chunks)
-                }
+                job_matched_keywords[g] = matched_keywords
+                matched_counts[g] = len(matched_keywords)
+                # 키워드 매칭 보너스: 매칭된 키워드 개수에 비례
+                keyword_bonuses[g] = sum(keyword_weights.get(kw, 1.0) * 0.1 for kw in matched_keywords)
+                job_top_chunks[g] = top_chunks
                 
                 # 매칭 결과 출력 (각 공고마다 몇 개의 키워드가 포함되는지)
                 matched_str = ', '.join(matched_keywords) if matched_keywords else '(없음)'
-                print(f"   공고 {job_id}: {matched_count}/{len(query_keywords)}개 키워드 매칭")
+                print(f"   공고 {job_id}: {len(matched_keywords)}/{len(query_keywords)}개 키워드 매칭")
                 print(f"      → 매칭된 키워드: {matched_str}")
                 
             except Exception as e:
                 print(f"   ⚠️  공고 {job_id} 처리 중 오류: {e}")
+                keyword_bonuses[g] = -np.inf  # 결과에서 제외
                 continue
         
-        if not job_scores:
+        if num_jobs == 0 or not any(job_top_chunks):
             print("❌ 점수 계산 후 결과가 없습니다.")
             return []
         
-        # 최종 점수 기준으로 정렬
-        sorted_jobs = sorted(job_scores.items(), key=lambda x: x[1]['final_score'], reverse=True)
+        # 공고의 최종 점수 = 상위 chunk들의 평균 벡터 점수 + 키워드 매칭 보너스
+        final_scores = avg_vector_scores + keyword_bonuses
+        total_keywords = len(query_keywords)
+        
+        # 최종 점수 기준 상위 top_k (argpartition으로 전체 정렬 없이 선택)
+        top_positions = select_top_k(final_scores, top_k)
         
         # 상위 결과 출력 (매칭 개수 기준으로도 정렬 가능)
-        print(f"\n📈 상위 {min(5, len(sorted_jobs))}개 공고 (점수 기준):")
+        print(f"\n📈 상위 {min(5, len(top_positions))}개 공고 (점수 기준):")
         print("=" * 80)
-        for i, (job_id, job_data) in enumerate(sorted_jobs[:5], 1):
-            final_score = job_data['final_score']
-            matched = job_data['matched_keywords']
-            matched_count = job_data['matched_count']
-            total_keywords = job_data['total_keywords']
-            chunk_count = job_data['chunk_count']
-            
-            print(f"{i}. 공고 ID: {job_id}")
-            print(f"   최종 점수: {final_score:.3f} (상위 {chunk_count}개 chunk 평균)")
-            print(f"   키워드 매칭: {matched_count}/{total_keywords}개")
+        for i, g in enumerate(top_positions[:5], 1):
+            matched = job_matched_keywords[g]
+            print(f"{i}. 공고 ID: {int(unique_job_ids[g])}")
+            print(f"   최종 점수: {final_scores[g]:.3f} (상위 {int(chunk_counts[g])}개 chunk 평균)")
+            print(f"   키워드 매칭: {int(matched_counts[g])}/{total_keywords}개")
             if matched:
                 print(f"   매칭된 키워드: {', '.join(matched)}")
             else:
@@ -435,55 +509,48 @@ def retrieve_similar_jobs(resume: Dict, slots: Dict, top_k: int = 10) -> List[Di
             print()
         print("=" * 80)
         
-        # 매칭 개수 기준 정렬 (비교용) - 공고마다 몇 개의 키워드가 포함되는지 비교
-        sorted_by_match = sorted(job_scores.items(), key=lambda x: (x[1]['matched_count'], x[1]['final_score']), reverse=True)
-        print(f"\n📊 매칭 개수 기준 상위 {min(5, len(sorted_by_match))}개 공고 (키워드 포함 개수 비교):")
+        # 매칭 개수 기준 상위 5개 (비교용) - 공고마다 몇 개의 키워드가 포함되는지 비교
+        by_match = np.lexsort((-final_scores, -matched_counts))[:5]
+        print(f"\n📊 매칭 개수 기준 상위 {len(by_match)}개 공고 (키워드 포함 개수 비교):")
         print("=" * 80)
-        for i, (job_id, job_data) in enumerate(sorted_by_match[:5], 1):
-            matched_count = job_data['matched_count']
-            total_keywords = job_data['total_keywords']
-            matched = job_data['matched_keywords']
-            final_score = job_data['final_score']
-            
-            print(f"{i}. 공고 ID: {job_id}")
-            print(f"   키워드 매칭: {matched_count}/{total_keywords}개 포함")
+        for i, g in enumerate(by_match, 1):
+            matched = job_matched_keywords[g]
+            print(f"{i}. 공고 ID: {int(unique_job_ids[g])}")
+            print(f"   키워드 매칭: {int(matched_counts[g])}/{total_keywords}개 포함")
             if matched:
                 print(f"   매칭된 키워드: {', '.join(matched)}")
             else:
                 print("   매칭된 키워드: (없음)")
-            print(f"   최종 점수: {final_score:.3f}")
+            print(f"   최종 점수: {final_scores[g]:.3f}")
             print()
         print("=" * 80)
         
         # 전체 공고별 매칭 개수 요약
         print("\n📋 전체 공고별 키워드 매칭 요약:")
         print("=" * 80)
-        match_count_distribution = {}
-        for job_id, job_data in job_scores.items():
-            count = job_data['matched_count']
-            match_count_distribution[count] = match_count_distribution.get(count, 0) + 1
-        
-        for count in sorted(match_count_distribution.keys(), reverse=True):
-            job_num = match_count_distribution[count]
-            print(f"   {count}/{total_keywords}개 매칭: {job_num}개 공고")
+        match_count_distribution = np.bincount(matched_counts, minlength=total_keywords + 1)
+        for count in range(len(match_count_distribution) - 1, -1, -1):
+            job_num = int(match_count_distribution[count])
+            if job_num:
+                print(f"   {count}/{total_keywords}개 매칭: {job_num}개 공고")
         print("=" * 80)
         
         # 상위 top_k개 공고 반환 (각 공고의 상위 chunk들 포함)
         final_results = []
-        for job_id, job_data in sorted_jobs[:top_k]:
+        for g in top_positions:
             # 대표 chunk 선택 (가장 점수가 높은 chunk)
-            if job_data['chunks']:
-                representative_chunk = job_data['chunks'][0].copy()
+            if job_top_chunks[g]:
+                representative_chunk = job_top_chunks[g][0].copy()
                 # 메타데이터에 통합 정보 추가
-                representative_chunk['metadata']['final_score'] = job_data['final_score']
-                representative_chunk['metadata']['matched_keywords'] = job_data['matched_keywords']
-                representative_chunk['metadata']['match_count'] = job_data['matched_count']  # 매칭된 키워드 개수
-                representative_chunk['metadata']['total_keywords'] = job_data['total_keywords']  # 전체 키워드 개수
-                representative_chunk['metadata']['chunk_count'] = job_data['chunk_count']
-                representative_chunk['metadata']['total_chunks'] = job_data['total_chunks']
+                representative_chunk['metadata']['final_score'] = float(final_scores[g])
+                representative_chunk['metadata']['matched_keywords'] = job_matched_keywords[g]
+                representative_chunk['metadata']['match_count'] = int(matched_counts[g])  # 매칭된 키워드 개수
+                representative_chunk['metadata']['total_keywords'] = total_keywords  # 전체 키워드 개수
+                representative_chunk['metadata']['chunk_count'] = int(chunk_counts[g])
+                representative_chunk['metadata']['total_chunks'] = int(total_chunk_counts[g])
                 final_results.append(representative_chunk)
         
-        print(f"\n✅ Retriever 완료: {len(final_results)}개 공고 반환 (각 공고당 평균 {sum(job_scores[jid]['chunk_count'] for jid, _ in sorted_jobs[:top_k]) / len(final_results) if final_results else 0:.1f}개 chunk)")
+        print(f"\n✅ Retriever 완료: {len(final_results)}개 공고 반환 (각 공고당 평균 {float(np.mean(chunk_counts[top_positions])) if final_results else 0:.1f}개 chunk)")
         print("="*80 + "\n")
         return final_results
         
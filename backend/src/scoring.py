@@ -1,9 +1,57 @@
 """
 채용공고 매칭 점수 계산 모듈
 """
-from typing import Dict
+import asyncio
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
 from .config import SCORE_WEIGHTS
-from .llm_clients import OPENAI_CLIENT, USE_OPENAI
+from .job_digest import get_job_digest
+from .llm_clients import USE_OPENAI
+from .llm_gateway import openai_chat
+from .llm_scheduler import PRIORITY_BATCH
+from . import vector_store
+
+# 항목 순서 (임베딩 행렬의 열 순서)
+MATCH_CATEGORIES = list(SCORE_WEIGHTS.keys())
+
+# 사용자 쪽 텍스트가 비어 있는 항목의 점수 (정보가 없으면 가점/감점 없이 중립)
+NEUTRAL_CATEGORY_SCORE = 0.5
+
+# 공고별 항목 임베딩 캐시 최대 공고 수
+JOB_FIELD_CACHE_SIZE = 4096
+# 사용자 쪽 항목 임베딩 캐시 최대 프로필 수 (같은 검색의 다음 페이지/재검색은 다시 인코딩하지 않음)
+USER_FIELD_CACHE_SIZE = 256
+
+# 항목별 LLM 평가 기준 이름
+CATEGORY_LABELS = {
+    'job_title': '직무 일치도',
+    'skills': '스킬 일치도',
+    'mandatory': '필수 요건 충족도',
+    'preferred': '우대사항 충족도',
+    'tasks': '업무 내용 일치도',
+    'domain': '도메인 일치도',
+    'work_condition': '근무 조건 일치도',
+}
+
+# LLM 일괄 평가: 한 번의 호출에 포함할 공고 수, 공고 필드 요약 최대 길이
+LLM_SCORE_BATCH_SIZE = 10
+LLM_FIELD_DIGEST_CHARS = 300
+
+# (프로필 해시, 공고) 단위 LLM 점수 캐시 최대 항목 수
+LLM_SCORE_CACHE_SIZE = 4096
+
+_JOB_FIELD_EMBEDDINGS: "OrderedDict[str, np.ndarray]" = OrderedDict()
+_JOB_FIELD_LOCK = threading.Lock()
+_USER_FIELD_EMBEDDINGS: "OrderedDict[str, np.ndarray]" = OrderedDict()
+_USER_FIELD_LOCK = threading.Lock()
+_LLM_SCORE_CACHE: "OrderedDict[tuple, List[float]]" = OrderedDict()
+_LLM_SCORE_LOCK = threading.Lock()
 
 
 def normalize_employment_type(text: str) -> str:
@@ -31,8 +79,345 @@ def llm_score(user_text: str, job_text: str, category: str, max_score: float = 1
     return round(max_score * (0.6 + (hash(user_text + job_text + category) % 40) / 100), 2)
 
 
+def _job_category_texts(job: Dict) -> Dict[str, str]:
+    """공고에서 항목별 비교 대상 텍스트 추출"""
+    full_content = job.get('full_content', {}) or {}
+    job_title = job.get('title', '')
+    job_description = job.get('description', '')
+    job_tasks = full_content.get('work', '') or job.get('tasks', '')
+    requirements_text = full_content.get('requirements', '') or ' '.join(job.get('requirements', []))
+    preferences_text = ' '.join(job.get('preferences', []))
+    preferred_text = preferences_text or requirements_text
+    return {
+        'job_title': job_title + ' ' + job_description,
+        'skills': requirements_text + ' ' + preferred_text,
+        'mandatory': requirements_text,
+        'preferred': preferred_text,
+        'tasks': job_tasks,
+        'domain': job_title + ' ' + job_tasks,
+        'work_condition': full_content.get('conditions', '') or job.get('location', ''),
+    }
+
+
+def _user_category_texts(user_answers: Dict, resume: Dict) -> Dict[str, str]:
+    """사용자 답변/이력서에서 항목별 비교 텍스트 추출 (챗봇 슬롯도 그대로 사용 가능)"""
+    user_answers = user_answers or {}
+    resume = resume or {}
+    user_job = user_answers.get('desired_job', '') or user_answers.get('current_job', '')
+    user_skills = user_answers.get('core_skill', '') or ', '.join(resume.get('skills', []))
+    user_achievement = user_answers.get('key_achievement', '') or resume.get('summary', '')
+    user_domain = user_answers.get('domain_experience', '') or user_answers.get('industry', '')
+    user_work = user_answers.get('work_condition', '') or ' '.join(
+        v for v in (user_answers.get('location', ''), user_answers.get('job_type', '')) if v
+    )
+    return {
+        'job_title': user_job,
+        'skills': user_skills,
+        'mandatory': user_achievement,
+        'preferred': user_achievement,
+        'tasks': user_achievement,
+        'domain': user_domain,
+        'work_condition': user_work,
+    }
+
+
+def _encode_texts(texts: List[str]) -> np.ndarray:
+    """텍스트 목록을 정규화된 임베딩 행렬로 변환 (빈 텍스트는 0 벡터, 중복은 한 번만 인코딩)"""
+    model = vector_store.EMBEDDING_MODEL
+    unique_texts = list(dict.fromkeys(t for t in texts if t.strip()))
+    dim = model.get_sentence_embedding_dimension()
+    encoded = {}
+    if unique_texts:
+        vectors = model.encode(unique_texts, normalize_embeddings=True, show_progress_bar=False)
+        encoded = dict(zip(unique_texts, np.asarray(vectors, dtype=np.float32)))
+    zero = np.zeros(dim, dtype=np.float32)
+    return np.stack([encoded.get(t, zero) for t in texts])
+
+
+def _job_cache_key(texts: Dict[str, str]) -> str:
+    """항목 텍스트 기반 캐시 키 (공고/사용자 내용이 바뀌면 키도 바뀜)"""
+    raw = "\x00".join(texts[c] for c in MATCH_CATEGORIES)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _job_field_matrix(jobs: List[Dict]) -> np.ndarray:
+    """공고별 항목 임베딩 행렬 (공고 수, 항목 수, 차원) - 캐시에 없는 공고만 한 번의 배치로 인코딩"""
+    job_texts = [_job_category_texts(job) for job in jobs]
+    keys = [_job_cache_key(texts) for texts in job_texts]
+    with _JOB_FIELD_LOCK:
+        found = {}
+        for key in keys:
+            if key in _JOB_FIELD_EMBEDDINGS:
+                _JOB_FIELD_EMBEDDINGS.move_to_end(key)
+                found[key] = _JOB_FIELD_EMBEDDINGS[key]
+    missing = [i for i, key in enumerate(keys) if key not in found]
+
+    if missing:
+        flat_texts = [job_texts[i][c] for i in missing for c in MATCH_CATEGORIES]
+        matrix = _encode_texts(flat_texts).reshape(len(missing), len(MATCH_CATEGORIES), -1)
+        with _JOB_FIELD_LOCK:
+            for row, i in enumerate(missing):
+                found[keys[i]] = matrix[row]
+                _JOB_FIELD_EMBEDDINGS[keys[i]] = matrix[row]
+            while len(_JOB_FIELD_EMBEDDINGS) > JOB_FIELD_CACHE_SIZE:
+                _JOB_FIELD_EMBEDDINGS.popitem(last=False)
+
+    return np.stack([found[key] for key in keys])
+
+
+def _user_field_matrix(user_texts: Dict[str, str]) -> np.ndarray:
+    """사용자 쪽 항목 임베딩 행렬 (항목 수, 차원) - 항목 텍스트가 같으면 캐시된 행렬 재사용"""
+    key = _job_cache_key(user_texts)
+    with _USER_FIELD_LOCK:
+        if key in _USER_FIELD_EMBEDDINGS:
+            _USER_FIELD_EMBEDDINGS.move_to_end(key)
+            return _USER_FIELD_EMBEDDINGS[key]
+
+    matrix = _encode_texts([user_texts[c] for c in MATCH_CATEGORIES])
+    with _USER_FIELD_LOCK:
+        _USER_FIELD_EMBEDDINGS[key] = matrix
+        while len(_USER_FIELD_EMBEDDINGS) > USER_FIELD_CACHE_SIZE:
+            _USER_FIELD_EMBEDDINGS.popitem(last=False)
+    return matrix
+
+
+def precompute_job_field_embeddings(jobs: List[Dict]) -> bool:
+    """공고별 항목 임베딩을 미리 계산하여 캐시 (서버 시작/벡터 스토어 초기화 시 호출)"""
+    if vector_store.EMBEDDING_MODEL is None or not jobs:
+        return False
+    _job_field_matrix(jobs)
+    print(f"✅ 매칭 점수용 공고 항목 임베딩 캐시 완료 ({len(jobs)}개 공고)")
+    return True
+
+
+def calculate_match_scores(jobs: List[Dict], user_answers: Dict, resume: Dict) -> Optional[List[Dict]]:
+    """여러 공고의 매칭 점수를 로컬 임베딩으로 한 번에 계산
+
+    사용자 쪽 항목 임베딩은 항목 텍스트별로, 공고 쪽 항목 임베딩은 공고별로 캐시합니다.
+    (공고 수 × 항목 수) 코사인 유사도를 한 번의 행렬 연산으로 구한 뒤 SCORE_WEIGHTS를 적용합니다.
+
+    Returns:
+        List[Dict]: 공고별 {"total_score", "score_details"} (임베딩 모델이 없으면 None)
+    """
+    if vector_store.EMBEDDING_MODEL is None:
+        return None
+    if not jobs:
+        return []
+
+    job_matrix = _job_field_matrix(jobs)  # (공고 수, 항목 수, 차원)
+
+    user_texts = _user_category_texts(user_answers, resume)
+    user_matrix = _user_field_matrix(user_texts)  # (항목 수, 차원)
+
+    similarities = np.clip(np.einsum('ncd,cd->nc', job_matrix, user_matrix), 0.0, 1.0)
+    user_empty = np.array([not user_texts[c].strip() for c in MATCH_CATEGORIES])
+    similarities[:, user_empty] = NEUTRAL_CATEGORY_SCORE
+
+    return _apply_score_weights(similarities)
+
+
+def _apply_score_weights(category_scores: np.ndarray) -> List[Dict]:
+    """(공고 수, 항목 수) 항목 점수(0~1)에 SCORE_WEIGHTS를 적용하여 공고별 결과 생성"""
+    weights = np.array([SCORE_WEIGHTS[c] for c in MATCH_CATEGORIES], dtype=np.float64)
+    weighted = category_scores * weights * 100
+    totals = weighted.sum(axis=1)
+
+    return [
+        {
+            "total_score": round(float(totals[n]) / 100, 2),
+            "score_details": {c: float(weighted[n, j]) for j, c in enumerate(MATCH_CATEGORIES)}
+        }
+        for n in range(category_scores.shape[0])
+    ]
+
+
+def _truncate(text: str, limit: int = LLM_FIELD_DIGEST_CHARS) -> str:
+    """공백을 정리하고 최대 길이로 자르기"""
+    text = " ".join(str(text or "").split())
+    return text if len(text) <= limit else text[:limit] + "…"
+
+
+def _job_digest(job: Dict) -> Dict[str, str]:
+    """LLM 평가용 공고 필드 요약 (항목 평가에 필요한 필드만, 필드별 길이 제한)"""
+    job_digest = get_job_digest(job)
+    digest = {
+        "title": _truncate(job.get('title', ''), 100),
+        "tasks": _truncate("; ".join(job_digest["duties"]) or job.get('tasks', '')),
+        "requirements": _truncate("; ".join(job_digest["must_haves"])),
+        "preferences": _truncate("; ".join(job_digest["nice_to_haves"])),
+        "conditions": _truncate("; ".join(job_digest["conditions"]) or job.get('location', '')),
+    }
+    return {k: v for k, v in digest.items() if v}
+
+
+def _profile_hash(user_texts: Dict[str, str]) -> str:
+    """사용자 프로필(항목별 텍스트) 해시"""
+    raw = json.dumps(user_texts, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _job_identity(job: Dict, digest: Dict[str, str]) -> str:
+    """공고 캐시 식별자 (공고 ID + 요약 내용 해시, 공고 내용이 바뀌면 다시 평가)"""
+    raw = json.dumps(digest, ensure_ascii=False, sort_keys=True)
+    return f"{job.get('id', '')}:{hashlib.sha1(raw.encode('utf-8')).hexdigest()[:16]}"
+
+
+def _parse_llm_scores(content: str, expected_keys: List[str]) -> Dict[str, List[float]]:
+    """LLM 응답 JSON 검증 - 모든 항목 점수가 숫자인 공고만 반환 (0~1로 보정)"""
+    try:
+        data = json.loads(content)
+    except json.JSONDecodeError:
+        print(f"⚠️  매칭 점수 JSON 파싱 실패: {content[:100]}")
+        return {}
+
+    jobs = data.get("jobs") if isinstance(data, dict) else None
+    if not isinstance(jobs, dict):
+        return {}
+
+    parsed = {}
+    for key in expected_keys:
+        entry = jobs.get(key)
+        if not isinstance(entry, dict):
+            continue
+        values = []
+        for category in MATCH_CATEGORIES:
+            value = entry.get(category)
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                break
+            values.append(min(1.0, max(0.0, float(value))))
+        else:
+            parsed[key] = values
+    return parsed
+
+
+async def _llm_score_batch(user_texts: Dict[str, str], digests: Dict[str, Dict[str, str]]) -> Dict[str, List[float]]:
+    """사용자 프로필 1회 + 여러 공고 요약으로 모든 항목 점수를 한 번의 호출로 요청"""
+    criteria = "\n".join(f"- {c}: {CATEGORY_LABELS[c]}" for c in MATCH_CATEGORIES)
+    profile = "\n".join(
+        f"- {CATEGORY_LABELS[c]}: {_truncate(user_texts[c]) or '정보 없음'}" for c in MATCH_CATEGORIES
+    )
+    example = json.dumps({c: 0.0 for c in MATCH_CATEGORIES})
+    prompt = f"""
+지원자 프로필과 각 채용공고를 비교하여 항목별 적합도를 0.00~1.00 사이 점수로 평가해주세요.
+
+평가 항목:
+{criteria}
+
+지원자 프로필 (항목별 비교 기준):
+{profile}
+
+채용공고 목록 (키: 공고 ID):
+{json.dumps(digests, ensure_ascii=False)}
+
+요구사항:
+- 지원자 정보가 '정보 없음'인 항목은 0.50으로 평가
+- 모든 공고에 대해 모든 항목을 평가
+
+반드시 다음 JSON 형식으로 반환해주세요:
+{{"jobs": {{"<공고 ID>": {example}}}}}
+"""
+
+    try:
+        content = await openai_chat(
+            [
+                {"role": "system", "content": "당신은 채용 매칭 평가자입니다. 지원자와 채용공고의 항목별 적합도를 객관적으로 평가합니다. 반드시 JSON 형식으로 응답합니다."},
+                {"role": "user", "content": prompt}
+            ],
+            model="gpt-4o-mini",
+            priority=PRIORITY_BATCH,
+            call_site="scoring.batch",
+            hedge=False,  # 여러 공고를 한 번에 평가하는 긴 호출이라 hedging 제외
+            temperature=0,
+            response_format={"type": "json_object"},
+            cache=True,
+            validate=lambda text: isinstance(json.loads(text).get("jobs"), dict)  # 형식이 맞는 응답만 캐시
+        )
+    except Exception as e:
+        print(f"❌ 매칭 점수 일괄 평가 중 오류: {e}")
+        return {}
+
+    return _parse_llm_scores(content, list(digests.keys()))
+
+
+async def llm_match_scores(
+    jobs: List[Dict],
+    user_answers: Dict,
+    resume: Dict,
+    batch_size: int = LLM_SCORE_BATCH_SIZE
+) -> List[Dict]:
+    """여러 공고의 매칭 점수를 LLM 일괄 평가로 계산
+
+    사용자 프로필은 호출마다 한 번만, 공고는 필드 요약만 보내고 7개 항목 점수를
+    하나의 JSON으로 받습니다 (공고 batch_size개당 1회 호출, 여러 번이면 동시에 호출).
+    결과는 (프로필 해시, 공고) 단위로 캐시하며, 평가에 실패한 공고는 calculate_match_score()로 계산합니다.
+
+    Returns:
+        List[Dict]: 공고별 {"total_score", "score_details"}
+    """
+    if not jobs:
+        return []
+    if not USE_OPENAI:
+        return [calculate_match_score(job, user_answers, resume) for job in jobs]
+
+    user_texts = _user_category_texts(user_answers, resume)
+    profile_hash = _profile_hash(user_texts)
+
+    digests = [_job_digest(job) for job in jobs]
+    identities = [_job_identity(job, digest) for job, digest in zip(jobs, digests)]
+    category_scores: List[Optional[List[float]]] = [None] * len(jobs)
+
+    with _LLM_SCORE_LOCK:
+        for i, identity in enumerate(identities):
+            cached = _LLM_SCORE_CACHE.get((profile_hash, identity))
+            if cached is not None:
+                _LLM_SCORE_CACHE.move_to_end((profile_hash, identity))
+                category_scores[i] = cached
+
+    # 캐시에 없는 공고만 (중복 제거 후) batch_size개씩 나누어 동시에 평가
+    pending = list(dict.fromkeys(identities[i] for i in range(len(jobs)) if category_scores[i] is None))
+    digest_of = dict(zip(identities, digests))
+    step = max(1, batch_size)
+    # 응답 키는 짧은 번호로 받아 토큰 절약
+    batches = [
+        {str(n + 1): identity for n, identity in enumerate(pending[start:start + step])}
+        for start in range(0, len(pending), step)
+    ]
+    batch_results = await asyncio.gather(*[
+        _llm_score_batch(user_texts, {key: digest_of[identity] for key, identity in batch_keys.items()})
+        for batch_keys in batches
+    ])
+
+    scored_by_identity = {}
+    for batch_keys, results in zip(batches, batch_results):
+        scored_by_identity.update({batch_keys[key]: values for key, values in results.items()})
+    with _LLM_SCORE_LOCK:
+        for identity, values in scored_by_identity.items():
+            _LLM_SCORE_CACHE[(profile_hash, identity)] = values
+        while len(_LLM_SCORE_CACHE) > LLM_SCORE_CACHE_SIZE:
+            _LLM_SCORE_CACHE.popitem(last=False)
+    for i, identity in enumerate(identities):
+        if identity in scored_by_identity:
+            category_scores[i] = scored_by_identity[identity]
+
+    failed = [i for i, values in enumerate(category_scores) if values is None]
+    if failed:
+        print(f"⚠️  {len(failed)}개 공고의 LLM 평가 실패, 로컬 점수로 대체")
+
+    scored = _apply_score_weights(
+        np.array([values if values is not None else [0.0] * len(MATCH_CATEGORIES) for values in category_scores])
+    )
+    for i in failed:
+        scored[i] = calculate_match_score(jobs[i], user_answers, resume)
+    return scored
+
+
 def calculate_match_score(job: Dict, user_answers: Dict, resume: Dict) -> Dict:
     """사용자의 답변과 공고를 비교하여 매칭 점수 및 상세 점수를 계산합니다."""
+    # 임베딩 모델이 로드되어 있으면 로컬 임베딩 유사도로 계산
+    local_scores = calculate_match_scores([job], user_answers, resume)
+    if local_scores:
+        return local_scores[0]
+    
     scores = {}
     
     # 1. 데이터 준비
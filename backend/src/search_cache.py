@@ -0,0 +1,105 @@
+"""
+검색 결과 캐시 모듈
+동일한 이력서/챗봇 정보로 반복되는 검색의 Retriever + Reranker 결과 재사용
+(순위 목록만 저장하고 페이지 단위로 잘라 반환, 커서로 다음 페이지 조회)
+"""
+import base64
+import binascii
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from .retriever import build_weighted_query
+from .vector_store import get_index_version
+
+# 캐시 최대 항목 수 (초과 시 가장 오래 사용되지 않은 항목부터 제거)
+SEARCH_CACHE_MAX_SIZE = 256
+
+_SEARCH_CACHE: "OrderedDict[str, List[Dict]]" = OrderedDict()
+_CACHE_INDEX_VERSION = None
+_CACHE_LOCK = threading.Lock()
+
+
+def make_search_fingerprint(resume: Dict, slots: Dict, top_k: int = 10, options: Optional[Dict] = None) -> str:
+    """검색 결과를 결정하는 입력값으로 캐시 키 생성
+
+    build_weighted_query()의 결과(정규화된 슬롯 + 이력서 경력 키워드)만 사용하므로,
+    검색 결과에 영향을 주지 않는 이력서 필드 변경은 캐시 키를 바꾸지 않습니다.
+    options에는 검색 모드처럼 결과를 바꾸는 그 밖의 값(JSON 직렬화 가능)을 넣습니다.
+    """
+    query_keywords, keyword_weights = build_weighted_query(resume, slots)
+    payload = {
+        "keywords": query_keywords,
+        "weights": keyword_weights,
+        "top_k": top_k,
+        "options": options or {},
+    }
+    raw = json.dumps(payload, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def encode_search_cursor(fingerprint: str, offset: int) -> str:
+    """다음 페이지 조회용 불투명(opaque) 커서 생성"""
+    raw = json.dumps({"fp": fingerprint, "offset": offset}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_search_cursor(cursor: str) -> Optional[Tuple[str, int]]:
+    """커서를 (fingerprint, offset)으로 해석 (형식이 잘못되었으면 None)"""
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8"))
+        fingerprint = data["fp"]
+        offset = int(data["offset"])
+    except (binascii.Error, UnicodeError, ValueError, KeyError, TypeError):
+        return None
+    if not isinstance(fingerprint, str) or offset < 0:
+        return None
+    return fingerprint, offset
+
+
+def _sync_index_version():
+    """인덱스가 재구성되었으면 캐시 전체 무효화 (_CACHE_LOCK 안에서 호출)"""
+    global _CACHE_INDEX_VERSION
+
+    current_version = get_index_version()
+    if _CACHE_INDEX_VERSION != current_version:
+        if _SEARCH_CACHE:
+            print(f"🔄 인덱스 버전 변경({_CACHE_INDEX_VERSION} → {current_version}), 검색 캐시 초기화")
+        _SEARCH_CACHE.clear()
+        _CACHE_INDEX_VERSION = current_version
+
+
+def get_cached_search(fingerprint: str) -> Optional[List[Dict]]:
+    """캐시된 순위 목록 반환 (없으면 None)"""
+    with _CACHE_LOCK:
+        _sync_index_version()
+        cached = _SEARCH_CACHE.get(fingerprint)
+        if cached is not None:
+            _SEARCH_CACHE.move_to_end(fingerprint)
+        return cached
+
+
+def store_search_result(fingerprint: str, ranked_jobs: List[Dict], index_version: int):
+    """재순위화된 순위 목록을 캐시에 저장
+
+    Args:
+        fingerprint: make_search_fingerprint()로 만든 캐시 키
+        ranked_jobs: 순위대로 정렬된 공고 레코드 (job_id + 매칭 정보, 본문은 카탈로그에서 조회)
+        index_version: 검색을 시작할 때의 인덱스 버전 (검색 도중 재구성되었으면 저장하지 않음)
+    """
+    with _CACHE_LOCK:
+        _sync_index_version()
+        if index_version != _CACHE_INDEX_VERSION:
+            return
+        _SEARCH_CACHE[fingerprint] = ranked_jobs
+        _SEARCH_CACHE.move_to_end(fingerprint)
+        while len(_SEARCH_CACHE) > SEARCH_CACHE_MAX_SIZE:
+            _SEARCH_CACHE.popitem(last=False)
+
+
+def clear_search_cache():
+    """검색 캐시 전체 삭제"""
+    with _CACHE_LOCK:
+        _SEARCH_CACHE.clear()
@@ -2,9 +2,12 @@
 벡터 스토어 관리 모듈
 ChromaDB 벡터 스토어 초기화 및 관리
 """
+from collections import OrderedDict
 from pathlib import Path
 from typing import List, Dict, Optional
 
+import numpy as np
+
 # 지연 로딩을 위해 모듈 레벨에서는 import하지 않음
 CHROMADB_AVAILABLE = None
 chromadb = None
@@ -14,6 +17,13 @@ VECTOR_STORE = None
 EMBEDDING_MODEL = None
 _INITIALIZED = False
 
+# 채용공고 인덱스 버전 (재구성될 때마다 증가, 검색 결과 캐시 무효화에 사용)
+INDEX_VERSION = 0
+
+# 검색 쿼리 임베딩 캐시 (같은 슬롯 키워드는 모델 추론 없이 재사용)
+QUERY_EMBEDDING_CACHE_SIZE = 512
+_QUERY_EMBEDDING_CACHE: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
 
 def _check_dependencies():
     """의존성 확인 및 지연 로딩"""
@@ -34,6 +44,17 @@ def _check_dependencies():
         return False
 
 
+def get_index_version() -> int:
+    """현재 채용공고 인덱스 버전 반환"""
+    return INDEX_VERSION
+
+
+def _bump_index_version():
+    """채용공고 인덱스가 바뀌었음을 기록"""
+    global INDEX_VERSION
+    INDEX_VERSION += 1
+
+
 def initialize_vector_store_components(force_reload: bool = False):
     """벡터 스토어 및 임베딩 모델 초기화"""
     global VECTOR_STORE, EMBEDDING_MODEL, _INITIALIZED
@@ -69,6 +90,7 @@ def initialize_vector_store_components(force_reload: bool = False):
             name="saramin_jobs",
             metadata={"hnsw:space": "cosine"}
         )
+        _bump_index_version()
         print("✅ ChromaDB 벡터 스토어 초기화 완료")
         
         # 초기화 상태 확인
@@ -295,6 +317,7 @@ def initialize_vector_store(
         metadatas=metadatas,
         ids=ids
     )
+    _bump_index_version()
     
     print(f"✅ 벡터 스토어에 {len(documents)}개의 청크를 저장했습니다. (원본 공고: {len(jobs)}개)")
     return True
@@ -340,8 +363,146 @@ def add_resume_to_vector_store(resume: Dict, session_id: str) -> bool:
     return True
 
 
-def search_vector_store(keywords: List[str], top_k: int = 10) -> List[Dict]:
-    """벡터 스토어에서 키워드로 검색"""
+def _fuse_multi_query_results(results: Dict, weights: List[float]) -> Dict:
+    """여러 쿼리 벡터의 검색 결과를 키워드 가중치로 융합하여 단일 쿼리 결과 형태로 반환
+    
+    chunk의 융합 거리 = 쿼리별 거리의 가중 평균.
+    어떤 쿼리의 결과에 없는 chunk는 그 쿼리에서 가장 먼 결과의 거리를 사용합니다 (반환된 이웃보다 가깝지 않으므로).
+    """
+    ids_per_query = results.get('ids') or []
+    if not ids_per_query:
+        return results
+    
+    total_weight = sum(weights) or 1.0
+    fallback_distances = []
+    distance_maps = []
+    rows = {}  # chunk id -> (document, metadata)
+    
+    for q, ids in enumerate(ids_per_query):
+        distances = results['distances'][q]
+        fallback_distances.append(max(distances) if distances else 1.0)
+        distance_maps.append(dict(zip(ids, distances)))
+        for i, chunk_id in enumerate(ids):
+            if chunk_id not in rows:
+                rows[chunk_id] = (results['documents'][q][i], results['metadatas'][q][i])
+    
+    fused = []
+    for chunk_id, (document, metadata) in rows.items():
+        fused_distance = sum(
+            weight * distance_maps[q].get(chunk_id, fallback_distances[q])
+            for q, weight in enumerate(weights)
+        ) / total_weight
+        fused.append((fused_distance, chunk_id, document, metadata))
+    fused.sort(key=lambda x: x[0])
+    
+    return {
+        'ids': [[row[1] for row in fused]],
+        'documents': [[row[2] for row in fused]],
+        'metadatas': [[row[3] for row in fused]],
+        'distances': [[row[0] for row in fused]],
+    }
+
+
+def get_resume_embedding(session_id: str) -> Optional[List[float]]:
+    """add_resume_to_vector_store()로 저장된 이력서 임베딩 조회 (없으면 None)"""
+    if not VECTOR_STORE:
+        return None
+    
+    try:
+        result = VECTOR_STORE.get(ids=[f"resume_{session_id}"], include=["embeddings"])
+    except Exception as e:
+        print(f"⚠️  이력서 임베딩 조회 중 오류: {e}")
+        return None
+    
+    embeddings = result.get("embeddings") if result else None
+    if embeddings is None or len(embeddings) == 0:
+        return None
+    return [float(v) for v in embeddings[0]]
+
+
+def get_chunk_embeddings(chunk_ids: List[str]) -> np.ndarray:
+    """저장된 chunk 임베딩을 chunk_ids 순서대로 조회 (L2 정규화, 없는 chunk는 0 벡터)"""
+    if not VECTOR_STORE or not chunk_ids:
+        return np.zeros((len(chunk_ids), 0), dtype=np.float32)
+    
+    unique_ids = list(dict.fromkeys(chunk_ids))
+    try:
+        result = VECTOR_STORE.get(ids=unique_ids, include=["embeddings"])
+    except Exception as e:
+        print(f"⚠️  chunk 임베딩 조회 중 오류: {e}")
+        return np.zeros((len(chunk_ids), 0), dtype=np.float32)
+    
+    found_ids = (result.get("ids") or []) if result else []
+    embeddings = result.get("embeddings") if result else None
+    if embeddings is None or len(embeddings) == 0:
+        return np.zeros((len(chunk_ids), 0), dtype=np.float32)
+    
+    found = np.asarray(embeddings, dtype=np.float32)
+    found /= np.maximum(np.linalg.norm(found, axis=1, keepdims=True), 1e-12)
+    row_of = {chunk_id: i for i, chunk_id in enumerate(found_ids)}
+    
+    matrix = np.zeros((len(chunk_ids), found.shape[1]), dtype=np.float32)
+    for i, chunk_id in enumerate(chunk_ids):
+        row = row_of.get(chunk_id)
+        if row is not None:
+            matrix[i] = found[row]
+    return matrix
+
+
+def _encode_queries(texts: List[str]) -> np.ndarray:
+    """검색 쿼리 임베딩 (캐시에 없는 텍스트만 한 번의 배치 encode로 생성)
+
+    캐시 적중 항목을 먼저 최근 사용으로 옮기고 결과를 만든 뒤 오래된 항목을 제거하므로,
+    이번 요청에 쓰인 텍스트가 제거되어 조회에 실패하는 일이 없습니다.
+    """
+    missing = []
+    for text in dict.fromkeys(texts):
+        if text in _QUERY_EMBEDDING_CACHE:
+            _QUERY_EMBEDDING_CACHE.move_to_end(text)
+        else:
+            missing.append(text)
+    if missing:
+        for text, vector in zip(missing, EMBEDDING_MODEL.encode(missing)):
+            _QUERY_EMBEDDING_CACHE[text] = np.asarray(vector, dtype=np.float32)
+    else:
+        print("     - 쿼리 임베딩 캐시 적중 (모델 추론 생략)")
+    result = np.stack([_QUERY_EMBEDDING_CACHE[t] for t in texts])
+    while len(_QUERY_EMBEDDING_CACHE) > QUERY_EMBEDDING_CACHE_SIZE:
+        _QUERY_EMBEDDING_CACHE.popitem(last=False)
+    return result
+
+
+def _blend_with_resume(query_embedding: np.ndarray, resume_embedding: List[float], resume_weight: float) -> np.ndarray:
+    """쿼리 벡터(들)와 이력서 벡터를 정규화 후 가중 합산 (코사인 공간에서 방향 혼합)"""
+    queries = query_embedding / np.maximum(np.linalg.norm(query_embedding, axis=1, keepdims=True), 1e-12)
+    resume_vec = np.asarray(resume_embedding, dtype=np.float32)
+    resume_vec = resume_vec / max(float(np.linalg.norm(resume_vec)), 1e-12)
+    blended = (1.0 - resume_weight) * queries + resume_weight * resume_vec
+    return blended / np.maximum(np.linalg.norm(blended, axis=1, keepdims=True), 1e-12)
+
+
+def search_vector_store(
+    keywords: List[str],
+    top_k: int = 10,
+    min_distinct_jobs: Optional[int] = None,
+    max_chunks_per_job: Optional[int] = None,
+    keyword_weights: Optional[Dict[str, float]] = None,
+    resume_embedding: Optional[List[float]] = None,
+    resume_weight: float = 0.0
+) -> List[Dict]:
+    """벡터 스토어에서 키워드로 검색
+    
+    Args:
+        keywords: 검색 키워드 리스트
+        top_k: 가져올 chunk 수 (min_distinct_jobs 사용 시 첫 검색의 n_results)
+        min_distinct_jobs: 지정 시 서로 다른 공고가 이 개수 이상 나올 때까지
+            n_results를 두 배씩 늘려가며 재검색 (미지정 시 top_k * 2개를 한 번에 검색)
+        max_chunks_per_job: 지정 시 공고당 거리가 가까운 chunk를 최대 이 개수만 반환
+        keyword_weights: 지정 시 멀티 벡터 모드 - 키워드(슬롯)별로 따로 임베딩하여 한 번에 검색한 뒤
+            키워드 가중치로 거리를 가중 평균하여 순위 결정 (미지정 시 키워드를 하나의 문장으로 결합)
+        resume_embedding: 저장된 이력서 임베딩 (get_resume_embedding()로 조회)
+        resume_weight: 0보다 크면 쿼리 벡터에 이력서 벡터를 이 비율로 혼합 (0~1)
+    """
     # 전역 변수 참조 (함수 내부에서 global 선언 필요)
     global VECTOR_STORE, EMBEDDING_MODEL
     
@@ -377,37 +538,72 @@ def search_vector_store(keywords: List[str], top_k: int = 10) -> List[Dict]:
         print("  ❌ [search_vector_store] 키워드 리스트가 비어있습니다.")
         return []
     
-    query_text = " ".join(keywords)
-    print(f"  🔍 [search_vector_store] 검색 쿼리 텍스트: {query_text[:200]}...")
-    print(f"     - 키워드 개수: {len(keywords)}")
-    print(f"     - 쿼리 길이: {len(query_text)} 문자")
+    if keyword_weights:
+        # 멀티 벡터 모드: 키워드별 쿼리 (가중치는 결과 융합에 사용)
+        query_texts = list(keywords)
+        facet_weights = [keyword_weights.get(k, 1.0) for k in keywords]
+        print(f"  🔍 [search_vector_store] 멀티 벡터 쿼리: {len(query_texts)}개 키워드")
+        for text, weight in zip(query_texts, facet_weights):
+            print(f"     - '{text}': {weight}")
+    else:
+        query_texts = [" ".join(keywords)]
+        facet_weights = None
+        print(f"  🔍 [search_vector_store] 검색 쿼리 텍스트: {query_texts[0][:200]}...")
+        print(f"     - 키워드 개수: {len(keywords)}")
+        print(f"     - 쿼리 길이: {len(query_texts[0])} 문자")
     
     try:
-        # 쿼리 임베딩 생성
+        # 쿼리 임베딩 생성 (멀티 벡터 모드도 한 번의 배치 encode로 처리, 캐시된 쿼리는 재사용)
         print(f"  ⏳ [search_vector_store] 임베딩 생성 중...")
-        query_embedding = EMBEDDING_MODEL.encode([query_text])
+        query_embedding = _encode_queries(query_texts)
         print(f"     - 임베딩 차원: {query_embedding.shape}")
         
-        # 벡터 검색 (중복 제거를 위해 더 많이 가져오기)
-        n_results = min(top_k * 2, doc_count)  # 문서 수보다 많이 요청하지 않도록
-        print(f"  🔍 [search_vector_store] 벡터 검색 실행: n_results={n_results}")
+        # 이력서 벡터 혼합 (업로드 시 저장된 임베딩 재사용, 추가 추론 없음)
+        if resume_embedding is not None and resume_weight > 0:
+            query_embedding = _blend_with_resume(query_embedding, resume_embedding, resume_weight)
+            print(f"     - 이력서 벡터 혼합 (비율: {resume_weight})")
         
-        # query_embedding은 (1, 384) 형태이므로, tolist()하면 [[...]] 형태가 됨
+        # query_embedding은 (쿼리 수, 384) 형태이므로, tolist()하면 [[...], ...] 형태가 됨
         # ChromaDB는 query_embeddings에 리스트의 리스트를 기대하므로 그대로 사용
         embedding_list = query_embedding.tolist()
         print(f"     - 임베딩 리스트 형태: {len(embedding_list)}개 리스트, 각 {len(embedding_list[0]) if embedding_list else 0}차원")
         
-        results = VECTOR_STORE.query(
-            query_embeddings=embedding_list,  # 이미 [[...]] 형태이므로 그대로 전달
-            n_results=n_results
-        )
+        if min_distinct_jobs is None:
+            # 벡터 검색 (중복 제거를 위해 더 많이 가져오기)
+            n_results = min(top_k * 2, doc_count)  # 문서 수보다 많이 요청하지 않도록
+        else:
+            n_results = min(max(top_k, min_distinct_jobs), doc_count)
         
-        raw_result_count = len(results.get('ids', [[]])[0]) if results.get('ids') else 0
-        print(f"  📊 [search_vector_store] 벡터 검색 원시 결과: {raw_result_count}개")
+        # 점진적 확장 검색: 서로 다른 공고가 min_distinct_jobs개 이상이 될 때까지 n_results 확대
+        # (임베딩은 한 번만 생성하고 벡터 검색만 반복)
+        while True:
+            print(f"  🔍 [search_vector_store] 벡터 검색 실행: n_results={n_results}")
+            results = VECTOR_STORE.query(
+                query_embeddings=embedding_list,  # 이미 [[...]] 형태이므로 그대로 전달
+                n_results=n_results
+            )
+            if facet_weights is not None:
+                results = _fuse_multi_query_results(results, facet_weights)
+            
+            raw_result_count = len(results.get('ids', [[]])[0]) if results.get('ids') else 0
+            print(f"  📊 [search_vector_store] 벡터 검색 원시 결과: {raw_result_count}개")
+            
+            if min_distinct_jobs is None or n_results >= doc_count:
+                break
+            distinct_jobs = {
+                meta.get('job_id') for meta in (results['metadatas'][0] if raw_result_count else [])
+                if meta.get('type') != 'resume' and meta.get('job_id') is not None
+            }
+            if len(distinct_jobs) >= min_distinct_jobs:
+                break
+            print(f"     - 서로 다른 공고 {len(distinct_jobs)}개 < 목표 {min_distinct_jobs}개, 검색 범위 확대")
+            n_results = min(n_results * 2, doc_count)
         
-        # 결과 변환 (중복 제거 없이 모든 chunk 반환)
+        # 결과 변환 (이력서 제외, max_chunks_per_job 지정 시 공고당 chunk 수 제한)
         search_results = []
         resume_count = 0
+        capped_count = 0
+        chunks_per_job_seen = {}
         
         if results.get('ids') and len(results['ids'][0]) > 0:
             for i in range(len(results['ids'][0])):
@@ -419,7 +615,15 @@ def search_vector_store(keywords: List[str], top_k: int = 10) -> List[Dict]:
                     resume_count += 1
                     continue
                 
-                # 모든 chunk를 반환 (중복 제거 없음)
+                # 공고 단위 중복 제거 (결과는 거리 오름차순이므로 가까운 chunk부터 유지)
+                if max_chunks_per_job is not None:
+                    job_id = metadata.get('job_id')
+                    seen = chunks_per_job_seen.get(job_id, 0)
+                    if seen >= max_chunks_per_job:
+                        capped_count += 1
+                        continue
+                    chunks_per_job_seen[job_id] = seen + 1
+                
                 search_results.append({
                     "id": results['ids'][0][i],
                     "document": results['documents'][0][i],
@@ -427,9 +631,11 @@ def search_vector_store(keywords: List[str], top_k: int = 10) -> List[Dict]:
                     "distance": results['distances'][0][i] if 'distances' in results and results['distances'] else 0.0
                 })
         
-        print(f"  ✅ [search_vector_store] 최종 검색 결과: {len(search_results)}개 chunk (중복 제거 없음)")
+        print(f"  ✅ [search_vector_store] 최종 검색 결과: {len(search_results)}개 chunk")
         if resume_count > 0:
             print(f"     - 제외된 이력서: {resume_count}개")
+        if capped_count > 0:
+            print(f"     - 공고당 {max_chunks_per_job}개 초과로 제외된 chunk: {capped_count}개")
         
         return search_results
         
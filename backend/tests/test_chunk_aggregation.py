@@ -0,0 +1,64 @@
+"""
+chunk → 공고 점수 집계(aggregate_chunk_scores + select_top_k) 테스트
+기존 defaultdict/정렬 기반 집계와 결과가 같은지 확인
+실행 (backend 디렉터리에서): python -m pytest -q tests
+"""
+from collections import defaultdict
+
+import numpy as np
+import pytest
+
+from src.retriever import aggregate_chunk_scores, select_top_k
+
+
+def python_aggregate(job_ids, distances, top_n, top_k):
+    """기존 retrieve_similar_jobs의 집계 방식 (비교 기준)"""
+    job_chunks = defaultdict(list)
+    for job_id, distance in zip(job_ids, distances):
+        job_chunks[job_id].append(distance)
+
+    job_scores = {}
+    for job_id, chunk_distances in job_chunks.items():
+        chunk_scores = [{"score": max(0.0, 1.0 - (d / 2.0))} for d in chunk_distances]
+        chunk_scores.sort(key=lambda x: x["score"], reverse=True)
+        top_chunks = chunk_scores[:top_n]
+        job_scores[job_id] = sum(c["score"] for c in top_chunks) / len(top_chunks)
+
+    sorted_jobs = sorted(job_scores.items(), key=lambda x: x[1], reverse=True)
+    return [job_id for job_id, _ in sorted_jobs[:top_k]], job_scores
+
+
+def numpy_aggregate(job_ids, distances, top_n, top_k):
+    unique_ids, avg_scores, _, _, _ = aggregate_chunk_scores(job_ids, distances, top_n=top_n)
+    top_positions = select_top_k(avg_scores, top_k)
+    return unique_ids[top_positions].tolist(), dict(zip(unique_ids.tolist(), avg_scores.tolist()))
+
+
+@pytest.mark.parametrize("seed, n_chunks, num_jobs, top_n, top_k", [
+    (0, 10_000, 2_000, 3, 10),
+    (1, 3_000, 200, 3, 50),
+    (2, 500, 1_000, 2, 10),  # 대부분의 공고가 chunk 1개
+    (3, 50, 5, 3, 10),  # top_k가 공고 수보다 큼
+])
+def test_matches_python_aggregation(seed, n_chunks, num_jobs, top_n, top_k):
+    rng = np.random.default_rng(seed)
+    job_ids = rng.integers(0, num_jobs, size=n_chunks)
+    distances = rng.uniform(0.2, 2.4, size=n_chunks)  # 2 초과 거리는 0점으로 보정
+    # 벡터 스토어가 반환하는 형태 (거리 오름차순 파이썬 리스트)
+    order = np.argsort(distances)
+    job_id_list = job_ids[order].tolist()
+    distance_list = distances[order].tolist()
+
+    py_top, py_scores = python_aggregate(job_id_list, distance_list, top_n, top_k)
+    np_top, np_scores = numpy_aggregate(job_id_list, distance_list, top_n, top_k)
+
+    assert set(np_scores) == set(py_scores)
+    assert all(abs(py_scores[j] - np_scores[j]) < 1e-9 for j in py_scores)
+    # 동점(0점 포함)은 두 방식 모두 먼저 등장한 공고 우선
+    assert np_top == py_top
+
+
+def test_empty_input():
+    unique_ids, avg_scores, positions, counts, totals = aggregate_chunk_scores([], [], top_n=3)
+    assert unique_ids.size == 0 and avg_scores.size == 0 and positions == []
+    assert select_top_k(avg_scores, 10).size == 0
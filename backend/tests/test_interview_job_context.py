@@ -0,0 +1,69 @@
+"""
+면접 답변 평가가 면접 시작 때와 같은 채용공고 요약을 쓰는지 테스트
+실행 (backend 디렉터리에서): python -m pytest -q tests
+"""
+import asyncio
+
+import pytest
+
+import main
+from src.job_digest import build_job_digest
+from src.prompt_context import format_prompt_context
+
+JOB = {
+    "title": "백엔드 개발자",
+    "company": "예시회사",
+    "full_content": {
+        "work": "- 결제 API 개발\n- 데이터 파이프라인 운영",
+        "requirements": "- Python 경력 3년 이상\n- 우대: Kubernetes 운영 경험",
+        "conditions": "정규직",
+    },
+}
+JOB["digest"] = build_job_digest(JOB)
+RESUME = {"name": "홍길동", "skills": ["Python"], "summary": "백엔드 개발자"}
+
+
+class _ConnectedRequest:
+    """연결이 끊기지 않은 요청 (_cancel_on_disconnect용)"""
+
+    async def is_disconnected(self):
+        return False
+
+
+@pytest.fixture
+def captured(monkeypatch):
+    captured = {}
+
+    async def fake_questions(resume, job_info, cover_letter=None, num_questions=5):
+        captured["start"] = job_info
+        return ["자기소개를 해주세요."]
+
+    async def fake_evaluate(question, answer, resume, job_info, cover_letter=None):
+        captured["evaluate"] = job_info
+        return {"score": 80, "feedback": "", "strengths": [], "improvements": []}
+
+    async def fake_overall(questions, answers, evaluations, resume, job_info):
+        captured["overall"] = job_info
+        return {"overall_score": 80}
+
+    monkeypatch.setattr(main, "load_job_catalog", lambda path: [JOB])
+    monkeypatch.setattr(main, "generate_interview_questions", fake_questions)
+    monkeypatch.setattr(main, "evaluate_answer", fake_evaluate)
+    monkeypatch.setattr(main, "generate_overall_evaluation", fake_overall)
+    monkeypatch.setitem(main.SESSIONS, "s1", {"resume": RESUME})
+    return captured
+
+
+def test_submit_answer_uses_same_job_context_as_start(captured):
+    request = _ConnectedRequest()
+
+    async def run():
+        await main.start_interview_endpoint(request, "s1", JOB["title"], JOB["company"])
+        await main.submit_answer_endpoint(request, "s1", 0, "결제 API를 개발했습니다.")
+
+    asyncio.run(run())
+
+    start_context = format_prompt_context(RESUME, captured["start"])
+    assert format_prompt_context(RESUME, captured["evaluate"]) == start_context
+    assert format_prompt_context(RESUME, captured["overall"]) == start_context
+    assert "Python 경력 3년 이상" in start_context
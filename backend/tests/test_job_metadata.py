@@ -0,0 +1,55 @@
+"""
+공고 메타데이터(지역/고용 형태/업종/기업 형태) 수집과 재순위화 일치 특징 테스트
+실행 (backend 디렉터리에서): python -m pytest -q tests
+"""
+from src.job_parser import load_jobs_from_txt
+from src.reranker import RERANK_FEATURES, build_feature_matrix
+
+JOBS_TXT = """----------------------------------------------------------------------
+[공고 #1] 백엔드 개발자
+----------------------------------------------------------------------
+1. 채용 제목/포지션
+   - 백엔드 개발자
+
+2. 회사명
+   - 예시회사
+
+5. 근무 조건 (형태/지역/시간)
+   - 형태: 정규직(수습 3개월)
+   - 지역: 서울 성동구
+   - 시간: 09:00-18:00
+
+9. 기업 정보
+   * 업종: 응용 소프트웨어 개발 및 공급업
+   * 기업형태: 정보 없음
+
+----------------------------------------------------------------------
+[공고 #2] 데이터 엔지니어
+----------------------------------------------------------------------
+1. 채용 제목/포지션
+   - 데이터 엔지니어
+
+5. 근무 조건 (형태/지역/시간)
+   - 계약직
+   - 경기 성남시
+"""
+
+
+def test_metadata_filled_at_ingest(tmp_path):
+    path = tmp_path / "jobs.txt"
+    path.write_text(JOBS_TXT, encoding="utf-8")
+    first, second = load_jobs_from_txt(str(path))
+
+    assert first["location"] == "서울 성동구"
+    assert first["job_type"] == "정규직(수습 3개월)"
+    assert first["industry"] == "응용 소프트웨어 개발 및 공급업"
+    assert first["company_size"] == ""  # "정보 없음"은 빈 값으로 처리
+    assert second["job_type"] == "계약직"  # 라벨 없는 근무 조건
+    assert second["location"] == ""
+
+    records = [{"job_id": i, "vector_distance": 0.5, "matched_keywords": []} for i in range(2)]
+    features = build_feature_matrix({}, {"location": "서울", "job_type": "정규직"}, records, [first, second])
+    location = RERANK_FEATURES.index("location_equal")
+    job_type = RERANK_FEATURES.index("job_type_equal")
+    assert features[:, location].tolist() == [1.0, 0.0]
+    assert features[:, job_type].tolist() == [1.0, 0.0]
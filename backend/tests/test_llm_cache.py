@@ -0,0 +1,63 @@
+"""
+LLM 응답 캐시(llm_cache)와 게이트웨이 캐시 저장 조건 테스트
+실행 (backend 디렉터리에서): python -m pytest -q tests
+"""
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from src import llm_cache, llm_gateway
+from src.llm_cache import make_cache_key
+
+
+def _key(content):
+    return make_cache_key("openai", "m", [{"role": "user", "content": content}], {"temperature": 0})
+
+
+def test_cache_key_keeps_inner_whitespace():
+    assert _key("  첫 문단\n\n둘째 문단  ") == _key("첫 문단\n\n둘째 문단")
+    assert _key("첫 문단\n\n둘째 문단") != _key("첫 문단 둘째 문단")
+
+
+class _FakeCompletions:
+    """미리 정한 응답을 순서대로 반환하는 chat.completions"""
+
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.calls = 0
+
+    async def create(self, model, messages, **params):
+        self.calls += 1
+        message = SimpleNamespace(content=self.replies.pop(0))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+@pytest.fixture
+def fake_openai(monkeypatch, tmp_path):
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_ENABLED", True)
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_DB_PATH", tmp_path / "llm_cache.sqlite3")
+    monkeypatch.setattr(llm_cache, "_CACHE_CONN", None)
+    completions = _FakeCompletions(["JSON이 아닌 응답", '{"name": "홍길동"}', '{"name": "다른 응답"}'])
+    client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    monkeypatch.setattr(llm_gateway, "get_async_openai_client", lambda: client)
+    yield completions
+    if llm_cache._CACHE_CONN is not None:
+        llm_cache._CACHE_CONN.close()
+
+
+def test_invalid_response_is_not_cached(fake_openai):
+    async def call():
+        return await llm_gateway.openai_chat(
+            [{"role": "user", "content": "이력서"}], temperature=0, cache=True, validate=json.loads
+        )
+
+    async def main():
+        return [await call() for _ in range(3)]
+
+    first, second, third = asyncio.run(main())
+    assert first == "JSON이 아닌 응답"
+    assert second == '{"name": "홍길동"}'  # 잘못된 응답은 저장되지 않아 다시 호출
+    assert third == second  # 검증을 통과한 응답은 캐시에서 반환
+    assert fake_openai.calls == 2
@@ -0,0 +1,120 @@
+"""
+LLM 호출 복원력(llm_resilience) 테스트
+서킷 브레이커 상태 전환, hedging 첫 성공/취소, 재시도할 수 없는 오류 처리
+실행 (backend 디렉터리에서): python -m pytest -q tests
+"""
+import asyncio
+import time
+
+import pytest
+
+from src import llm_resilience
+from src.llm_resilience import CircuitBreaker, CircuitOpenError, _hedged_call, call_with_resilience
+
+
+class ServiceUnavailable(Exception):
+    """재시도 가능한 Gemini 오류 (이름으로 판별)"""
+
+
+@pytest.fixture
+def breaker(monkeypatch):
+    breaker = CircuitBreaker("gemini", failure_threshold=2, reset_seconds=0.05)
+    monkeypatch.setattr(llm_resilience, "BREAKERS", {"gemini": breaker})
+    monkeypatch.setattr(llm_resilience, "LLM_MAX_RETRIES", 0)
+    return breaker
+
+
+def test_breaker_opens_then_allows_single_trial():
+    breaker = CircuitBreaker("gemini", failure_threshold=2, reset_seconds=0.05)
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow_request()
+
+    time.sleep(0.06)
+    assert breaker.state == "half_open"
+    assert breaker.allow_request()
+    assert not breaker.allow_request()  # 시험 호출은 하나만
+    assert not breaker.is_available()
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow_request()
+
+
+def test_failed_trial_reopens_breaker():
+    breaker = CircuitBreaker("gemini", failure_threshold=1, reset_seconds=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+
+def test_hedged_call_returns_first_result_without_duplicate():
+    calls = []
+
+    async def make_call():
+        calls.append(1)
+        return "ok"
+
+    trace = {}
+    assert asyncio.run(_hedged_call(make_call, 0.5, trace)) == "ok"
+    assert len(calls) == 1
+    assert "hedged" not in trace
+
+
+def test_hedged_call_uses_faster_duplicate_and_cancels_slow_one():
+    delays = [1.0, 0.01]
+    cancelled = []
+
+    async def make_call():
+        delay = delays.pop(0)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(delay)
+            raise
+        return delay
+
+    trace = {}
+    assert asyncio.run(_hedged_call(make_call, 0.02, trace)) == 0.01
+    assert cancelled == [1.0]
+    assert trace["hedged"] is True
+    assert trace["hedge_losers"] == 1
+
+
+def test_hedged_call_raises_when_all_requests_fail():
+    async def make_call():
+        raise ServiceUnavailable("down")
+
+    with pytest.raises(ServiceUnavailable):
+        asyncio.run(_hedged_call(make_call, None, {}))
+
+
+def test_non_retryable_error_does_not_count_as_failure(breaker):
+    calls = []
+
+    async def make_call():
+        calls.append(1)
+        raise ValueError("잘못된 요청")
+
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            asyncio.run(call_with_resilience("gemini", "m", make_call, timeout=1, hedge=False))
+    assert len(calls) == 3
+    assert breaker.consecutive_failures == 0
+    assert breaker.state == "closed"
+
+
+def test_retryable_errors_open_breaker(breaker):
+    async def make_call():
+        raise ServiceUnavailable("down")
+
+    for _ in range(2):
+        with pytest.raises(ServiceUnavailable):
+            asyncio.run(call_with_resilience("gemini", "m", make_call, timeout=1, hedge=False))
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(call_with_resilience("gemini", "m", make_call, timeout=1, hedge=False))
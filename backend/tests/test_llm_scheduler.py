@@ -0,0 +1,156 @@
+"""
+LLM 호출 스케줄러(llm_scheduler) 테스트
+우선순위 순서, 취소된 대기 호출, settle() 보정, 예산 대기와 서킷 브레이커/hedging의 관계
+실행 (backend 디렉터리에서): python -m pytest -q tests
+"""
+import asyncio
+
+import pytest
+
+from src import llm_resilience, llm_scheduler
+from src.llm_resilience import CircuitBreaker, call_with_resilience
+from src.llm_scheduler import PRIORITY_BATCH, PRIORITY_INTERACTIVE, PRIORITY_NORMAL, Reservation
+
+
+@pytest.fixture
+def limits(monkeypatch):
+    """모델별 예산을 테스트마다 새로 지정 (limits["모델"] = {"rpm": ..., "tpm": ...})"""
+    rate_limits = {}
+    monkeypatch.setattr(llm_scheduler, "LLM_SCHEDULER_ENABLED", True)
+    monkeypatch.setattr(llm_scheduler, "LLM_RATE_LIMITS", rate_limits)
+    monkeypatch.setattr(llm_scheduler, "_QUEUES", {})
+    return rate_limits
+
+
+@pytest.fixture
+def breaker(monkeypatch):
+    breaker = CircuitBreaker("openai", failure_threshold=2, reset_seconds=30)
+    monkeypatch.setattr(llm_resilience, "BREAKERS", {"openai": breaker})
+    return breaker
+
+
+def test_priority_order(limits):
+    limits["m"] = {"rpm": 6000, "tpm": 1_000_000}
+
+    async def main():
+        queue = llm_scheduler._get_queue("m")
+        queue.requests.tokens = 0  # 예산을 비워서 세 호출이 모두 대기열에 들어가게 함
+        order = []
+
+        async def call(name, priority):
+            await llm_scheduler.acquire("m", 10, priority)
+            order.append(name)
+
+        await asyncio.gather(
+            call("batch", PRIORITY_BATCH),
+            call("normal", PRIORITY_NORMAL),
+            call("interactive", PRIORITY_INTERACTIVE),
+        )
+        return order
+
+    assert asyncio.run(main()) == ["interactive", "normal", "batch"]
+
+
+def test_cancelled_waiter_is_skipped(limits):
+    limits["m"] = {"rpm": 6000, "tpm": 1_000_000}
+
+    async def main():
+        queue = llm_scheduler._get_queue("m")
+        queue.requests.tokens = 0
+        first = asyncio.create_task(llm_scheduler.acquire("m", 10, PRIORITY_INTERACTIVE))
+        second = asyncio.create_task(llm_scheduler.acquire("m", 10, PRIORITY_BATCH))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.wait_for(second, timeout=1)
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return queue.dispatched
+
+    assert asyncio.run(main()) == 1
+
+
+def test_cancel_after_dispatch_refunds_budget(limits):
+    limits["m"] = {"rpm": 60, "tpm": 10_000}
+
+    async def main():
+        queue = llm_scheduler._get_queue("m")
+        queue.requests.tokens = 0
+        waiter = asyncio.create_task(llm_scheduler.acquire("m", 1000, PRIORITY_NORMAL))
+        await asyncio.sleep(0)
+
+        # 디스패처가 예산을 넘긴 직후, 호출한 쪽이 재개되기 전에 취소된 상황을 재현
+        priority, _, tokens, future, _ = queue.heap.pop()
+        queue.requests.tokens = 1
+        queue.consume(tokens)
+        future.set_result(None)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        return queue.requests.available(), queue.tokens.available()
+
+    requests, tokens = asyncio.run(main())
+    assert requests == pytest.approx(1, abs=0.1)
+    assert tokens == pytest.approx(10_000, abs=5)
+
+
+def test_settle_refunds_unused_tokens(limits):
+    limits["m"] = {"rpm": 600, "tpm": 10_000}
+
+    async def main():
+        queue = llm_scheduler._get_queue("m")
+        await llm_scheduler.acquire("m", 1000)
+        after_acquire = queue.tokens.available()
+        llm_scheduler.settle("m", 1000, 200)
+        after_settle = queue.tokens.available()
+        llm_scheduler.settle("m", 1000, None)  # usage가 없으면 보정하지 않음
+        return after_acquire, after_settle, queue.tokens.available()
+
+    after_acquire, after_settle, unchanged = asyncio.run(main())
+    assert after_acquire == pytest.approx(9000, abs=5)
+    assert after_settle == pytest.approx(9800, abs=5)
+    assert unchanged == pytest.approx(after_settle, abs=5)
+
+
+def test_queue_timeout_does_not_trip_breaker(limits, breaker):
+    limits["m"] = {"rpm": 1, "tpm": 1_000_000}
+    provider_calls = []
+
+    async def make_call():
+        provider_calls.append(1)
+        return "ok"
+
+    async def main():
+        reservation = Reservation("m", 10)
+        assert await call_with_resilience("openai", "m", make_call, timeout=1, reservation=reservation) == "ok"
+        # 분당 1회 예산을 다 썼으므로 이후 호출은 로컬 대기열에서만 기다리다 제한 시간 초과
+        for _ in range(5):
+            with pytest.raises(asyncio.TimeoutError):
+                await call_with_resilience("openai", "m", make_call, timeout=0.05, reservation=reservation)
+
+    asyncio.run(main())
+    assert len(provider_calls) == 1
+    assert breaker.state == "closed"
+    assert breaker.consecutive_failures == 0
+
+
+def test_hedge_skipped_without_budget(limits, breaker, monkeypatch):
+    limits["m"] = {"rpm": 1, "tpm": 1_000_000}
+    monkeypatch.setattr(llm_resilience, "hedge_delay", lambda provider, model, call_site: 0.01)
+    provider_calls = []
+
+    async def make_call():
+        provider_calls.append(1)
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    async def main():
+        trace = {}
+        result = await call_with_resilience(
+            "openai", "m", make_call, timeout=1, trace=trace, reservation=Reservation("m", 10)
+        )
+        return result, trace
+
+    result, trace = asyncio.run(main())
+    assert result == "ok"
+    assert len(provider_calls) == 1
+    assert trace["hedged"] is False
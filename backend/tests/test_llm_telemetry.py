@@ -0,0 +1,50 @@
+"""
+LLM 호출 기록(llm_telemetry) 테스트
+실행 (backend 디렉터리에서): python -m pytest -q tests
+"""
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src import llm_telemetry
+
+
+def _response(prompt_tokens, completion_tokens):
+    usage = SimpleNamespace(prompt_tokens=prompt_tokens, prompt_tokens_details=None, completion_tokens=completion_tokens)
+    return SimpleNamespace(usage=usage)
+
+
+@pytest.fixture
+def telemetry(monkeypatch, tmp_path):
+    monkeypatch.setattr(llm_telemetry, "_STATS", {})
+    monkeypatch.setattr(llm_telemetry, "LLM_PRICES", {"m": {"input": 1.0, "output": 2.0}})
+    monkeypatch.setattr(llm_telemetry, "LLM_TRACE_ENABLED", True)
+    monkeypatch.setattr(llm_telemetry, "LLM_TRACE_PATH", tmp_path / "llm_trace.jsonl")
+    return tmp_path / "llm_trace.jsonl"
+
+
+def test_hedge_loser_cost_is_counted(telemetry):
+    llm_telemetry.record_llm_call(
+        "site", "openai", "m", time.perf_counter(),
+        usage=_response(1_000_000, 0).usage,
+        hedged=True,
+        hedge_losers=2,
+        loser_responses=[_response(1_000_000, 500_000)],  # 한 요청은 취소되어 usage 없음
+    )
+    stats = llm_telemetry.get_llm_metrics()["call_sites"]["site"]["m"]
+
+    assert stats["hedge_losers"] == 2
+    assert stats["hedge_loser_cost_usd"] == pytest.approx(2.0)
+    assert stats["cost_usd"] == pytest.approx(3.0)
+
+
+def test_trace_written_by_background_writer(telemetry):
+    for _ in range(3):
+        llm_telemetry.record_llm_call("site", "openai", "m", time.perf_counter())
+    llm_telemetry.flush_llm_trace()
+
+    records = [json.loads(line) for line in telemetry.read_text(encoding="utf-8").splitlines()]
+    assert len(records) == 3
+    assert all(record["call_site"] == "site" and record["status"] == "ok" for record in records)
@@ -0,0 +1,52 @@
+"""
+매칭 점수 사용자 쪽 항목 임베딩 캐시(_user_field_matrix) 테스트
+실행 (backend 디렉터리에서): python -m pytest -q tests
+"""
+import numpy as np
+import pytest
+
+from src import scoring, vector_store
+
+JOBS = [
+    {"title": "백엔드 개발자", "description": "API 개발", "full_content": {"work": "결제 API", "requirements": "Python"}},
+    {"title": "데이터 엔지니어", "description": "파이프라인", "full_content": {"work": "ETL", "requirements": "Spark"}},
+]
+
+
+class _FakeEmbeddingModel:
+    """텍스트 길이로 만든 2차원 단위 벡터를 반환하고 encode 호출을 기록"""
+
+    def __init__(self):
+        self.calls = []
+
+    def get_sentence_embedding_dimension(self):
+        return 2
+
+    def encode(self, texts, normalize_embeddings=True, show_progress_bar=False):
+        self.calls.append(list(texts))
+        vectors = np.array([[len(t), 1.0] for t in texts], dtype=np.float32)
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+@pytest.fixture
+def model(monkeypatch):
+    model = _FakeEmbeddingModel()
+    monkeypatch.setattr(vector_store, "EMBEDDING_MODEL", model)
+    monkeypatch.setattr(scoring, "_JOB_FIELD_EMBEDDINGS", scoring.OrderedDict())
+    monkeypatch.setattr(scoring, "_USER_FIELD_EMBEDDINGS", scoring.OrderedDict())
+    return model
+
+
+def test_repeat_page_does_not_reencode_user_texts(model):
+    slots = {"desired_job": "백엔드 개발자", "core_skill": "Python"}
+    resume = {"summary": "결제 API 개발 경험"}
+
+    first = scoring.calculate_match_scores(JOBS, slots, resume)
+    calls_after_first = len(model.calls)
+    second = scoring.calculate_match_scores(JOBS, slots, resume)
+
+    assert second == first
+    assert len(model.calls) == calls_after_first  # 공고/사용자 임베딩 모두 캐시 적중
+
+    scoring.calculate_match_scores(JOBS, {**slots, "core_skill": "Go"}, resume)
+    assert len(model.calls) == calls_after_first + 1  # 사용자 텍스트가 바뀌면 다시 인코딩
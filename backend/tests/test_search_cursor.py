@@ -0,0 +1,51 @@
+"""
+검색 커서(encode_search_cursor / decode_search_cursor) 테스트
+실행 (backend 디렉터리에서): python -m pytest -q tests
+"""
+import asyncio
+import base64
+import json
+
+import pytest
+from fastapi import HTTPException
+
+import main
+from src.search_cache import decode_search_cursor, encode_search_cursor
+
+
+def _raw_cursor(payload) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode("utf-8")).decode("ascii")
+
+
+def test_round_trip():
+    cursor = encode_search_cursor("a" * 64, 20)
+    assert decode_search_cursor(cursor) == ("a" * 64, 20)
+
+
+@pytest.mark.parametrize("cursor", [
+    "",
+    "not base64!",
+    "커서",
+    base64.urlsafe_b64encode(b"\xff\xfe").decode("ascii"),
+    _raw_cursor(["fp", 10]),
+    _raw_cursor({"fp": "abc"}),
+    _raw_cursor({"fp": "abc", "offset": "ten"}),
+    _raw_cursor({"fp": "abc", "offset": -1}),
+    _raw_cursor({"fp": 123, "offset": 10}),
+])
+def test_malformed_cursor_is_rejected(cursor):
+    assert decode_search_cursor(cursor) is None
+
+
+def test_tampered_fingerprint_is_rejected_by_search(monkeypatch):
+    monkeypatch.setattr(main, "SEARCH_RESUME_WEIGHT", 0)
+    monkeypatch.setitem(main.SESSIONS, "s1", {"resume": {"skills": ["Python"]}, "slots": {}})
+
+    # 커서의 fingerprint만 바꾸면 같은 세션이어도 다른 검색 조건의 커서로 취급
+    tampered = encode_search_cursor("0" * 64, 10)
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(main.search_jobs_endpoint(
+            session_id="s1", desired_job="백엔드", location="", job_type="", company_size="",
+            cursor=tampered, page_size=10
+        ))
+    assert exc_info.value.status_code == 400
@@ -0,0 +1,48 @@
+"""
+검색 쿼리 임베딩 캐시(_encode_queries) 테스트
+실행 (backend 디렉터리에서): python -m pytest -q tests
+"""
+import numpy as np
+import pytest
+
+from src import vector_store
+
+
+class _FakeEmbeddingModel:
+    """텍스트 길이로 만든 1차원 벡터를 반환하고 encode 호출을 기록"""
+
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts):
+        self.calls.append(list(texts))
+        return [np.array([float(len(t))]) for t in texts]
+
+
+@pytest.fixture
+def small_cache(monkeypatch):
+    model = _FakeEmbeddingModel()
+    monkeypatch.setattr(vector_store, "EMBEDDING_MODEL", model)
+    monkeypatch.setattr(vector_store, "QUERY_EMBEDDING_CACHE_SIZE", 3)
+    monkeypatch.setattr(vector_store, "_QUERY_EMBEDDING_CACHE", vector_store.OrderedDict())
+    return model
+
+
+def test_hit_at_lru_head_survives_eviction(small_cache):
+    for text in ["a", "b", "c"]:
+        vector_store._encode_queries([text])
+
+    # "a"는 가장 오래된 항목이지만 이번 요청에서 적중하므로 제거되면 안 됨
+    result = vector_store._encode_queries(["a", "dd"])
+
+    assert result.tolist() == [[1.0], [2.0]]
+    assert small_cache.calls[-1] == ["dd"]
+    assert list(vector_store._QUERY_EMBEDDING_CACHE) == ["c", "a", "dd"]
+
+
+def test_request_larger_than_cache(small_cache):
+    texts = ["a", "bb", "ccc", "dddd", "a"]
+    result = vector_store._encode_queries(texts)
+
+    assert result.tolist() == [[1.0], [2.0], [3.0], [4.0], [1.0]]
+    assert len(vector_store._QUERY_EMBEDDING_CACHE) == 3